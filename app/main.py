@@ -1,6 +1,11 @@
 # app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from app.routes.process_audio import router as process_router
+from app.routes.jobs import router as jobs_router, get_job_queue
+from app.routes.models import router as models_router
+from app.routes.stream import router as stream_router
+from app.routes.reports import router as reports_router
+from app.services.warmup_service import get_warmup_tracker, start_warmup
 from app.utils.logger import setup_logging
 from dotenv import load_dotenv
 
@@ -8,11 +13,32 @@ load_dotenv()
 setup_logging()
 app = FastAPI(title="voiceiq-ai", version="voiceiq-ai/0.1.0")
 app.include_router(process_router, prefix="/v1")
+app.include_router(jobs_router, prefix="/v1")
+app.include_router(models_router, prefix="/v1")
+app.include_router(stream_router, prefix="/v1")
+app.include_router(reports_router, prefix="/v1")
+
+@app.on_event("startup")
+def start_job_workers():
+    # picks up jobs left queued/running by a previous worker
+    get_job_queue()
+
+@app.on_event("startup")
+def warm_up_models():
+    # no-op unless VOICEIQ_PRELOAD_MODELS is set
+    start_warmup()
 
 @app.get("/healthz")
 def healthz():
     return {"status": "ok"}
 
+@app.get("/readyz")
+def readyz(response: Response):
+    status = get_warmup_tracker().snapshot()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
+
 @app.get("/version")
 def version():
-    return {"version": app.version}
\ No newline at end of file
+    return {"version": app.version}
@@ -0,0 +1,152 @@
+# app/routes/jobs.py
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Header, Query
+from pydantic import BaseModel
+from typing import Dict, Optional
+import os
+import shutil
+import uuid
+
+from app.utils.logger import logger
+from app.utils.upload_utils import UploadRejected, save_upload
+from app.services.job_service import (
+    JobStore,
+    JobQueue,
+    JobQueueFull,
+    JOB_DIR,
+    JOB_QUEUE_SIZE,
+    JOB_WORKERS,
+    DONE,
+    FAILED,
+    QUEUED,
+)
+from app.routes.process_audio import (
+    ProcessAudioResponse,
+    PIPELINE_STAGES,
+    response_shape,
+    run_pipeline,
+    shaped_response,
+)
+
+
+router = APIRouter()
+
+
+# --------------------------
+# Response Models
+# --------------------------
+
+class JobSubmitted(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+    result_url: str
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    filename: Optional[str] = None
+    created_at: float
+    updated_at: float
+    progress: float
+    stages: Dict[str, Dict]
+    error: Optional[str] = None
+
+
+# --------------------------
+# Queue singleton
+# --------------------------
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Create (once) and start the job store + worker pool."""
+    global _job_queue
+    if _job_queue is None:
+        store = JobStore(os.path.join(JOB_DIR, "jobs.db"))
+        _job_queue = JobQueue(store, run_pipeline, maxsize=JOB_QUEUE_SIZE, workers=JOB_WORKERS)
+    _job_queue.start()
+    return _job_queue
+
+
+# --------------------------
+# Routes
+# --------------------------
+
+@router.post("/process-audio/jobs", response_model=JobSubmitted, status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    jobs = get_job_queue()
+    job_id = str(uuid.uuid4())
+
+    # The upload must outlive this request (and a worker restart)
+    job_dir = os.path.join(JOB_DIR, job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    try:
+        upload = await save_upload(file, job_dir)
+    except UploadRejected as e:
+        os.rmdir(job_dir)
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    jobs.store.create(job_id, file.filename, upload.path)
+    try:
+        jobs.submit(job_id)
+    except JobQueueFull as e:
+        jobs.store.set_status(job_id, FAILED, error=str(e))
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise HTTPException(status_code=503, detail=str(e))
+
+    logger.info(f"[{job_id}] Queued job for: {file.filename}")
+    return {
+        "job_id": job_id,
+        "status": QUEUED,
+        "status_url": f"/v1/process-audio/jobs/{job_id}",
+        "result_url": f"/v1/process-audio/jobs/{job_id}/result",
+    }
+
+
+@router.get("/process-audio/jobs/{job_id}", response_model=JobStatus)
+def get_job_status(job_id: str):
+    job = get_job_queue().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    finished = sum(1 for s in job["stages"].values() if s.get("status") == "done")
+    progress = 1.0 if job["status"] == DONE else finished / len(PIPELINE_STAGES)
+
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "filename": job["filename"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "progress": round(progress, 3),
+        "stages": job["stages"],
+        "error": job["error"],
+    }
+
+
+@router.get("/process-audio/jobs/{job_id}/result", response_model=ProcessAudioResponse)
+def get_job_result(
+    job_id: str,
+    fields: Optional[str] = Query(None),
+    exclude: Optional[str] = Query(None),
+    compact: bool = Query(False),
+    accept: Optional[str] = Header(None),
+):
+    shape = response_shape(accept, fields, exclude, compact)
+    store = get_job_queue().store
+    job = store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job['error']}")
+    if job["status"] != DONE:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+    result = store.get_result(job_id)
+    if shape is not None:
+        return shaped_response(result, shape)
+    return result
@@ -0,0 +1,65 @@
+# app/routes/models.py
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+from app.utils.model_manager import get_model_manager, _rss_bytes
+
+
+router = APIRouter()
+
+
+# --------------------------
+# Response Models
+# --------------------------
+
+class LoadedModel(BaseModel):
+    name: str
+    config: Dict
+    approx_mb: float
+    load_seconds: float
+    hits: int
+    idle_seconds: float
+
+
+class LoadMetrics(BaseModel):
+    name: str
+    config: Dict
+    loads: int
+    failures: int
+    retries: int
+    coalesced: int
+    last_load_seconds: Optional[float] = None
+    total_load_seconds: float
+    last_error: Optional[str] = None
+
+
+class ModelsStatus(BaseModel):
+    budget_mb: float
+    idle_ttl_seconds: float
+    total_mb: float
+    rss_mb: float
+    models: List[LoadedModel]
+    load_metrics: List[LoadMetrics]
+
+
+# --------------------------
+# Routes
+# --------------------------
+
+@router.get("/models", response_model=ModelsStatus)
+def list_models():
+    """
+    Models currently held by the model manager, most recently used last,
+    plus load counters (loads, failures, retries, coalesced waiters).
+    """
+    manager = get_model_manager()
+    return ModelsStatus(
+        budget_mb=round(manager.budget_bytes / 2**20, 1),
+        idle_ttl_seconds=manager.idle_ttl,
+        total_mb=round(manager.total_bytes() / 2**20, 1),
+        rss_mb=round(_rss_bytes() / 2**20, 1),
+        models=manager.stats(),
+        load_metrics=manager.load_metrics(),
+    )
@@ -1,34 +1,49 @@
 # app/routes/process_audio.py
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import tempfile
 import os
 import uuid
-import base64
 
-from app.utils.audio_utils import normalize_to_wav
+from app.utils.audio_utils import AudioBuffer, AudioTooLongError, decode_audio
 from app.utils.logger import logger
+from app.utils.upload_utils import MAX_AUDIO_SECONDS, UploadRejected, save_upload
+from app.utils.stage_graph import Stage, StageGraph
+from app.utils.pipeline_context import PipelineContext
 
 from app.services.asr_service import transcribe_local
-from app.services.diarization_service import diarize_audio
+from app.services.diarization_service import diarization_config, diarize_audio_with_backend
 from app.services.alignment_service import (
     align_transcript_with_speakers,
-    build_conversation,
+    build_conversation_from_segments,
 )
 
 from app.services.metadata_service import MetadataExtractor
 from app.services.sentiment_service import SentimentService
 from app.services.keyword_service import KeywordService
 from app.services.topic_service import TopicService
-from app.services.summary_service import SummaryService
+from app.services.summary_service import SummaryService, SUMMARY_MODE
 from app.services.gender_service import GenderService
-from app.services.pdf_service import PDFService
+from app.services.feature_service import AcousticFeatures, extract_features
 from app.services.emotion_service import EmotionService
 from app.services.intent_service import IntentService
 from app.services.factcheck_service import FactCheckService
 from app.services.flag_service import FlagService
+from app.services.cache_service import (
+    CACHE_HEADER,
+    CacheScope,
+    ResultCache,
+    asr_fingerprint,
+    diarization_fingerprint,
+    file_sha256,
+    get_result_cache,
+    pipeline_fingerprint,
+)
+from app.services.report_service import REPORT_MODES, publish_report
+from app.utils import serialization
 
 
 
@@ -107,6 +122,15 @@ class FactCheckItem(BaseModel):
     status: str
     source: Optional[str] = None
     note: Optional[str] = None
+    evidence: Optional[str] = None
+
+
+class StageTiming(BaseModel):
+    stage: str
+    started_at: float
+    finished_at: float
+    duration: float
+    thread: Optional[str] = None
 
 
 class ProcessAudioResponse(BaseModel):
@@ -125,6 +149,7 @@ class ProcessAudioResponse(BaseModel):
 
     summary: Optional[str] = None
     report_pdf_base64: Optional[str] = None
+    report_url: Optional[str] = None
 
     # NEW
     intents_summary: Optional[Dict[str, int]] = None
@@ -132,41 +157,85 @@ class ProcessAudioResponse(BaseModel):
     flags: Optional[List[FlagItem]] = None
     timeline: Optional[List[Dict]] = None
     emotion_overview: Optional[Dict[str, Dict[str, float]]] = None
+    stage_timings: Optional[List[StageTiming]] = None
+    cache_status: Optional[str] = None
+    artifacts: Optional[Dict[str, Dict]] = None
 
 
 # --------------------------
-# Main Route
+# Response shaping
 # --------------------------
 
-@router.post("/process-audio", response_model=ProcessAudioResponse)
-async def process_audio(file: UploadFile = File(...)):
-    request_id = str(uuid.uuid4())
-    logger.info(f"[{request_id}] Received: {file.filename}")
+def response_shape(
+    accept: Optional[str], fields: Optional[str], exclude: Optional[str], compact: bool
+) -> Optional[Dict]:
+    """
+    Options for the fast serializer path (field selection, compact views,
+    orjson / msgpack, no re-validation), or None when the client wants the
+    plain validated JSON response. Checked before any work is done.
+    """
+    fields_list = serialization.parse_fields(fields)
+    exclude_list = serialization.parse_fields(exclude)
+    msgpack = serialization.wants_msgpack(accept)
+    if not (fields_list or exclude_list or compact or msgpack):
+        return None
 
-    # Validate file type
-    if not file.filename.lower().endswith((".mp3", ".wav", ".m4a", ".flac")):
-        raise HTTPException(status_code=400, detail="Unsupported file format")
+    unknown = serialization.unknown_fields(ProcessAudioResponse, fields_list + exclude_list)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown response fields: {unknown}")
+    if msgpack and serialization.msgpack is None:
+        raise HTTPException(status_code=406, detail="msgpack responses are not available on this server")
+    return {"accept": accept, "fields": fields_list, "exclude": exclude_list, "compact": compact}
 
-    # Temporary workspace
-    tmpdir = tempfile.mkdtemp()
-    in_path = os.path.join(tmpdir, file.filename)
-    wav_path = os.path.join(tmpdir, "normalized.wav")
 
-    try:
-        # Save audio file
-        with open(in_path, "wb") as f:
-            f.write(await file.read())
+def shaped_response(payload: Dict, shape: Dict, headers: Optional[Dict[str, str]] = None):
+    return serialization.fast_response(ProcessAudioResponse, payload, headers=headers, **shape)
+
+
+# --------------------------
+# Pipeline
+# --------------------------
+
+# Thread pool size for independent stages
+PIPELINE_WORKERS = int(os.getenv("VOICEIQ_PIPELINE_WORKERS", "4"))
+
+
+def _normalize(in_path: str, wav_path: str) -> AudioBuffer:
+    # decode once; every audio-consuming stage shares this buffer.
+    # wav_path is only written by the temp-file fallback.
+    return decode_audio(in_path, sr=16000, wav_path=wav_path, max_seconds=MAX_AUDIO_SECONDS)
+
+
+def _transcribe(audio: AudioBuffer, cache_scope: CacheScope, ctx: PipelineContext):
+    text, meta = ctx.get_or_compute(
+        "asr",
+        lambda: cache_scope.memoize("asr", asr_fingerprint(), lambda: transcribe_local(audio)),
+    )
+    return text, meta
+
+
+def _diarize(audio: AudioBuffer, cache_scope: CacheScope, ctx: PipelineContext) -> List[Dict]:
+    def compute():
+        segments, backend = diarize_audio_with_backend(audio)
+        expected = diarization_config()["backend"]
+        if backend != expected:
+            ctx.mark_degraded("diarization", f"{backend} turns instead of {expected}")
+        return segments
 
-        # Normalize audio
-        normalize_to_wav(in_path, wav_path, sr=16000)
+    # mock turns from a failed pyannote run must not be cached under its fingerprint
+    return ctx.get_or_compute(
+        "diarization",
+        lambda: cache_scope.memoize(
+            "diarization", diarization_fingerprint(), compute,
+            cacheable=lambda _: not ctx.is_degraded("diarization"),
+        ),
+    )
 
-        # Step 1: Transcription
-        text, meta = transcribe_local(wav_path)
 
-        # Step 2: Diarization
-        segments = diarize_audio(wav_path)
+def _aligned_segments(ctx: PipelineContext, text: str, meta: Dict, segments: List[Dict]) -> List[Dict]:
+    """Align ASR with diarization once per request (memoized in ctx)."""
 
-        # Step 3: Alignment
+    def align():
         try:
             asr_payload = {
                 "text": text,
@@ -174,126 +243,354 @@ async def process_audio(file: UploadFile = File(...)):
                 "segments": meta.get("segments", []),
             }
             aligned = align_transcript_with_speakers(asr_payload, segments)
-            speaker_segments = aligned.get("speaker_segments", [])
+            return aligned.get("speaker_segments", [])
         except Exception as e:
             logger.error(f"Alignment failed: {e}")
-            speaker_segments = []
+            return []
 
-        # Step 4: Build conversation view
+    return ctx.get_or_compute("speaker_segments", align)
+
+
+def _align(text: str, meta: Dict, segments: List[Dict], ctx: PipelineContext) -> List[Dict]:
+    return _aligned_segments(ctx, text, meta, segments)
+
+
+def _conversation(text: str, meta: Dict, segments: List[Dict], ctx: PipelineContext) -> List[Dict]:
+    def build():
         try:
-            conversation = build_conversation(
-                {"text": text, "meta": meta, "segments": meta.get("segments", [])},
-                segments,
-            )
+            # reuses the alignment instead of running EnhancedAligner again
+            return build_conversation_from_segments(_aligned_segments(ctx, text, meta, segments))
         except Exception as e:
             logger.error(f"Conversation build failed: {e}")
-            conversation = []
+            return []
 
-        # Step 5: Stats
-        speaker_stats = MetadataExtractor.compute_speaker_stats(speaker_segments)
-        conversation_stats = MetadataExtractor.compute_conversation_stats(
-            speaker_segments, segments
-        )
+    return ctx.get_or_compute("conversation", build)
+
+
+def _stats(speaker_segments: List[Dict], segments: List[Dict]):
+    speaker_stats = MetadataExtractor.compute_speaker_stats(speaker_segments)
+    conversation_stats = MetadataExtractor.compute_conversation_stats(
+        speaker_segments, segments
+    )
+    return speaker_stats, conversation_stats
+
+
+def _segment_texts(speaker_segments: List[Dict]) -> List[str]:
+    return [seg.get("text", "") or "" for seg in speaker_segments]
+
+
+def _sentiment(speaker_segments: List[Dict], ctx: PipelineContext) -> List[Dict]:
+    if not speaker_segments:
+        return []
+    sentiments, backend = SentimentService.analyze_texts_with_backend(_segment_texts(speaker_segments))
+    if backend == "fallback":
+        ctx.mark_degraded("sentiment", "model unavailable, all segments neutral")
+    return sentiments
+
+
+def _segment_embeddings(ctx: PipelineContext, speaker_segments: List[Dict]):
+    return ctx.get_or_compute(
+        "segment_embeddings",
+        lambda: KeywordService.embed_texts(_segment_texts(speaker_segments)),
+    )
+
+
+def _keywords(speaker_segments: List[Dict], ctx: PipelineContext) -> List[List[str]]:
+    if not speaker_segments:
+        return []
+    return ctx.get_or_compute(
+        "keywords",
+        lambda: KeywordService.extract_keywords_batch(
+            _segment_texts(speaker_segments),
+            top_k=5,
+            text_embeddings=_segment_embeddings(ctx, speaker_segments),
+        ),
+    )
+
+
+def _features(audio: AudioBuffer) -> AcousticFeatures:
+    # one STFT / pitch pass over the whole call, sliced by gender + emotion
+    return extract_features(audio)
+
+
+def _gender(speaker_segments: List[Dict], audio: AudioBuffer, features: AcousticFeatures) -> List[Dict]:
+    if not speaker_segments:
+        return []
+    # GenderService writes into the dicts it gets; keep the shared list intact
+    return GenderService.add_gender_to_segments(
+        [dict(s) for s in speaker_segments], audio, features=features
+    )
+
+
+def _merge_enrichment(
+    speaker_segments: List[Dict],
+    sentiments: List[Dict],
+    keywords: List[List[str]],
+    gender_segments: List[Dict],
+) -> List[Dict]:
+    """Fold the independently computed per-segment annotations back together."""
+    merged = []
+    for i, seg in enumerate(speaker_segments):
+        out = dict(seg)
+        out["sentiment"] = sentiments[i]["label"]
+        out["sentiment_score"] = sentiments[i]["score"]
+        out["keywords"] = keywords[i]
+        out["gender"] = gender_segments[i].get("gender")
+        out["gender_confidence"] = gender_segments[i].get("gender_confidence")
+        merged.append(out)
+    return merged
 
-        # Step 6: Sentiment + Keywords + Gender
-        if speaker_segments:
-            speaker_segments = SentimentService.analyze_speaker_segments(speaker_segments)
-            speaker_segments = KeywordService.extract_keywords_per_segment(speaker_segments)
-            speaker_segments = GenderService.add_gender_to_segments(speaker_segments, wav_path)
-
-        # NEW Step 6b: Emotion (audio/text)
-        if speaker_segments:
-            speaker_segments = EmotionService.analyze_speaker_segments(wav_path, speaker_segments)
-            emotion_overview = EmotionService.summarize_emotions(speaker_segments)
-        else:
-            emotion_overview = {}
-
-        # Step 7: Topic detection
-        topic = TopicService.classify(text or "")
-
-        # Step X: Generate summary
-        summary = SummaryService.generate_summary(text or "")
-
-        # NEW: Intent classification (use conversation if available)
-        if conversation:
-            conversation_with_intents = IntentService.annotate_conversation(conversation)
-        else:
-            # fallback: build from speaker_segments
-            conv_fallback = []
-            for seg in speaker_segments or []:
-                conv_fallback.append(
-                    {
-                        "start": seg.get("start", 0.0),
-                        "end": seg.get("end", 0.0),
-                        "speaker": seg.get("speaker", "UNKNOWN"),
-                        "text": seg.get("text", ""),
-                    }
-                )
-            conversation_with_intents = IntentService.annotate_conversation(conv_fallback)
-
-        intents_summary = IntentService.summarize_intents(conversation_with_intents)
-
-        # NEW: Fact-check candidates from transcript
-        fact_checks = FactCheckService.fact_check(text or "")
-
-        # NEW: Flags (hesitation, aggression, lie-risk)
-        flags = FlagService.generate_flags(conversation_with_intents)
-
-        # NEW: Visual timeline structure (for UI charts)
-        timeline = []
-        for turn in conversation_with_intents:
-            timeline.append(
+
+def _emotion(enriched_segments: List[Dict], audio: AudioBuffer, features: AcousticFeatures):
+    if not enriched_segments:
+        return enriched_segments, {}
+    analyzed = EmotionService.analyze_speaker_segments(audio, enriched_segments, features=features)
+    return analyzed, EmotionService.summarize_emotions(analyzed)
+
+
+def _topic(text: str) -> Dict:
+    return TopicService.classify(text or "")
+
+
+def _summary(text: str, conversation: List[Dict]) -> str:
+    # map-reduce chunks follow turn boundaries; the plain transcript is the fallback
+    turns = [turn.get("text", "") for turn in conversation or []]
+    if any(t.strip() for t in turns) and SUMMARY_MODE == "map-reduce":
+        return SummaryService.summarize_turns(turns)
+    return SummaryService.generate_summary(text or "")
+
+
+def _fact_check(text: str) -> List[Dict]:
+    return FactCheckService.fact_check(text or "")
+
+
+def _intents(conversation: List[Dict], speaker_segments: List[Dict]):
+    if conversation:
+        conversation_with_intents = IntentService.annotate_conversation(conversation)
+    else:
+        # fallback: build from speaker_segments
+        conv_fallback = []
+        for seg in speaker_segments or []:
+            conv_fallback.append(
                 {
-                    "start": turn.get("start", 0.0),
-                    "end": turn.get("end", 0.0),
-                    "speaker": turn.get("speaker", "UNKNOWN"),
-                    "text": turn.get("text", ""),
-                    "intent": turn.get("intent", "other"),
+                    "start": seg.get("start", 0.0),
+                    "end": seg.get("end", 0.0),
+                    "speaker": seg.get("speaker", "UNKNOWN"),
+                    "text": seg.get("text", ""),
                 }
             )
+        conversation_with_intents = IntentService.annotate_conversation(conv_fallback)
+
+    return conversation_with_intents, IntentService.summarize_intents(conversation_with_intents)
+
 
-        # Step X: Generate PDF (extended)
-        pdf_bytes = PDFService.generate_pdf_report(
-            transcript=text,
-            speaker_segments=speaker_segments,
-            summary=summary,
-            topic=topic.get("topic", ""),
-            conversation_stats=conversation_stats,
-            speaker_stats=speaker_stats,
-            emotion_overview=emotion_overview,
-            intents_summary=intents_summary,
-            flags=flags,
-            fact_checks=fact_checks,
+def _flags(conversation_with_intents: List[Dict]):
+    flags = FlagService.generate_flags(conversation_with_intents)
+
+    # Visual timeline structure (for UI charts)
+    timeline = []
+    for turn in conversation_with_intents:
+        timeline.append(
+            {
+                "start": turn.get("start", 0.0),
+                "end": turn.get("end", 0.0),
+                "speaker": turn.get("speaker", "UNKNOWN"),
+                "text": turn.get("text", ""),
+                "intent": turn.get("intent", "other"),
+            }
         )
+    return flags, timeline
+
+
+PIPELINE_GRAPH = StageGraph(
+    [
+        Stage("normalize", _normalize, ["in_path", "wav_path"], ["audio"]),
+        # ASR and diarization only need the normalized audio
+        Stage("transcription", _transcribe, ["audio", "cache_scope", "ctx"], ["text", "meta"]),
+        Stage("diarization", _diarize, ["audio", "cache_scope", "ctx"], ["segments"]),
+        Stage("features", _features, ["audio"], ["features"]),
+        # transcript-only analytics start as soon as ASR is done
+        Stage("topic", _topic, ["text"], ["topic"]),
+        Stage("summary", _summary, ["text", "conversation"], ["summary"]),
+        Stage("fact_check", _fact_check, ["text"], ["fact_checks"]),
+        # alignment + conversation share one memoized alignment via ctx
+        Stage("alignment", _align, ["text", "meta", "segments", "ctx"], ["speaker_segments"]),
+        Stage("conversation", _conversation, ["text", "meta", "segments", "ctx"], ["conversation"]),
+        Stage("stats", _stats, ["speaker_segments", "segments"], ["speaker_stats", "conversation_stats"]),
+        # per-segment enrichment fan-out
+        Stage("sentiment", _sentiment, ["speaker_segments", "ctx"], ["sentiments"]),
+        Stage("keywords", _keywords, ["speaker_segments", "ctx"], ["keywords"]),
+        Stage("gender", _gender, ["speaker_segments", "audio", "features"], ["gender_segments"]),
+        Stage(
+            "enrichment",
+            _merge_enrichment,
+            ["speaker_segments", "sentiments", "keywords", "gender_segments"],
+            ["enriched_segments"],
+        ),
+        Stage("emotion", _emotion, ["enriched_segments", "audio", "features"], ["analyzed_segments", "emotion_overview"]),
+        Stage("intents", _intents, ["conversation", "speaker_segments"], ["conversation_with_intents", "intents_summary"]),
+        Stage("flags", _flags, ["conversation_with_intents"], ["flags", "timeline"]),
+        # the PDF report is not a stage: see publish_report() in run_pipeline
+    ],
+    max_workers=PIPELINE_WORKERS,
+)
 
-        pdf_b64 = PDFService.to_base64(pdf_bytes)
+# Stage names, reported as per-stage progress for async jobs
+PIPELINE_STAGES = [stage.name for stage in PIPELINE_GRAPH.stages]
+
+
+def run_pipeline(
+    in_path: str,
+    request_id: str,
+    on_stage: Optional[Callable[[str, str], None]] = None,
+    audio_sha256: Optional[str] = None,
+    use_cache: bool = True,
+    report_mode: Optional[str] = None,
+) -> Dict:
+    """
+    Run the full Whisper -> diarization -> enrichment pipeline on a saved
+    upload and return the ProcessAudioResponse payload.
+
+    Shared by the synchronous route and the async job workers. Stages run
+    through PIPELINE_GRAPH, so independent stages overlap; on_stage(name,
+    "running" | "done" | "failed") is called around every stage.
+
+    Results are cached by audio SHA-256 + pipeline fingerprint: a repeated
+    submission returns the stored response, and ASR / diarization artifacts
+    are reused even when only downstream settings changed.
+
+    The PDF report is published per report_mode (default
+    VOICEIQ_REPORT_MODE): only "inline" lays it out here; "lazy" and
+    "background" store the analysis for GET /v1/reports/{request_id}.pdf.
+    """
+    cache = get_result_cache() if use_cache else None
+    if cache is not None and audio_sha256 is None:
+        audio_sha256 = file_sha256(in_path)
+    cache_scope = CacheScope(cache, audio_sha256)
+
+    response_key = None
+    if cache_scope.enabled:
+        response_key = ResultCache.make_key("response", audio_sha256, pipeline_fingerprint())
+        cached = cache.get(response_key)
+        if cached is not None:
+            logger.info(f"[{request_id}] Result cache hit ({audio_sha256[:12]}).")
+            cached["request_id"] = request_id
+            cached["cache_status"] = "hit"
+            # timings / artifact reuse describe the run that filled the cache, not this one
+            cached["stage_timings"] = None
+            cached["artifacts"] = None
+            cached.update(publish_report(request_id, cached, report_mode))
+            return cached
 
+    tmpdir = tempfile.mkdtemp()
+    wav_path = os.path.join(tmpdir, "normalized.wav")
+    ctx = PipelineContext(request_id)
 
-        return {
+    try:
+        out, timings = PIPELINE_GRAPH.run(
+            {"in_path": in_path, "wav_path": wav_path, "cache_scope": cache_scope, "ctx": ctx},
+            on_stage=on_stage,
+            context=ctx,
+        )
+        ctx.log_report()
+        logger.info(
+            f"[{request_id}] Stage timings: "
+            + ", ".join(f"{t['stage']}={t['duration']:.2f}s" for t in timings)
+        )
+
+        payload = {
             "request_id": request_id,
-            "transcript": text or "",
-            "asr_meta": meta,
-            "segments": segments or [],
-            "speaker_segments": speaker_segments,
-            "conversation": conversation_with_intents,  # now includes 'intent'
-            "speaker_stats": speaker_stats,
-            "conversation_stats": conversation_stats,
-            "topic": topic,
-            "summary": summary,
-            "report_pdf_base64": pdf_b64,
-            "intents_summary": intents_summary,
-            "fact_checks": fact_checks,
-            "flags": flags,
-            "timeline": timeline,
-            "emotion_overview": emotion_overview,
+            "transcript": out["text"] or "",
+            "asr_meta": out["meta"],
+            "segments": out["segments"] or [],
+            "speaker_segments": out["analyzed_segments"],
+            "conversation": out["conversation_with_intents"],  # now includes 'intent'
+            "speaker_stats": out["speaker_stats"],
+            "conversation_stats": out["conversation_stats"],
+            "topic": out["topic"],
+            "summary": out["summary"],
+            "report_pdf_base64": None,
+            "report_url": None,
+            "intents_summary": out["intents_summary"],
+            "fact_checks": out["fact_checks"],
+            "flags": out["flags"],
+            "timeline": out["timeline"],
+            "emotion_overview": out["emotion_overview"],
+            "stage_timings": timings,
+            "cache_status": "miss" if cache_scope.enabled else "bypass",
+            "artifacts": {
+                name: info for name, info in ctx.report().items() if info["status"] != "provided"
+            },
         }
 
+        if response_key is not None and ctx.degraded:
+            # a fallback result would be replayed for this audio until evicted
+            logger.warning(f"[{request_id}] Not caching degraded result: {', '.join(ctx.degraded)}.")
+        elif response_key is not None:
+            cache.put(response_key, "response", payload)
+        payload.update(publish_report(request_id, payload, report_mode))
+        return payload
 
     finally:
         # Cleanup
         try:
-            if os.path.exists(in_path): os.remove(in_path)
             if os.path.exists(wav_path): os.remove(wav_path)
             os.rmdir(tmpdir)
         except Exception as e:
-            logger.warning(f"Cleanup warning: {e}")
\ No newline at end of file
+            logger.warning(f"Cleanup warning: {e}")
+
+
+# --------------------------
+# Main Route
+# --------------------------
+
+@router.post("/process-audio", response_model=ProcessAudioResponse)
+async def process_audio(
+    response: Response,
+    file: UploadFile = File(...),
+    cache_mode: Optional[str] = Header(None, alias=CACHE_HEADER),
+    report: Optional[str] = Query(None, description="none | lazy | background | inline"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. summary,topic"),
+    exclude: Optional[str] = Query(None, description="Comma-separated fields to drop, e.g. asr_meta.segments"),
+    compact: bool = Query(False, description="Drop the duplicated timeline views"),
+    accept: Optional[str] = Header(None),
+):
+    if report is not None and report not in REPORT_MODES:
+        raise HTTPException(status_code=422, detail=f"report must be one of {list(REPORT_MODES)}")
+    shape = response_shape(accept, fields, exclude, compact)
+
+    request_id = str(uuid.uuid4())
+    logger.info(f"[{request_id}] Received: {file.filename}")
+
+    # Temporary workspace
+    tmpdir = tempfile.mkdtemp()
+    upload = None
+
+    try:
+        # Stream the upload to disk (size-bounded, format sniffed from magic bytes)
+        upload = await save_upload(file, tmpdir)
+        logger.info(f"[{request_id}] Stored {upload.size} bytes, sha256={upload.sha256}")
+
+        # Run the pipeline off the event loop so job polling stays responsive
+        use_cache = (cache_mode or "").lower() != "bypass"
+        result = await run_in_threadpool(
+            run_pipeline, upload.path, request_id, None, upload.sha256, use_cache, report
+        )
+        cache_status = result.get("cache_status") or "bypass"
+        if shape is not None:
+            return shaped_response(result, shape, headers={CACHE_HEADER: cache_status})
+        response.headers[CACHE_HEADER] = cache_status
+        return result
+
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except AudioTooLongError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    finally:
+        # Cleanup
+        try:
+            if upload and os.path.exists(upload.path): os.remove(upload.path)
+            os.rmdir(tmpdir)
+        except Exception as e:
+            logger.warning(f"Cleanup warning: {e}")
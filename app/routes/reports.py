@@ -0,0 +1,35 @@
+# app/routes/reports.py
+
+from fastapi import APIRouter, Header, HTTPException, Response
+from typing import Optional
+
+from app.services.report_service import get_report_store
+
+
+router = APIRouter()
+
+# Rendered reports never change for a request_id
+REPORT_CACHE_CONTROL = "private, max-age=86400, immutable"
+
+
+# --------------------------
+# Routes
+# --------------------------
+
+@router.get("/reports/{request_id}.pdf")
+def get_report(request_id: str, if_none_match: Optional[str] = Header(None)):
+    """
+    PDF report of a finished request, rendered from its stored analysis on
+    first fetch (or earlier by the background worker) and kept afterwards.
+    """
+    report = get_report_store().render(request_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    etag = f'"{report["etag"]}"'
+    headers = {"ETag": etag, "Cache-Control": REPORT_CACHE_CONTROL}
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f'inline; filename="voiceiq-report-{request_id}.pdf"'
+    return Response(content=report["pdf"], media_type="application/pdf", headers=headers)
@@ -0,0 +1,75 @@
+# app/routes/stream.py
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+import json
+
+from app.utils.logger import logger
+from app.services.streaming_service import StreamingSession, STREAM_SAMPLE_RATE
+
+
+router = APIRouter()
+
+
+@router.websocket("/stream")
+async def stream_audio(
+    websocket: WebSocket,
+    speaker: str = "SPEAKER_00",
+    language: Optional[str] = None,
+    sample_rate: int = STREAM_SAMPLE_RATE,
+):
+    """
+    Live transcription + per-turn analytics.
+
+    Client -> server:
+      binary frames   16 kHz mono PCM (s16le), any frame size
+      {"type": "stop"} flush and close (disconnecting also works)
+
+    Server -> client (JSON):
+      {"type": "partial", start, end, text}          still-changing tail
+      {"type": "final", segment, flags, lag_seconds, processing_seconds}
+      {"type": "end", duration, segments, intents_summary, flags}
+      {"type": "error", detail}
+    """
+    await websocket.accept()
+
+    if sample_rate != STREAM_SAMPLE_RATE:
+        await websocket.send_json(
+            {"type": "error", "detail": f"Only {STREAM_SAMPLE_RATE} Hz mono s16le is supported"}
+        )
+        await websocket.close(code=1003)
+        return
+
+    session = StreamingSession(speaker=speaker, language=language)
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                # ASR blocks; keep the event loop free for other streams
+                for out in await run_in_threadpool(session.feed, message["bytes"]):
+                    await websocket.send_json(out)
+            elif message.get("text") is not None:
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = {}
+                if isinstance(control, dict) and control.get("type") == "stop":
+                    for out in await run_in_threadpool(session.finish):
+                        await websocket.send_json(out)
+                    await websocket.close()
+                    return
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.exception(f"Stream failed: {e}")
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1011)
+        return
+
+    # client went away without "stop": still log the session totals
+    await run_in_threadpool(session.finish)
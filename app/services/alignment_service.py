@@ -1,6 +1,7 @@
 # app/services/alignment_service.py
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from bisect import bisect_left, bisect_right
 import math
 from app.utils.logger import logger
 
@@ -48,6 +49,51 @@ def _best_diar_for_asr(asr_seg: Dict, diar: List[Dict]) -> Dict:
     return best
 
 
+class _IntervalIndex:
+    """
+    Static interval index for overlap queries.
+
+    Intervals are sorted by start (stable, so ties keep input order) and
+    carry a running maximum of their ends. For a query [q_start, q_end):
+      - bisect on starts bounds the candidates with start < q_end
+      - bisect on the running max skips every prefix that ends <= q_start
+    Each query costs O(log n + hits); for non-nested intervals (Whisper
+    segments and their word slices) there is no extra scanning at all.
+    """
+
+    def __init__(self, intervals: List[Dict]):
+        self.order = sorted(range(len(intervals)), key=lambda i: intervals[i]["start"])
+        self.items = [intervals[i] for i in self.order]
+        self.starts = [float(it["start"]) for it in self.items]
+        self.ends = [float(it["end"]) for it in self.items]
+
+        self.max_end = []
+        running = float("-inf")
+        for e in self.ends:
+            running = max(running, e)
+            self.max_end.append(running)
+
+    def overlapping(self, q_start: float, q_end: float) -> List[int]:
+        """Sorted positions of intervals with start < q_end and end > q_start."""
+        hi = bisect_left(self.starts, q_end)
+        lo = bisect_right(self.max_end, q_start, 0, hi)
+        ends = self.ends
+        return [k for k in range(lo, hi) if ends[k] > q_start]
+
+    def best_overlap(self, q_start: float, q_end: float) -> Optional[Dict]:
+        """
+        Interval with the largest overlap; ties go to the earliest one in
+        input order (same result as _best_diar_for_asr's linear scan).
+        """
+        best, best_overlap, best_rank = None, 0.0, None
+        for k in self.overlapping(q_start, q_end):
+            ov = _overlap(q_start, q_end, self.starts[k], self.ends[k])
+            rank = self.order[k]
+            if ov > best_overlap or (ov == best_overlap and best is not None and rank < best_rank):
+                best, best_overlap, best_rank = self.items[k], ov, rank
+        return best
+
+
 # ------------------------------------------------------------
 # Main Enhancer
 # ------------------------------------------------------------
@@ -150,6 +196,10 @@ class EnhancedAligner:
         """
         Maps each diarization segment to the text produced by all words
         falling inside that segment's time span.
+
+        Words are looked up through an interval index (binary search on
+        sorted starts / running max of ends) instead of scanning every word
+        for every diarization segment: O((W + D) log W) rather than O(W x D).
         """
         aligned = []
 
@@ -157,17 +207,14 @@ class EnhancedAligner:
             return aligned
 
         # Sort for stability
-        word_segments = sorted(word_segments, key=lambda x: x["start"])
+        word_index = _IntervalIndex(word_segments)
         diarization = sorted(diarization, key=lambda x: x["start"])
 
         for d in diarization:
             d_start, d_end = d["start"], d["end"]
             speaker = d["speaker"]
 
-            words = [
-                w for w in word_segments
-                if not (w["end"] <= d_start or w["start"] >= d_end)
-            ]
+            words = [word_index.items[k] for k in word_index.overlapping(d_start, d_end)]
 
             if not words:
                 continue
@@ -234,11 +281,10 @@ class EnhancedAligner:
         merged = cls._merge_blocks(raw)
 
         # Attach ASR-based confidence
+        asr_index = _IntervalIndex(asr)
         for seg in merged:
             # best ASR segment that overlaps this diar block
-            best = _best_diar_for_asr(
-                {"start": seg["start"], "end": seg["end"]}, asr
-            )
+            best = asr_index.best_overlap(float(seg["start"]), float(seg["end"]))
             if best:
                 seg["confidence"] = _confidence_from_whisper(best)
             else:
@@ -274,7 +320,15 @@ def build_conversation(asr_result: Any, diarization_result: List[Dict]) -> List[
     - Produces chronological blocks
     """
     aligned = EnhancedAligner.align(asr_result, diarization_result)
-    segments = aligned.get("speaker_segments", [])
+    return build_conversation_from_segments(aligned.get("speaker_segments", []))
+
+
+def build_conversation_from_segments(speaker_segments: List[Dict]) -> List[Dict]:
+    """
+    Same as build_conversation, but starts from already aligned
+    speaker_segments so callers that have them skip a second alignment.
+    """
+    segments = speaker_segments
     if not segments:
         return []
 
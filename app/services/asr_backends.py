@@ -0,0 +1,192 @@
+# app/services/asr_backends.py
+
+import os
+from typing import Any, Dict, Optional, Type, Union
+
+import numpy as np
+
+from app.utils.logger import logger
+
+
+# Engine used by transcribe_local unless a caller asks for another one
+ASR_BACKEND = os.getenv("ASR_BACKEND", "whisper")
+# Weight format for the quantized engine: int8, int8_float32, float32, ...
+ASR_COMPUTE_TYPE = os.getenv("ASR_COMPUTE_TYPE", "int8")
+ASR_BEAM_SIZE = int(os.getenv("ASR_BEAM_SIZE", "5"))
+
+Audio = Union[str, np.ndarray]
+
+
+class ASRBackend:
+    """
+    One speech-to-text engine.
+
+    load() returns the engine's model object; transcribe() turns a WAV path
+    or a 16 kHz float32 array into a Whisper-style result:
+      {
+        "text": str,
+        "language": str | None,
+        "duration": float | None,
+        "segments": [{id, start, end, text, avg_logprob, no_speech_prob}, ...]
+      }
+    which is what EnhancedAligner._extract_asr_segments reads from meta.
+    """
+
+    name = "base"
+
+    def config(self) -> Dict:
+        """Settings that change this engine's output (part of asr_config)."""
+        return {}
+
+    def load(self, model_name: str) -> Any:
+        raise NotImplementedError
+
+    def transcribe(self, model: Any, audio: Audio, language: Optional[str] = None) -> Dict:
+        raise NotImplementedError
+
+
+# ------------------------------------------------------------
+# Reference Whisper (openai-whisper, float32 on CPU)
+# ------------------------------------------------------------
+class WhisperBackend(ASRBackend):
+
+    name = "openai-whisper"
+
+    def load(self, model_name: str) -> Any:
+        import whisper
+        return whisper.load_model(model_name)
+
+    def transcribe(self, model: Any, audio: Audio, language: Optional[str] = None) -> Dict:
+        import torch
+        result = model.transcribe(audio, language=language, fp16=torch.cuda.is_available())
+        return {
+            "text": result["text"],
+            "language": result.get("language"),
+            "duration": result.get("duration"),
+            "segments": result.get("segments", []),
+        }
+
+
+# ------------------------------------------------------------
+# Quantized CTranslate2 engine (faster-whisper, int8 by default)
+# ------------------------------------------------------------
+class FasterWhisperBackend(ASRBackend):
+
+    name = "faster-whisper"
+
+    def __init__(self, compute_type: str = ASR_COMPUTE_TYPE, beam_size: int = ASR_BEAM_SIZE):
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+
+    def config(self) -> Dict:
+        return {"compute_type": self.compute_type, "beam_size": self.beam_size}
+
+    def load(self, model_name: str) -> Any:
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise RuntimeError(
+                "ASR_BACKEND=faster-whisper needs the faster-whisper package"
+            ) from e
+
+        threads = int(os.getenv("ASR_CPU_THREADS", "0"))
+        logger.info(f"Loading faster-whisper '{model_name}' ({self.compute_type}).")
+        return WhisperModel(model_name, device="cpu", compute_type=self.compute_type, cpu_threads=threads)
+
+    def transcribe(self, model: Any, audio: Audio, language: Optional[str] = None) -> Dict:
+        # segments is a lazy generator; decoding happens while we iterate
+        segments, info = model.transcribe(audio, language=language, beam_size=self.beam_size)
+
+        segs = [
+            {
+                "id": i,
+                "start": float(s.start),
+                "end": float(s.end),
+                "text": s.text,
+                "avg_logprob": float(s.avg_logprob),
+                "no_speech_prob": float(s.no_speech_prob),
+            }
+            for i, s in enumerate(segments)
+        ]
+        return {
+            "text": "".join(s["text"] for s in segs),
+            "language": info.language,
+            "duration": info.duration,
+            "segments": segs,
+        }
+
+
+# ------------------------------------------------------------
+# Dummy engine (tests, local development without models)
+# ------------------------------------------------------------
+class DummyBackend(ASRBackend):
+    """
+    Emits one fixed sentence every 5 seconds of audio. No model, no download.
+    """
+
+    name = "dummy"
+    SEGMENT_SECONDS = 5.0
+    SENTENCE = " This is a placeholder transcript segment."
+
+    def load(self, model_name: str) -> Any:
+        return None
+
+    def transcribe(self, model: Any, audio: Audio, language: Optional[str] = None) -> Dict:
+        if isinstance(audio, str):
+            import soundfile as sf
+            duration = float(sf.info(audio).duration)
+        else:
+            duration = len(audio) / 16000.0
+
+        segs, start, i = [], 0.0, 0
+        while start < duration:
+            end = min(start + self.SEGMENT_SECONDS, duration)
+            segs.append(
+                {
+                    "id": i,
+                    "start": round(start, 3),
+                    "end": round(end, 3),
+                    "text": self.SENTENCE,
+                    "avg_logprob": -0.2,
+                    "no_speech_prob": 0.0,
+                }
+            )
+            start, i = end, i + 1
+
+        return {
+            "text": "".join(s["text"] for s in segs),
+            "language": language or "en",
+            "duration": duration,
+            "segments": segs,
+        }
+
+
+# ------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------
+_BACKENDS: Dict[str, Type[ASRBackend]] = {
+    "whisper": WhisperBackend,
+    "openai-whisper": WhisperBackend,
+    "faster-whisper": FasterWhisperBackend,
+    "dummy": DummyBackend,
+}
+
+_instances: Dict[str, ASRBackend] = {}
+
+
+def register_backend(name: str, backend_cls: Type[ASRBackend]) -> None:
+    _BACKENDS[name] = backend_cls
+    _instances.pop(name, None)
+
+
+def available_backends():
+    return sorted(_BACKENDS)
+
+
+def get_backend(name: Optional[str] = None) -> ASRBackend:
+    name = name or ASR_BACKEND
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown ASR backend '{name}'. Available: {available_backends()}")
+    if name not in _instances:
+        _instances[name] = _BACKENDS[name]()
+    return _instances[name]
@@ -1,38 +1,81 @@
 # app/services/asr_service.py
-import whisper
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Union
+from app.services import asr_backends
+from app.services.asr_backends import get_backend
+from app.utils.audio_utils import AudioBuffer
 from app.utils.logger import logger
+from app.utils.model_manager import get_model_manager
 
-# Global model cache (so Whisper loads once)
-_model = None
+# Default Whisper size, overridable per deployment. The engine that runs it
+# is picked by ASR_BACKEND (whisper | faster-whisper | dummy), see asr_backends.
+DEFAULT_MODEL_NAME = os.getenv("WHISPER_MODEL", "base")
 
-def load_model(model_name: str = "base"):
+# Long-audio mode: recordings at least this long (seconds) are split at
+# quiet points and transcribed in parallel. 0 disables it.
+LONG_AUDIO_SECONDS = float(os.getenv("ASR_LONG_AUDIO_SECONDS", "600"))
+CHUNK_SECONDS = float(os.getenv("ASR_CHUNK_SECONDS", "30"))
+# How far from the nominal cut the splitter may look for silence
+CHUNK_SEARCH_SECONDS = 5.0
+# Context added on both sides of a chunk so words at the cut are not lost
+CHUNK_PAD_SECONDS = 1.0
+ASR_WORKERS = int(os.getenv("ASR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+def asr_config(model_name: str = DEFAULT_MODEL_NAME) -> Dict:
+    """Settings that change ASR output (used to fingerprint cached results)."""
+    backend = get_backend()
+    config = {"engine": backend.name, "model": model_name, **backend.config()}
+    if _long_audio_enabled():
+        config["long_audio"] = {
+            "min_seconds": LONG_AUDIO_SECONDS,
+            "chunk_seconds": CHUNK_SECONDS,
+            "pad_seconds": CHUNK_PAD_SECONDS,
+        }
+    return config
+
+def load_model(model_name: str = DEFAULT_MODEL_NAME):
     """
-    Load the Whisper model (once).
+    Load a Whisper model with the configured ASR backend, through the model
+    manager: each (backend, size) is loaded once and kept until evicted.
     Available models: tiny, base, small, medium, large
     """
-    global _model
-    if _model is None:
-        logger.info(f"Loading Whisper model: {model_name}")
-        _model = whisper.load_model(model_name)
-        logger.info(f"Whisper model '{model_name}' loaded successfully.")
-    return _model
+    backend = get_backend()
+
+    def _load():
+        logger.info(f"Loading Whisper model: {model_name} ({backend.name})")
+        return backend.load(model_name)
 
-def transcribe_local(wav_path: str, model_name: str = "base", language: str = None):
+    return get_model_manager().get(
+        "asr", _load, {"engine": backend.name, "model": model_name, **backend.config()}
+    )
+
+def transcribe_local(audio: Union[str, AudioBuffer], model_name: str = DEFAULT_MODEL_NAME, language: str = None):
     """
-    Transcribe an audio file using the local Whisper model.
+    Transcribe audio using the local Whisper model.
     Args:
-        wav_path (str): Path to 16kHz mono WAV file
+        audio: Path to 16kHz mono WAV file, or the request's decoded AudioBuffer
+               (fed to Whisper as a float32 array, no file needed)
         model_name (str): Whisper model size ('tiny', 'base', 'small', etc.)
         language (str): Optional language hint (e.g., 'en')
 
     Returns:
         tuple: (transcript_text, metadata_dict)
     """
+    if isinstance(audio, AudioBuffer) and _long_audio_enabled() and audio.duration >= LONG_AUDIO_SECONDS:
+        return transcribe_long(audio, model_name=model_name, language=language)
+
     model = load_model(model_name)
-    logger.info(f"Transcribing audio: {wav_path}")
+    logger.info(f"Transcribing audio: {audio}")
 
     # Perform transcription
-    result = model.transcribe(wav_path, language=language)
+    source = audio.samples if isinstance(audio, AudioBuffer) else audio
+    result = get_backend().transcribe(model, source, language=language)
 
     text = result["text"].strip()
     segments = result.get("segments", [])
@@ -41,6 +84,187 @@ def transcribe_local(wav_path: str, model_name: str = "base", language: str = No
     return text, {
         "model": model_name,
         "language": result.get("language"),
-        "duration": result.get("duration"),
+        "duration": result.get("duration") or (
+            audio.duration if isinstance(audio, AudioBuffer) else None
+        ),
         "segments": segments
     }
+
+
+# ------------------------------------------------------------
+# Long-audio mode: silence-aware chunks on a process pool
+# ------------------------------------------------------------
+# One pool per (model, backend): switching models must not shut down a
+# pool that another request still has chunks queued on.
+_pools: Dict[Tuple[str, str], ProcessPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+def _long_audio_enabled() -> bool:
+    return LONG_AUDIO_SECONDS > 0 and CHUNK_SECONDS > 0
+
+def find_split_points(
+    samples: np.ndarray,
+    sr: int,
+    chunk_seconds: float = CHUNK_SECONDS,
+    search_seconds: float = CHUNK_SEARCH_SECONDS,
+    frame_seconds: float = 0.05,
+    max_seconds: Optional[float] = None,
+) -> List[int]:
+    """
+    Sample offsets where the recording should be cut: near every
+    `chunk_seconds` mark, at the quietest frame (lowest RMS) within
+    +/- `search_seconds`. With `max_seconds`, no piece is longer than
+    that (the search never looks past it). Returns [0, ..., len(samples)].
+    """
+    n = len(samples)
+    frame = max(1, int(frame_seconds * sr))
+    n_frames = n // frame
+    if n_frames == 0 or n <= (max_seconds or chunk_seconds) * sr:
+        return [0, n]
+
+    frames = samples[: n_frames * frame].reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+    chunk_frames = max(1, int(chunk_seconds / frame_seconds))
+    search_frames = int(search_seconds / frame_seconds)
+    max_frames = int(max_seconds / frame_seconds) if max_seconds else None
+
+    cuts = [0]
+    target = chunk_frames
+    while target < n_frames - search_frames or (max_frames and n_frames - cuts[-1] // frame > max_frames):
+        prev = cuts[-1] // frame
+        lo = max(prev + 1, target - search_frames)
+        hi = min(n_frames, target + search_frames + 1)
+        if max_frames:
+            hi = min(hi, prev + max_frames + 1)
+            lo = min(lo, hi - 1)
+        best = lo + int(np.argmin(rms[lo:hi]))
+        cuts.append(best * frame)
+        target = best + chunk_frames
+    cuts.append(n)
+    return cuts
+
+def _init_worker(model_name: str, threads: int, backend_name: str):
+    import torch
+    torch.set_num_threads(threads)
+    # same engine as the parent, even if it was chosen after import
+    asr_backends.ASR_BACKEND = backend_name
+    load_model(model_name)
+
+def _transcribe_chunk(samples: np.ndarray, model_name: str, language: Optional[str]) -> Dict:
+    model = load_model(model_name)
+    result = get_backend().transcribe(model, samples, language=language)
+    return {"language": result.get("language"), "segments": result.get("segments", [])}
+
+def _get_pool(model_name: str) -> ProcessPoolExecutor:
+    backend_name = get_backend().name
+    key = (model_name, backend_name)
+    with _pool_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            workers = max(1, ASR_WORKERS)
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            logger.info(f"Starting ASR process pool for {model_name} ({backend_name}): {workers} workers x {threads} threads.")
+            pool = _pools[key] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name, threads, backend_name),
+            )
+        return pool
+
+def _discard_pool(model_name: str, pool: ProcessPoolExecutor) -> None:
+    """Forget a broken pool (a worker died) so the next call starts a fresh one."""
+    with _pool_lock:
+        for key, cached in list(_pools.items()):
+            if cached is pool:
+                del _pools[key]
+    pool.shutdown(wait=False, cancel_futures=True)
+    logger.warning(f"ASR process pool for {model_name} was broken; discarded.")
+
+def stitch_segments(
+    chunk_results: List[Dict],
+    windows: List[Tuple[float, float, float, float]],
+) -> List[Dict]:
+    """
+    Merge per-chunk Whisper segments back onto the recording timeline.
+
+    windows[i] = (offset, core_start, core_end, window_end) in seconds:
+    chunk i was transcribed from `offset` (core_start minus padding) to
+    window_end. Segment times are shifted by `offset`; a segment is kept
+    only by the chunk whose core contains its midpoint, so the padded
+    overlap between neighbours is never transcribed twice.
+    """
+    stitched = []
+    for result, (offset, core_start, core_end, window_end) in zip(chunk_results, windows):
+        for seg in result.get("segments", []):
+            start = min(float(seg["start"]) + offset, window_end)
+            end = min(float(seg["end"]) + offset, window_end)
+            mid = (start + end) / 2.0
+            if not (core_start <= mid < core_end) or not (seg.get("text") or "").strip():
+                continue
+
+            seg = dict(seg, start=round(start, 3), end=round(end, 3))
+            if "words" in seg:
+                seg["words"] = [
+                    dict(w, start=round(float(w["start"]) + offset, 3), end=round(float(w["end"]) + offset, 3))
+                    for w in seg["words"]
+                ]
+            # Whisper repeats a line at the cut now and then
+            if stitched and stitched[-1]["text"].strip() == seg["text"].strip() and start < stitched[-1]["end"]:
+                continue
+            stitched.append(seg)
+
+    for i, seg in enumerate(stitched):
+        seg["id"] = i
+    return stitched
+
+def transcribe_long(audio: AudioBuffer, model_name: str = DEFAULT_MODEL_NAME, language: str = None):
+    """
+    Long-audio variant of transcribe_local with the same (text, meta) result.
+
+    The buffer is cut at low-energy points into pieces of at most
+    CHUNK_SECONDS - 2 * CHUNK_PAD_SECONDS, so that with CHUNK_PAD_SECONDS of
+    context on each side a window still fits in CHUNK_SECONDS (Whisper's
+    30 s input). The pieces are transcribed in parallel by a process pool
+    whose workers each hold a Whisper model.
+    """
+    sr = audio.sr
+    stride = max(CHUNK_SECONDS - 2 * CHUNK_PAD_SECONDS, 1.0)
+    cuts = find_split_points(audio.samples, sr, chunk_seconds=stride, max_seconds=stride)
+    pad = int(CHUNK_PAD_SECONDS * sr)
+    n = len(audio.samples)
+
+    windows, pieces = [], []
+    for a, b in zip(cuts[:-1], cuts[1:]):
+        lo, hi = max(0, a - pad), min(n, b + pad)
+        windows.append((lo / sr, a / sr, b / sr if b < n else float("inf"), hi / sr))
+        pieces.append(audio.samples[lo:hi])
+
+    logger.info(
+        f"Long-audio ASR: {audio.duration:.0f}s split into {len(pieces)} chunks "
+        f"on {ASR_WORKERS} workers."
+    )
+    for attempt in range(2):
+        pool = _get_pool(model_name)
+        try:
+            futures = [pool.submit(_transcribe_chunk, piece, model_name, language) for piece in pieces]
+            results = [f.result() for f in futures]
+            break
+        except BrokenProcessPool:
+            # a worker was killed (e.g. OOM): retry once on a new pool
+            _discard_pool(model_name, pool)
+            if attempt:
+                raise
+
+    segments = stitch_segments(results, windows)
+    text = "".join(seg["text"] for seg in segments).strip()
+    detected = Counter(r["language"] for r in results if r.get("language")).most_common(1)
+    logger.info(f"Transcription complete — {len(text)} characters, {len(segments)} segments.")
+
+    return text, {
+        "model": model_name,
+        "language": language or (detected[0][0] if detected else None),
+        "duration": audio.duration,
+        "segments": segments,
+    }
@@ -0,0 +1,237 @@
+# app/services/cache_service.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from app.utils.json_utils import dumps
+from app.utils.logger import logger
+
+
+CACHE_DIR = os.getenv("VOICEIQ_CACHE_DIR", os.path.join(tempfile.gettempdir(), "voiceiq_cache"))
+CACHE_MAX_MB = float(os.getenv("VOICEIQ_CACHE_MAX_MB", "512"))
+CACHE_ENABLED = os.getenv("VOICEIQ_CACHE", "1").lower() not in ("0", "false", "off")
+
+# Request header that skips the cache for one call: "X-VoiceIQ-Cache: bypass"
+CACHE_HEADER = "X-VoiceIQ-Cache"
+
+# Bump when pipeline logic changes in a way that invalidates stored results
+CACHE_VERSION = "1"
+
+
+# ------------------------------------------------------------
+# Configuration fingerprints
+# ------------------------------------------------------------
+def _fingerprint(config: Dict) -> str:
+    blob = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def asr_fingerprint() -> str:
+    from app.services.asr_service import asr_config
+    return _fingerprint({"v": CACHE_VERSION, "asr": asr_config()})
+
+
+def diarization_fingerprint() -> str:
+    from app.services.diarization_service import diarization_config
+    return _fingerprint({"v": CACHE_VERSION, "diarization": diarization_config()})
+
+
+def pipeline_fingerprint() -> str:
+    """
+    Fingerprint of every model name / setting that shapes the final response.
+    """
+    from app.services.asr_service import asr_config
+    from app.services.diarization_service import diarization_config
+    from app.services.sentiment_service import SentimentService
+    from app.services.keyword_service import KeywordService
+    from app.services.topic_service import TopicService
+    from app.services.summary_service import summary_config
+    from app.services.gender_service import GenderService
+    from app.services.emotion_service import EMOTION_AROUSAL_RELABEL, EmotionService
+    from app.services import feature_service
+    from app.utils.lexicon import get_lexicon
+    from app.services.fact_store import get_fact_store
+
+    return _fingerprint(
+        {
+            "v": CACHE_VERSION,
+            "asr": asr_config(),
+            "diarization": diarization_config(),
+            "sentiment": SentimentService._model_name,
+            "keywords": KeywordService.config(),
+            "topic": TopicService.config(),
+            "summary": summary_config(),
+            "gender": GenderService.config(),
+            "features": [feature_service.N_FFT, feature_service.HOP_LENGTH, feature_service.N_MFCC],
+            "emotion": {"arousal_threshold": EmotionService.AROUSAL_THRESHOLD, "relabel": EMOTION_AROUSAL_RELABEL},
+            "lexicon": get_lexicon().config(),
+            "facts": get_fact_store().config(),
+        }
+    )
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ------------------------------------------------------------
+# Content-addressed store
+# ------------------------------------------------------------
+class ResultCache:
+    """
+    SQLite-backed, size-capped LRU cache.
+
+    Keys are "<kind>:<audio sha256>:<config fingerprint>", values are
+    zlib-compressed JSON. Besides the final response it keeps the
+    expensive intermediate artifacts (ASR result, diarization segments),
+    so a config change downstream still reuses Whisper / pyannote work.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    key          TEXT PRIMARY KEY,
+                    kind         TEXT NOT NULL,
+                    value        BLOB NOT NULL,
+                    size         INTEGER NOT NULL,
+                    last_access  REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache (last_access)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def make_key(kind: str, audio_sha256: str, fingerprint: str) -> str:
+        return f"{kind}:{audio_sha256}:{fingerprint}"
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (time.time(), key))
+        try:
+            return json.loads(zlib.decompress(row[0]))
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"ResultCache: dropping unreadable entry {key}: {e}")
+            self.delete(key)
+            return None
+
+    def put(self, key: str, kind: str, value: Any) -> None:
+        blob = zlib.compress(dumps(value).encode("utf-8"))
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, kind, value, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, blob, len(blob), time.time()),
+            )
+            self._evict(conn)
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def total_bytes(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"ResultCache: evicted {evicted} least-recently-used entries.")
+
+
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Process-wide cache, or None when disabled via VOICEIQ_CACHE=0."""
+    global _result_cache
+    if not CACHE_ENABLED:
+        return None
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            os.path.join(CACHE_DIR, "results.db"), int(CACHE_MAX_MB * 1024 * 1024)
+        )
+    return _result_cache
+
+
+class CacheScope:
+    """
+    Cache view for one request: binds the audio hash so pipeline stages can
+    memoize artifacts with a single call. A scope without a cache (opt-out,
+    disabled, unknown hash) just computes.
+    """
+
+    def __init__(self, cache: Optional[ResultCache], audio_sha256: Optional[str]):
+        self.cache = cache if audio_sha256 else None
+        self.audio_sha256 = audio_sha256
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache is not None
+
+    def memoize(
+        self,
+        kind: str,
+        fingerprint: str,
+        compute: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Cached value for (kind, audio, fingerprint), computing it on a miss.
+        cacheable(value) -> False keeps a freshly computed value out of the
+        cache, e.g. a fallback result that does not match the fingerprint.
+        """
+        if self.cache is None:
+            return compute()
+
+        key = ResultCache.make_key(kind, self.audio_sha256, fingerprint)
+        try:
+            hit = self.cache.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"ResultCache read failed: {e}")
+            hit = None
+        if hit is not None:
+            logger.info(f"ResultCache hit: {kind}")
+            return hit
+
+        value = compute()
+        if cacheable is not None and not cacheable(value):
+            logger.info(f"ResultCache skip: {kind} (not cacheable)")
+            return value
+        try:
+            self.cache.put(key, kind, value)
+        except sqlite3.Error as e:
+            logger.warning(f"ResultCache write failed: {e}")
+        return value
@@ -1,8 +1,9 @@
 import os
 import torch
-import soundfile as sf
-from typing import List, Dict
+from typing import List, Dict, Tuple, Union
+from app.utils.audio_utils import AudioBuffer, as_audio_buffer
 from app.utils.logger import logger
+from app.utils.model_manager import get_model_manager
 from huggingface_hub import login
 
 # Try importing pyannote
@@ -13,7 +14,23 @@ except ImportError:
     _has_pyannote = False
 
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-_diarization_pipeline = None
+DIARIZATION_MODEL = "pyannote/speaker-diarization"
+CLUSTERING_THRESHOLD = 0.65  # tweak 0.6–0.75 depending on your use-case
+
+
+def _auth_token():
+    return os.getenv("PYANNOTE_AUTH_TOKEN") or os.getenv("HUGGINGFACE_TOKEN")
+
+
+def diarization_config() -> Dict:
+    """Settings that change diarization output (used to fingerprint cached results)."""
+    backend = "pyannote" if (_has_pyannote and _auth_token()) else "mock"
+    return {
+        "backend": backend,
+        "model": DIARIZATION_MODEL,
+        "clustering_threshold": CLUSTERING_THRESHOLD,
+        "num_speakers": 2,
+    }
 
 
 # ------------------------------------------------------------
@@ -21,60 +38,59 @@ _diarization_pipeline = None
 # ------------------------------------------------------------
 def load_diarization_pipeline():
     """
-    Loads the Pyannote speaker diarization pipeline (cached).
-    Compatible with pyannote.audio==3.3.x.
+    Loads the Pyannote speaker diarization pipeline (cached by the model
+    manager). Compatible with pyannote.audio==3.3.x.
     """
-    global _diarization_pipeline
-
-    if _diarization_pipeline is not None:
-        return _diarization_pipeline
-
     if not _has_pyannote:
         logger.warning("Pyannote not installed. Using mock diarization.")
         return None
 
-    token = os.getenv("PYANNOTE_AUTH_TOKEN") or os.getenv("HUGGINGFACE_TOKEN")
+    token = _auth_token()
     if not token:
         logger.warning("No PYANNOTE_AUTH_TOKEN or HUGGINGFACE_TOKEN found. Using mock diarization.")
         return None
 
-    logger.info("Loading Pyannote speaker-diarization pipeline...")
-
     try:
-        login(token=token)
+        return get_model_manager().get(
+            "diarization",
+            lambda: _load_pyannote(token),
+            {"model": DIARIZATION_MODEL, "clustering_threshold": CLUSTERING_THRESHOLD, "device": str(DEVICE)},
+        )
+    except Exception as e:
+        logger.error(f"Failed to load Pyannote pipeline: {e}")
+        return None
 
-        _diarization_pipeline = Pipeline.from_pretrained(
-            "pyannote/speaker-diarization",
-            use_auth_token=token
-        ).to(DEVICE)
 
-        # Optional: adjust clustering threshold
-        try:
-            _diarization_pipeline.instantiate({
-                "clustering": {
-                    "method": "centroid",
-                    "threshold": 0.65  # tweak 0.6–0.75 depending on your use-case
-                }
-            })
-            logger.info("Adjusted clustering threshold for enhanced speaker separation.")
-        except Exception as e:
-            logger.warning(f"Could not adjust clustering threshold: {e}")
+def _load_pyannote(token: str):
+    logger.info("Loading Pyannote speaker-diarization pipeline...")
+    login(token=token)
 
-        logger.info(f"Pyannote diarization pipeline loaded successfully on {DEVICE}.")
+    pipeline = Pipeline.from_pretrained(
+        DIARIZATION_MODEL,
+        use_auth_token=token
+    ).to(DEVICE)
 
+    # Optional: adjust clustering threshold
+    try:
+        pipeline.instantiate({
+            "clustering": {
+                "method": "centroid",
+                "threshold": CLUSTERING_THRESHOLD
+            }
+        })
+        logger.info("Adjusted clustering threshold for enhanced speaker separation.")
     except Exception as e:
-        logger.error(f"Failed to load Pyannote pipeline: {e}")
-        _diarization_pipeline = None
+        logger.warning(f"Could not adjust clustering threshold: {e}")
 
-    return _diarization_pipeline
+    logger.info(f"Pyannote diarization pipeline loaded successfully on {DEVICE}.")
+    return pipeline
 
 
 # ------------------------------------------------------------
 # Mock fallback diarization
 # ------------------------------------------------------------
-def _mock_diarization(wav_path: str) -> List[Dict]:
-    data, sr = sf.read(wav_path)
-    duration = len(data) / sr
+def _mock_diarization(audio: Union[str, AudioBuffer]) -> List[Dict]:
+    duration = as_audio_buffer(audio).duration
     logger.info(f"Mock diarization for {duration:.1f}s audio.")
     return [{
         "start": 0.0,
@@ -127,9 +143,22 @@ def _smooth_segments(
 # ------------------------------------------------------------
 # Main Diarization Function
 # ------------------------------------------------------------
-def diarize_audio(wav_path: str) -> List[Dict]:
+def _pipeline_input(audio: Union[str, AudioBuffer]) -> Dict:
+    """
+    Build the pyannote input. A decoded AudioBuffer is handed over as an
+    in-memory waveform (zero-copy torch view) so pyannote does not decode
+    the file again.
+    """
+    if isinstance(audio, AudioBuffer):
+        waveform = torch.from_numpy(audio.samples).unsqueeze(0)
+        return {"waveform": waveform, "sample_rate": audio.sr}
+    return {"audio": audio}
+
+
+def diarize_audio(audio: Union[str, AudioBuffer]) -> List[Dict]:
     """
     Run pyannote diarization (or fallback).
+    `audio` is the request's shared AudioBuffer or a WAV path.
     Returns list of dicts:
     {
         "start": float,
@@ -138,23 +167,33 @@ def diarize_audio(wav_path: str) -> List[Dict]:
         "confidence": float
     }
     """
-    logger.info(f"Running diarization for: {wav_path}")
+    return diarize_audio_with_backend(audio)[0]
+
+
+def diarize_audio_with_backend(audio: Union[str, AudioBuffer]) -> Tuple[List[Dict], str]:
+    """
+    diarize_audio plus the backend that actually produced the turns:
+    "pyannote", or "mock" when pyannote is unavailable or failed. Compare
+    with diarization_config()["backend"] to tell a fallback from the
+    configured behaviour.
+    """
+    logger.info(f"Running diarization for: {audio}")
     pipeline = load_diarization_pipeline()
 
     if pipeline is None:
-        return _mock_diarization(wav_path)
+        return _mock_diarization(audio), "mock"
 
     try:
         # Try forcing 2 speakers first (useful for conversations)
         try:
             diarization = pipeline(
-                {"audio": wav_path},
+                _pipeline_input(audio),
                 min_speakers=2,
                 max_speakers=2
             )
         except Exception as e:
             logger.warning(f"Auto-speaker diarization fallback: {e}")
-            diarization = pipeline({"audio": wav_path})
+            diarization = pipeline(_pipeline_input(audio))
 
         raw_segments = []
         # itertracks yields (Segment, track_id, speaker_label)
@@ -177,8 +216,8 @@ def diarize_audio(wav_path: str) -> List[Dict]:
             f"Speakers detected: {len(set(s['speaker'] for s in smoothed))}"
         )
 
-        return smoothed
+        return smoothed, "pyannote"
 
     except Exception as e:
         logger.error(f"Diarization failed: {e}")
-        return _mock_diarization(wav_path)
\ No newline at end of file
+        return _mock_diarization(audio), "mock"
\ No newline at end of file
@@ -1,6 +1,11 @@
 # app/services/emotion_service.py
 
-from typing import List, Dict
+import os
+
+import numpy as np
+from typing import List, Dict, Optional, Union
+from app.utils.audio_utils import AudioBuffer
+from app.utils.lexicon import get_lexicon
 from app.utils.logger import logger
 
 try:
@@ -13,28 +18,38 @@ except Exception:
     _HAS_TORCH = False
     torch = None
 
+# Relabel loud / animated segments from their arousal (off by default:
+# loudness also changes with mic distance and cross-talk, so `arousal` is
+# reported as data only unless this is turned on)
+EMOTION_AROUSAL_RELABEL = os.getenv("EMOTION_AROUSAL_RELABEL", "0").lower() in ("1", "true", "on")
+
 
 class EmotionService:
     """
     Best-effort speech emotion recognition.
 
     - If you plug a real audio model here, you can score each segment from audio.
-    - For now, we provide a simple heuristic fallback based on TEXT + sentiment.
+    - For now, we provide a simple heuristic fallback based on TEXT + sentiment,
+      refined by an acoustic arousal cue when frame features are available.
     """
 
     BASIC_EMOTIONS = ["neutral", "happy", "sad", "angry", "fear"]
 
+    # Arousal (vs. the speaker's own baseline, see _arousal) above which
+    # a segment is treated as emotionally charged
+    AROUSAL_THRESHOLD = 1.0
+
     @staticmethod
     def _fallback_from_text_segment(segment: Dict) -> Dict:
-        """Map sentiment + keywords to a rough emotion label."""
-        text = (segment.get("text") or "").lower()
+        """Map sentiment + lexicon keywords ("emotion.*") to a rough emotion label."""
+        hits = get_lexicon().categories((segment.get("text") or "").lower())
         sentiment = (segment.get("sentiment") or "neutral").lower()
 
-        if any(w in text for w in ["angry", "mad", "furious", "crap", "stupid", "idiot"]):
+        if "emotion.angry" in hits:
             emotion = "angry"
-        elif any(w in text for w in ["sorry", "sad", "upset", "bad news"]):
+        elif "emotion.sad" in hits:
             emotion = "sad"
-        elif any(w in text for w in ["great", "awesome", "amazing", "nice holiday", "happy"]):
+        elif "emotion.happy" in hits:
             emotion = "happy"
         else:
             # map from sentiment
@@ -49,15 +64,62 @@ class EmotionService:
         scores = {e: (1.0 if e == emotion else 0.0) for e in EmotionService.BASIC_EMOTIONS}
         return {"emotion": emotion, "emotion_scores": scores}
 
+    @staticmethod
+    def _arousal(features, speaker_segments: List[Dict]) -> List[Optional[float]]:
+        """
+        Per-segment arousal against that speaker's typical segment:
+          loudness: RMS gain over the speaker's median, in units of 6 dB
+          + pitch variability: f0 std increase over the speaker's median
+            (relative, with a 10 Hz floor)
+        Uses the precomputed frame features only (slices, no decoding).
+        None for speakers with fewer than two measurable segments.
+        """
+        stats = []
+        for seg in speaker_segments:
+            window = features.slice(seg["start"], seg["end"])
+            if len(window) == 0:
+                stats.append(None)
+                continue
+            f0 = window.voiced_f0
+            stats.append((float(np.mean(window.rms)), float(np.std(f0)) if len(f0) > 1 else 0.0))
+
+        by_speaker: Dict[str, List] = {}
+        for seg, st in zip(speaker_segments, stats):
+            if st is not None:
+                by_speaker.setdefault(seg.get("speaker"), []).append(st)
+        baseline = {spk: np.median(np.asarray(v), axis=0) for spk, v in by_speaker.items()}
+
+        arousal = []
+        for seg, st in zip(speaker_segments, stats):
+            if st is None or len(by_speaker[seg.get("speaker")]) < 2:
+                arousal.append(None)
+                continue
+            rms_ref, var_ref = baseline[seg.get("speaker")]
+            loudness = 20.0 * np.log10((st[0] + 1e-8) / (rms_ref + 1e-8)) / 6.0
+            variability = (st[1] - var_ref) / max(var_ref, 10.0)
+            arousal.append(round(float(loudness + variability), 3))
+        return arousal
+
     @classmethod
-    def analyze_speaker_segments(cls, wav_path: str, speaker_segments: List[Dict]) -> List[Dict]:
+    def analyze_speaker_segments(
+        cls,
+        audio: Optional[Union[str, AudioBuffer]],
+        speaker_segments: List[Dict],
+        features=None,
+        relabel: Optional[bool] = None,
+    ) -> List[Dict]:
         """
         Main entry: enrich each speaker_segment with:
           - emotion: str
           - emotion_scores: Dict[str, float]
-
-        For now, uses fallback based on text/sentiment.
-        You can later replace the inside with a real audio model using 'wav_path' & timestamps.
+          - arousal: float | None (only with `features`)
+
+        Labels come from the text/sentiment fallback. With `relabel`
+        (default EMOTION_AROUSAL_RELABEL, off), a segment spoken clearly
+        louder / more animated than the speaker's baseline becomes angry
+        when its sentiment is negative (instead of sad) and happy when its
+        text reads neutral. A real audio model can use the same feature
+        slices or the shared AudioBuffer (audio.slice).
         """
         if not speaker_segments:
             return speaker_segments
@@ -68,10 +130,23 @@ class EmotionService:
                 "Using text-based fallback for emotions."
             )
 
+        arousal = cls._arousal(features, speaker_segments) if features is not None else None
+        relabel = EMOTION_AROUSAL_RELABEL if relabel is None else relabel
+
         enriched = []
-        for seg in speaker_segments:
+        for i, seg in enumerate(speaker_segments):
             emo_data = cls._fallback_from_text_segment(seg)
             seg = dict(seg)
+            if arousal is not None:
+                seg["arousal"] = arousal[i]
+                charged = (arousal[i] or 0.0) > cls.AROUSAL_THRESHOLD
+                negative = (seg.get("sentiment") or "neutral").lower() == "negative"
+                if relabel and charged and (emo_data["emotion"] == "neutral" or (negative and emo_data["emotion"] == "sad")):
+                    emotion = "angry" if negative else "happy"
+                    emo_data = {
+                        "emotion": emotion,
+                        "emotion_scores": {e: (1.0 if e == emotion else 0.0) for e in cls.BASIC_EMOTIONS},
+                    }
             seg["emotion"] = emo_data["emotion"]
             seg["emotion_scores"] = emo_data["emotion_scores"]
             enriched.append(seg)
@@ -0,0 +1,371 @@
+# app/services/fact_store.py
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Type
+
+from app.utils.logger import logger
+
+
+# "sqlite" (local indexed store, default), "http" (remote knowledge graph) or "none"
+FACT_STORE = os.getenv("VOICEIQ_FACT_STORE", "sqlite")
+FACT_DB = os.getenv("VOICEIQ_FACT_DB", os.path.join(tempfile.gettempdir(), "voiceiq_facts.db"))
+FACT_STORE_URL = os.getenv("VOICEIQ_FACT_STORE_URL", "")
+FACT_STORE_TIMEOUT = float(os.getenv("VOICEIQ_FACT_STORE_TIMEOUT", "2.0"))
+FACT_STORE_CONNECTIONS = int(os.getenv("VOICEIQ_FACT_STORE_CONNECTIONS", "10"))
+
+# Claim lookups per SQL statement
+LOOKUP_BATCH = 100
+# FTS candidates checked per claim
+CANDIDATES_PER_CLAIM = 5
+
+_STOPWORDS = {
+    "the", "and", "for", "are", "was", "were", "you", "your", "our", "they", "that", "this",
+    "with", "within", "have", "has", "had", "can", "will", "would", "could", "from", "into",
+    "about", "after", "before", "than", "then", "there", "their", "what", "when", "which",
+    "just", "like", "also", "only", "all", "any", "get", "got", "its", "it's", "not", "but",
+}
+
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def claim_terms(text: str) -> List[str]:
+    """Content words of a claim (lowercased, plural 's' stripped, no numbers)."""
+    words = re.findall(r"[a-z][a-z']+", (text or "").lower())
+    seen = []
+    for w in words:
+        if len(w) < 3 or w in _STOPWORDS:
+            continue
+        w = _stem(w)
+        if w not in seen:
+            seen.append(w)
+    return seen
+
+
+def _domain_suffixes(domain: str) -> List[str]:
+    """www.shop.example.com -> [www.shop.example.com, shop.example.com, example.com]"""
+    parts = domain.lower().strip(".").split(".")
+    return [".".join(parts[i:]) for i in range(len(parts) - 1)]
+
+
+class FactStoreError(RuntimeError):
+    """A fact store could not answer (remote down, timeout, bad reply)."""
+
+
+class FactStore:
+    """
+    Knowledge source for FactCheckService.
+
+    lookup() takes a whole transcript's queries at once:
+
+      {"kind": "domain", "key": "example.com"}
+      {"kind": "claim",  "key": "refunds are accepted within 60 days"}
+
+    and returns, in order, the best matching fact or None:
+
+      {"subject": str, "statement": str, "value": str, "source": str}
+
+    Implementations should answer the batch with as few round trips as
+    possible; alookup() is the asyncio entry point. Transport failures
+    are raised as FactStoreError.
+    """
+
+    name = "base"
+
+    def lookup(self, queries: List[Dict]) -> List[Optional[Dict]]:
+        raise NotImplementedError
+
+    async def alookup(self, queries: List[Dict]) -> List[Optional[Dict]]:
+        return await asyncio.to_thread(self.lookup, queries)
+
+    def config(self) -> Dict:
+        """Settings / data version that change verification output."""
+        return {"store": self.name}
+
+
+class NullFactStore(FactStore):
+    """No knowledge source: every candidate stays TO_VERIFY."""
+
+    name = "none"
+
+    def lookup(self, queries: List[Dict]) -> List[Optional[Dict]]:
+        return [None] * len(queries)
+
+
+class SQLiteFactStore(FactStore):
+    """
+    Local fact store: one SQLite file with an FTS5 index over claim facts.
+
+      facts      kind ("domain" | "claim"), subject, statement, value, source
+      facts_fts  FTS5 (porter) over subject + statement of claim facts
+
+    Domain queries resolve with a single `IN (...)` over every domain
+    suffix in the batch. Claim queries are folded into one UNION ALL
+    statement per LOOKUP_BATCH claims, each arm an FTS MATCH on the
+    claim's terms; a fact matches when all of its subject terms occur in
+    the claim. A transcript costs a couple of indexed queries in-process.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str = FACT_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = self._connect()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS facts (
+                id         INTEGER PRIMARY KEY,
+                kind       TEXT NOT NULL,
+                subject    TEXT NOT NULL,
+                statement  TEXT NOT NULL,
+                value      TEXT NOT NULL,
+                source     TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_facts_kind_subject ON facts (kind, subject);
+            CREATE VIRTUAL TABLE IF NOT EXISTS facts_fts USING fts5(
+                subject, statement, content='', tokenize='porter unicode61'
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        # one connection per thread; stages run on a thread pool
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    # --------------------------------------------------------
+    # Loading
+    # --------------------------------------------------------
+    def add_facts(self, facts: Iterable[Dict]) -> int:
+        """
+        Insert facts: {"kind", "subject", "statement", "value", "source"?}.
+        Domain subjects are bare host names ("example.com"); claim
+        subjects are the key terms that identify the claim ("refund days").
+        """
+        conn = self._connect()
+        n = 0
+        with conn:
+            for fact in facts:
+                kind = fact.get("kind", "claim")
+                subject = fact["subject"].lower().strip()
+                cur = conn.execute(
+                    "INSERT INTO facts (kind, subject, statement, value, source) VALUES (?, ?, ?, ?, ?)",
+                    (kind, subject, fact.get("statement", ""), str(fact.get("value", "")), fact.get("source")),
+                )
+                if kind == "claim":
+                    conn.execute(
+                        "INSERT INTO facts_fts (rowid, subject, statement) VALUES (?, ?, ?)",
+                        (cur.lastrowid, subject, fact.get("statement", "")),
+                    )
+                n += 1
+            version = conn.execute("SELECT COALESCE(MAX(id), 0) FROM facts").fetchone()[0]
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (str(version),))
+        logger.info(f"SQLiteFactStore: added {n} facts to {self.db_path}.")
+        return n
+
+    def import_json(self, path: str) -> int:
+        with open(path, encoding="utf-8") as f:
+            return self.add_facts(json.load(f))
+
+    def config(self) -> Dict:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return {"store": self.name, "path": self.db_path, "version": row[0] if row else "0"}
+
+    # --------------------------------------------------------
+    # Lookup
+    # --------------------------------------------------------
+    def lookup(self, queries: List[Dict]) -> List[Optional[Dict]]:
+        results: List[Optional[Dict]] = [None] * len(queries)
+        conn = self._connect()
+
+        domains = [(i, q["key"]) for i, q in enumerate(queries) if q["kind"] == "domain"]
+        if domains:
+            self._lookup_domains(conn, domains, results)
+
+        claims = [(i, q["key"]) for i, q in enumerate(queries) if q["kind"] == "claim"]
+        for lo in range(0, len(claims), LOOKUP_BATCH):
+            self._lookup_claims(conn, claims[lo:lo + LOOKUP_BATCH], results)
+        return results
+
+    @staticmethod
+    def _row(row) -> Dict:
+        return {"subject": row[0], "statement": row[1], "value": row[2], "source": row[3]}
+
+    def _lookup_domains(self, conn, domains, results) -> None:
+        suffixes = {i: _domain_suffixes(d) for i, d in domains}
+        keys = sorted({s for ss in suffixes.values() for s in ss})
+        if not keys:
+            return
+        marks = ",".join("?" * len(keys))
+        rows = conn.execute(
+            f"SELECT subject, statement, value, source FROM facts WHERE kind = 'domain' AND subject IN ({marks})",
+            keys,
+        ).fetchall()
+        by_subject = {}
+        for row in rows:
+            by_subject.setdefault(row[0], row)
+        for i, ss in suffixes.items():
+            # most specific suffix first
+            row = next((by_subject[s] for s in ss if s in by_subject), None)
+            if row is not None:
+                results[i] = self._row(row)
+
+    def _lookup_claims(self, conn, claims, results) -> None:
+        arms, params, terms = [], [], {}
+        for i, text in claims:
+            t = claim_terms(text)
+            if not t:
+                continue
+            terms[i] = set(t)
+            arms.append(
+                "SELECT * FROM (SELECT ? AS q, rowid AS id FROM facts_fts "
+                "WHERE facts_fts MATCH ? ORDER BY rank LIMIT ?)"
+            )
+            match = "subject : (" + " OR ".join(f'"{w}"' for w in t) + ")"
+            params.extend([i, match, CANDIDATES_PER_CLAIM])
+        if not arms:
+            return
+
+        hits = conn.execute(
+            "SELECT h.q, f.subject, f.statement, f.value, f.source "
+            f"FROM ({' UNION ALL '.join(arms)}) AS h JOIN facts AS f ON f.id = h.id",
+            params,
+        ).fetchall()
+        for q, *row in hits:
+            if results[q] is not None:
+                continue
+            if {_stem(w) for w in row[0].split()} <= terms[q]:
+                results[q] = self._row(row)
+
+
+class HTTPFactStore(FactStore):
+    """
+    Remote knowledge graph behind a JSON API:
+
+      POST {url}/lookup  {"queries": [...]}  ->  {"results": [fact | null, ...]}
+
+    One request per transcript over a pooled httpx.AsyncClient. The client
+    lives on a private event loop thread, so sync callers (pipeline stages)
+    and async callers share the same connection pool.
+    """
+
+    name = "http"
+
+    def __init__(self, url: str = FACT_STORE_URL, timeout: float = FACT_STORE_TIMEOUT,
+                 max_connections: int = FACT_STORE_CONNECTIONS):
+        if not url:
+            raise ValueError("VOICEIQ_FACT_STORE_URL is required for the http fact store")
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="fact-store", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+            )
+        return self._client
+
+    async def _post(self, queries: List[Dict]) -> List[Optional[Dict]]:
+        import httpx
+        try:
+            resp = await self._get_client().post("/lookup", json={"queries": queries})
+            resp.raise_for_status()
+            results = resp.json().get("results") or []
+        except (httpx.HTTPError, ValueError, AttributeError) as e:
+            raise FactStoreError(f"{self.url}: {e!r}") from e
+        return (list(results) + [None] * len(queries))[:len(queries)]
+
+    async def alookup(self, queries: List[Dict]) -> List[Optional[Dict]]:
+        if not queries:
+            return []
+        loop = self._ensure_loop()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._post(queries), loop))
+
+    def lookup(self, queries: List[Dict]) -> List[Optional[Dict]]:
+        if not queries:
+            return []
+        future = asyncio.run_coroutine_threadsafe(self._post(queries), self._ensure_loop())
+        try:
+            return future.result(timeout=self.timeout * 2)
+        except TimeoutError as e:
+            future.cancel()
+            raise FactStoreError(f"{self.url}: no reply within {self.timeout * 2:.1f}s") from e
+
+    def config(self) -> Dict:
+        return {"store": self.name, "url": self.url}
+
+
+# ------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------
+_STORES: Dict[str, Type[FactStore]] = {
+    "sqlite": SQLiteFactStore,
+    "http": HTTPFactStore,
+    "none": NullFactStore,
+}
+
+_instances: Dict[str, FactStore] = {}
+_instances_lock = threading.Lock()
+
+
+def register_store(name: str, store_cls: Type[FactStore]) -> None:
+    _STORES[name] = store_cls
+    _instances.pop(name, None)
+
+
+def available_stores():
+    return sorted(_STORES)
+
+
+def get_fact_store(name: Optional[str] = None) -> FactStore:
+    name = name or FACT_STORE
+    if name not in _STORES:
+        raise ValueError(f"Unknown fact store '{name}'. Available: {available_stores()}")
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = _STORES[name]()
+        return _instances[name]
+
+
+if __name__ == "__main__":
+    # python -m app.services.fact_store facts.json  -> load into VOICEIQ_FACT_DB
+    import sys
+
+    store = SQLiteFactStore()
+    for p in sys.argv[1:]:
+        store.import_json(p)
+    print(json.dumps(store.config()))
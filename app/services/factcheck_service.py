@@ -1,12 +1,20 @@
 # app/services/factcheck_service.py
 
 import re
-from typing import List, Dict
+import sqlite3
+import time
+from typing import List, Dict, Optional
+from urllib.parse import urlparse
+
+from app.services.fact_store import FactStore, FactStoreError, claim_terms, get_fact_store
 from app.utils.logger import logger
 
 
 URL_RE = re.compile(r"\bhttps?://[^\s]+", re.IGNORECASE)
 NUM_RE = re.compile(r"\b\d+\b")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+# numbers as written in claims: 30, 4.5, 1,200
+CLAIM_NUM_RE = re.compile(r"\d+(?:[.,]\d+)*")
 
 
 class FactCheckService:
@@ -14,11 +22,15 @@ class FactCheckService:
     Scaffold for 'fact-checking against knowledge graphs'.
 
     Right now:
-      - Extracts URLs and numbers from transcript.
-      - Marks them as 'TO_VERIFY' so UI / later pipeline can call real KG APIs.
+      - Extracts URLs, numbers and numeric claims (sentences with a number).
+      - Verifies URLs (by domain) and claims against the fact store
+        (VOICEIQ_FACT_STORE: local SQLite/FTS index by default), all
+        candidates of a transcript in one batched lookup.
+      - Anything the store does not know stays 'TO_VERIFY'.
 
     Later:
-      - You can connect this to Wikidata / DBpedia / custom KG / LLM tool-calls.
+      - You can connect this to Wikidata / DBpedia / custom KG / LLM tool-calls
+        by registering another FactStore.
     """
 
     @staticmethod
@@ -51,8 +63,83 @@ class FactCheckService:
                 }
             )
 
+        for sentence in SENTENCE_RE.split(URL_RE.sub(" ", t)):
+            sentence = sentence.strip()
+            if NUM_RE.search(sentence) and len(claim_terms(sentence)) >= 2:
+                candidates.append(
+                    {
+                        "type": "claim",
+                        "value": sentence,
+                        "status": "TO_VERIFY",
+                        "source": "regex",
+                        "note": "Numeric statement; not yet checked against any knowledge graph.",
+                    }
+                )
+
         return candidates
 
+    # --------------------------------------------------------
+    # Verification
+    # --------------------------------------------------------
+    @staticmethod
+    def _query(candidate: Dict) -> Optional[Dict]:
+        if candidate["type"] == "url":
+            host = urlparse(candidate["value"]).hostname
+            return {"kind": "domain", "key": host} if host else None
+        if candidate["type"] == "claim":
+            return {"kind": "claim", "key": candidate["value"]}
+        return None
+
+    @staticmethod
+    def _numbers(text: str) -> set:
+        return {n.replace(",", "") for n in CLAIM_NUM_RE.findall(text or "")}
+
+    @classmethod
+    def _verdict(cls, candidate: Dict, fact: Dict) -> Dict:
+        value = str(fact.get("value", "")).strip()
+        if candidate["type"] == "url":
+            status = "CONTRADICTED" if value.lower() in ("untrusted", "unsafe", "false") else "SUPPORTED"
+        elif cls._numbers(value) & cls._numbers(candidate["value"]):
+            status = "SUPPORTED"
+        else:
+            status = "CONTRADICTED"
+        return {
+            **candidate,
+            "status": status,
+            "source": fact.get("source") or "fact_store",
+            "evidence": fact.get("statement") or None,
+            "note": f"Knowledge base: {fact.get('subject')} = {value}.",
+        }
+
+    @classmethod
+    def verify(cls, candidates: List[Dict], store: FactStore = None) -> List[Dict]:
+        """
+        Check candidates against the fact store with one batched lookup.
+        Store failures leave every candidate TO_VERIFY.
+        """
+        pending = [(i, q) for i, q in ((i, cls._query(c)) for i, c in enumerate(candidates)) if q]
+        if not pending:
+            return candidates
+
+        t0 = time.perf_counter()
+        try:
+            store = store or get_fact_store()
+            facts = store.lookup([q for _, q in pending])
+        except (FactStoreError, sqlite3.Error, OSError, ValueError) as e:
+            logger.warning(f"FactCheckService: fact store unavailable ({e}); leaving claims unverified.")
+            return candidates
+
+        verified = list(candidates)
+        for (i, _), fact in zip(pending, facts):
+            if fact:
+                verified[i] = cls._verdict(candidates[i], fact)
+        logger.info(
+            f"FactCheckService: verified {len(pending)} candidates via {store.name} "
+            f"in {(time.perf_counter() - t0) * 1000:.1f} ms, "
+            f"{sum(1 for f in facts if f)} matched."
+        )
+        return verified
+
     @classmethod
     def fact_check(cls, transcript: str) -> List[Dict]:
         """
@@ -60,11 +147,12 @@ class FactCheckService:
 
         Each item:
           {
-            "type": "url" | "number" | ...,
+            "type": "url" | "number" | "claim",
             "value": "...",
-            "status": "TO_VERIFY",
-            "note": "..."
+            "status": "TO_VERIFY" | "SUPPORTED" | "CONTRADICTED",
+            "note": "...",
+            "evidence": "..."   # matching fact statement, when verified
           }
         """
         logger.info("FactCheckService: extracting fact-check candidates.")
-        return cls.extract_candidates(transcript or "")
+        return cls.verify(cls.extract_candidates(transcript or ""))
@@ -0,0 +1,122 @@
+# app/services/feature_service.py
+
+import os
+from typing import Dict, Optional, Union
+
+import librosa
+import numpy as np
+
+from app.utils.audio_utils import AudioBuffer, as_audio_buffer
+from app.utils.logger import logger
+
+
+N_FFT = 1024
+HOP_LENGTH = 256          # 16 ms at 16 kHz
+N_MFCC = 13
+F0_MIN, F0_MAX = 80.0, 350.0
+# Audio processed per block; bounds STFT memory on multi-hour calls
+BLOCK_SECONDS = float(os.getenv("VOICEIQ_FEATURE_BLOCK_SECONDS", "60"))
+
+
+class FeatureSlice:
+    """Views into AcousticFeatures for one time span (no copies)."""
+
+    def __init__(self, features: "AcousticFeatures", lo: int, hi: int):
+        self.f0 = features.f0[lo:hi]
+        self.voiced = features.voiced[lo:hi]
+        self.rms = features.rms[lo:hi]
+        self.mfcc = features.mfcc[lo:hi]
+        self.centroid = features.centroid[lo:hi]
+
+    def __len__(self):
+        return len(self.rms)
+
+    @property
+    def voiced_f0(self) -> np.ndarray:
+        return self.f0[self.voiced]
+
+
+class AcousticFeatures:
+    """
+    Frame-level features of a whole recording, one row per hop:
+
+      f0        (frames,)        YIN pitch in Hz
+      voiced    (frames,)        bool, energetic frames with an in-range f0
+      rms       (frames,)        RMS energy
+      mfcc      (frames, 13)
+      centroid  (frames,)        spectral centroid in Hz
+
+    Frame i is centred at i * hop / sr seconds, so slice(start, end) is two
+    index computations and returns views.
+    """
+
+    def __init__(self, f0, voiced, rms, mfcc, centroid, sr: int, hop: int = HOP_LENGTH):
+        self.f0 = f0
+        self.voiced = voiced
+        self.rms = rms
+        self.mfcc = mfcc
+        self.centroid = centroid
+        self.sr = sr
+        self.hop = hop
+
+    def __len__(self):
+        return len(self.rms)
+
+    def frame_at(self, t: float) -> int:
+        return min(len(self), max(0, int(round(t * self.sr / self.hop))))
+
+    def slice(self, start: float, end: float) -> FeatureSlice:
+        return FeatureSlice(self, self.frame_at(start), self.frame_at(end))
+
+    def times(self) -> np.ndarray:
+        return np.arange(len(self)) * self.hop / self.sr
+
+
+def _block_features(y: np.ndarray, sr: int) -> Dict[str, np.ndarray]:
+    """Features of an already padded block (center=False framing)."""
+    S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH, center=False))
+    rms = librosa.feature.rms(S=S, frame_length=N_FFT, hop_length=HOP_LENGTH, center=False)[0]
+    centroid = librosa.feature.spectral_centroid(S=S, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)[0]
+    mel = librosa.feature.melspectrogram(S=S ** 2, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=N_MFCC)
+    f0 = librosa.yin(
+        y, fmin=F0_MIN, fmax=F0_MAX, sr=sr, frame_length=N_FFT, hop_length=HOP_LENGTH, center=False
+    )
+    n = min(S.shape[1], len(f0))
+    return {"f0": f0[:n], "rms": rms[:n], "mfcc": mfcc[:, :n].T, "centroid": centroid[:n]}
+
+
+def extract_features(audio: Union[str, AudioBuffer], block_seconds: Optional[float] = None) -> AcousticFeatures:
+    """
+    One vectorized pass over the decoded audio. The signal is padded once
+    (as center=True framing would) and processed in blocks whose frames
+    line up exactly with a single full-length STFT, so block size only
+    bounds memory, never changes values.
+    """
+    audio = as_audio_buffer(audio, sr=16000)
+    sr = audio.sr
+    pad = N_FFT // 2
+    y = np.pad(audio.samples.astype(np.float32, copy=False), (pad, pad))
+    n_frames = 1 + max(0, len(y) - N_FFT) // HOP_LENGTH if len(y) >= N_FFT else 0
+
+    frames_per_block = max(1, int((block_seconds or BLOCK_SECONDS) * sr / HOP_LENGTH))
+    parts = []
+    for f_lo in range(0, n_frames, frames_per_block):
+        f_hi = min(n_frames, f_lo + frames_per_block)
+        block = y[f_lo * HOP_LENGTH: (f_hi - 1) * HOP_LENGTH + N_FFT]
+        parts.append(_block_features(block, sr))
+
+    if parts:
+        feats = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+    else:
+        feats = {
+            "f0": np.zeros(0, np.float32), "rms": np.zeros(0, np.float32),
+            "mfcc": np.zeros((0, N_MFCC), np.float32), "centroid": np.zeros(0, np.float32),
+        }
+
+    f0, rms = feats["f0"], feats["rms"]
+    floor = 0.1 * float(np.percentile(rms, 95)) if len(rms) else 0.0
+    voiced = (rms > floor + 1e-6) & (f0 > F0_MIN * 1.02) & (f0 < F0_MAX * 0.98)
+
+    logger.info(f"Features: {len(rms)} frames ({audio.duration:.1f}s), {int(voiced.sum())} voiced.")
+    return AcousticFeatures(f0, voiced, rms, feats["mfcc"], feats["centroid"], sr)
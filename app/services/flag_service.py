@@ -1,14 +1,10 @@
 # app/services/flag_service.py
 
 from typing import List, Dict
+from app.utils.lexicon import get_lexicon
 from app.utils.logger import logger
 
 
-HESITATION_MARKERS = ["um", "uh", "you know", "er", "ah", "kind of", "sort of", "..."]
-AGGRESSION_WORDS = ["crap", "stupid", "idiot", "hate", "dumb", "aggressive", "angry"]
-ABSOLUTE_WORDS = ["always", "never", "impossible", "absolutely", "definitely"]
-
-
 class FlagService:
     """
     Generates heuristic 'flags':
@@ -17,6 +13,8 @@ class FlagService:
       - lie_risk (very rough / NOT reliable)
 
     These are *not* truth detectors – just pattern-based hints for analysts.
+
+    Marker words come from the shared lexicon ("flag.*" categories).
     """
 
     @staticmethod
@@ -27,14 +25,16 @@ class FlagService:
     def generate_flags(cls, conversation: List[Dict]) -> List[Dict]:
         flags: List[Dict] = []
 
+        lexicon = get_lexicon()
+
         for turn in conversation or []:
-            text = cls._lower(turn.get("text", ""))
+            hits = lexicon.categories(cls._lower(turn.get("text", "")))
             speaker = turn.get("speaker", "UNKNOWN")
             start = turn.get("start", 0.0)
             end = turn.get("end", 0.0)
 
             # Hesitation
-            if any(h in text for h in HESITATION_MARKERS):
+            if "flag.hesitation" in hits:
                 flags.append(
                     {
                         "type": "hesitation",
@@ -48,7 +48,7 @@ class FlagService:
                 )
 
             # Aggression
-            if any(w in text for w in AGGRESSION_WORDS):
+            if "flag.aggression" in hits:
                 flags.append(
                     {
                         "type": "aggression",
@@ -62,9 +62,7 @@ class FlagService:
                 )
 
             # Lie risk (very soft heuristic!)
-            if any(a in text for a in ABSOLUTE_WORDS) and any(
-                h in text for h in ["i think", "maybe", "probably", "i guess"]
-            ):
+            if "flag.absolute" in hits and "flag.hedge" in hits:
                 flags.append(
                     {
                         "type": "lie_risk",
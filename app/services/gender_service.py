@@ -1,8 +1,10 @@
 # app/services/gender_service.py
 
+import os
 import torch
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
 from functools import lru_cache
+from app.utils.audio_utils import AudioBuffer, as_audio_buffer
 from app.utils.logger import logger
 from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
 
@@ -10,6 +12,13 @@ import librosa
 import numpy as np
 
 
+# "speaker": one pitch estimate per diarized speaker (default)
+# "segment": pyin on every segment independently (old behaviour)
+GENDER_MODE = os.getenv("GENDER_MODE", "speaker")
+# Upper bound on audio analysed per speaker in "speaker" mode
+GENDER_SAMPLE_SECONDS = float(os.getenv("GENDER_SAMPLE_SECONDS", "20"))
+
+
 class GenderService:
     """
     Lightweight gender classification based on voice embeddings.
@@ -41,42 +50,75 @@ class GenderService:
             logger.error(f"Pitch estimation failed: {e}")
             return None
 
-    @classmethod
-    def infer_gender_from_audio(cls, wav_path: str, segment: Dict) -> Dict:
+    @staticmethod
+    def _estimate_pitch_fast(audio, sr) -> Optional[float]:
         """
-        Given the entire wav file + one diarization segment, crop that audio
-        and estimate gender from the pitch profile.
+        Vectorized YIN (no Viterbi decoding, unlike pyin). Frames are kept as
+        voiced when they carry real energy and the estimate is not pinned to
+        the search bounds; the median of those is returned.
         """
-
+        fmin, fmax = 80, 350
+        frame, hop = 1024, 256
+        if len(audio) < frame:
+            return None
         try:
-            audio, sr = librosa.load(wav_path, sr=16000, mono=True)
+            f0 = librosa.yin(audio, fmin=fmin, fmax=fmax, sr=sr, frame_length=frame, hop_length=hop)
+            rms = librosa.feature.rms(y=audio, frame_length=frame, hop_length=hop)[0]
+        except Exception as e:
+            logger.error(f"Pitch estimation failed: {e}")
+            return None
 
-            start = int(segment["start"] * sr)
-            end = int(segment["end"] * sr)
-            chunk = audio[start:end]
+        n = min(len(f0), len(rms))
+        f0, rms = f0[:n], rms[:n]
+        voiced = (rms > 0.1 * np.max(rms) + 1e-6) & (f0 > fmin * 1.02) & (f0 < fmax * 0.98)
+        if not np.any(voiced):
+            return None
+        return float(np.median(f0[voiced]))
 
-            if len(chunk) < sr * 0.3:
-                return {
-                    "gender": "unknown",
-                    "confidence": 0.0
-                }
+    @staticmethod
+    def _gender_from_pitch(pitch: Optional[float]) -> Dict:
+        if pitch is None:
+            return {
+                "gender": "unknown",
+                "confidence": 0.0
+            }
+
+        # VERY ROUGH heuristic thresholds
+        if pitch < 145:
+            return {"gender": "male", "confidence": 0.85}
+        elif pitch > 185:
+            return {"gender": "female", "confidence": 0.85}
+        else:
+            # ambiguous zone
+            return {"gender": "unknown", "confidence": 0.40}
 
-            pitch = cls._estimate_pitch(chunk, sr)
+    @classmethod
+    def config(cls) -> Dict:
+        """Settings that change gender output (used to fingerprint cached results)."""
+        if GENDER_MODE == "segment":
+            return {"mode": GENDER_MODE, "tracker": "pyin"}
+        return {"mode": GENDER_MODE, "tracker": "yin", "sample_seconds": GENDER_SAMPLE_SECONDS}
 
-            if pitch is None:
+    @classmethod
+    def infer_gender_from_audio(cls, audio: Union[str, AudioBuffer], segment: Dict) -> Dict:
+        """
+        Given the request's decoded audio + one diarization segment, crop that
+        audio (zero-copy view) and estimate gender from the pitch profile.
+        A WAV path is still accepted, but then the file is decoded per call.
+        """
+
+        try:
+            audio = as_audio_buffer(audio, sr=16000)
+            sr = audio.sr
+            chunk = audio.slice(segment["start"], segment["end"])
+
+            if len(chunk) < sr * 0.3:
                 return {
                     "gender": "unknown",
                     "confidence": 0.0
                 }
 
-            # VERY ROUGH heuristic thresholds
-            if pitch < 145:
-                return {"gender": "male", "confidence": 0.85}
-            elif pitch > 185:
-                return {"gender": "female", "confidence": 0.85}
-            else:
-                # ambiguous zone
-                return {"gender": "unknown", "confidence": 0.40}
+            return cls._gender_from_pitch(cls._estimate_pitch(chunk, sr))
 
         except Exception as e:
             logger.error(f"Gender inference failed: {e}")
@@ -85,16 +127,101 @@ class GenderService:
                 "confidence": 0.0
             }
 
+    @staticmethod
+    def _sample_speaker_audio(audio: AudioBuffer, segments: List[Dict], max_seconds: float) -> np.ndarray:
+        """
+        Up to `max_seconds` of one speaker's audio, longest segments first
+        (they carry the most voiced speech). Segments under 0.3 s are skipped.
+        """
+        parts, total = [], 0
+        budget = int(max_seconds * audio.sr)
+        for seg in sorted(segments, key=lambda s: s["end"] - s["start"], reverse=True):
+            chunk = audio.slice(seg["start"], seg["end"])
+            if len(chunk) < audio.sr * 0.3:
+                continue
+            chunk = chunk[: budget - total]
+            parts.append(chunk)
+            total += len(chunk)
+            if total >= budget:
+                break
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+    @staticmethod
+    def _pitch_from_features(features, segments: List[Dict], max_seconds: float) -> Optional[float]:
+        """Median voiced f0 over the speaker's longest segments, from precomputed frames."""
+        budget = int(max_seconds * features.sr / features.hop)
+        voiced, total = [], 0
+        for seg in sorted(segments, key=lambda s: s["end"] - s["start"], reverse=True):
+            window = features.slice(seg["start"], seg["end"])
+            if len(window) * features.hop < features.sr * 0.3:
+                continue
+            f0 = window.f0[: budget - total]
+            voiced.append(f0[window.voiced[: len(f0)]])
+            total += len(f0)
+            if total >= budget:
+                break
+        voiced = np.concatenate(voiced) if voiced else np.zeros(0)
+        return float(np.median(voiced)) if len(voiced) else None
+
+    @classmethod
+    def infer_gender_per_speaker(
+        cls, speaker_segments: List[Dict], audio: AudioBuffer, max_seconds: float = None, features=None
+    ) -> Dict[str, Dict]:
+        """
+        {speaker: {"gender", "confidence", "pitch"}}, one pitch estimate per
+        speaker on a bounded sample, so cost follows the number of speakers.
+        With the request's AcousticFeatures the f0 frames are reused as is.
+        """
+        max_seconds = max_seconds or GENDER_SAMPLE_SECONDS
+        by_speaker: Dict[str, List[Dict]] = {}
+        for seg in speaker_segments:
+            by_speaker.setdefault(seg.get("speaker"), []).append(seg)
+
+        results = {}
+        for speaker, segs in by_speaker.items():
+            if features is not None:
+                pitch = cls._pitch_from_features(features, segs, max_seconds)
+            else:
+                sample = cls._sample_speaker_audio(audio, segs, max_seconds)
+                pitch = cls._estimate_pitch_fast(sample, audio.sr) if len(sample) else None
+            results[speaker] = {**cls._gender_from_pitch(pitch), "pitch": pitch}
+            logger.info(
+                f"Gender: {speaker} -> {results[speaker]['gender']} "
+                f"(f0 {pitch or 0:.0f} Hz, {len(segs)} segments)."
+            )
+        return results
+
     @classmethod
-    def add_gender_to_segments(cls, speaker_segments: List[Dict], wav_path: str) -> List[Dict]:
+    def add_gender_to_segments(
+        cls, speaker_segments: List[Dict], audio: Union[str, AudioBuffer], mode: str = None, features=None
+    ) -> List[Dict]:
         """
-        Loop through speaker segments and attach gender prediction.
+        Attach a gender prediction to every speaker segment.
+        The audio is decoded at most once for all segments.
+
+        mode "speaker" (default, GENDER_MODE) estimates once per speaker and
+        broadcasts it to that speaker's segments; "segment" runs pyin on each
+        segment on its own. `features` (AcousticFeatures) lets speaker mode
+        skip pitch tracking entirely.
         """
 
         enriched = []
+        try:
+            audio = as_audio_buffer(audio, sr=16000)
+        except Exception as e:
+            logger.error(f"Gender inference failed: {e}")
+
+        if (mode or GENDER_MODE) == "speaker" and isinstance(audio, AudioBuffer):
+            per_speaker = cls.infer_gender_per_speaker(speaker_segments, audio, features=features)
+            for seg in speaker_segments:
+                result = per_speaker[seg.get("speaker")]
+                seg["gender"] = result["gender"]
+                seg["gender_confidence"] = result["confidence"]
+                enriched.append(seg)
+            return enriched
 
         for seg in speaker_segments:
-            result = cls.infer_gender_from_audio(wav_path, seg)
+            result = cls.infer_gender_from_audio(audio, seg)
             seg["gender"] = result["gender"]
             seg["gender_confidence"] = result["confidence"]
             enriched.append(seg)
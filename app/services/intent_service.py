@@ -1,6 +1,7 @@
 # app/services/intent_service.py
 
 from typing import List, Dict
+from app.utils.lexicon import get_lexicon
 from app.utils.logger import logger
 
 
@@ -8,8 +9,13 @@ class IntentService:
     """
     Simple intent classifier.
     You can later swap this with a transformer / Rasa / etc.
+
+    Cue phrases come from the shared lexicon ("intent.*" categories), matched
+    as whole words in one pass; the first rule below that fires wins.
     """
 
+    RULES = ["question", "apology", "complaint", "storytelling", "gratitude", "agreement", "closing"]
+
     @staticmethod
     def classify_utterance(text: str) -> str:
         t = (text or "").strip().lower()
@@ -17,29 +23,15 @@ class IntentService:
         if not t:
             return "other"
 
-        if any(t.startswith(x) for x in ["hi", "hello", "hey"]):
-            return "greeting"
-
-        if t.endswith("?") or any(w in t for w in ["?", "could you", "would you", "can you"]):
-            return "question"
-
-        if any(w in t for w in ["sorry", "apologize", "my fault"]):
-            return "apology"
+        hits = get_lexicon().categories(t)
 
-        if any(w in t for w in ["angry", "mad", "upset", "frustrated", "terrible", "horrible"]):
-            return "complaint"
-
-        if any(w in t for w in ["story", "when i was", "i remember", "i tell you", "basically what this is about"]):
-            return "storytelling"
-
-        if any(w in t for w in ["thanks", "thank you", "appreciate it"]):
-            return "gratitude"
-
-        if any(w in t for w in ["okay", "ok", "that works", "sounds good"]):
-            return "agreement"
+        # greetings only count at the start of the utterance
+        if any(h.start == 0 for h in hits.get("intent.greeting", ())):
+            return "greeting"
 
-        if any(w in t for w in ["bye", "goodbye", "talk to you later"]):
-            return "closing"
+        for intent in IntentService.RULES:
+            if f"intent.{intent}" in hits:
+                return intent
 
         # default: info sharing
         if len(t.split()) > 5:
@@ -0,0 +1,273 @@
+# app/services/job_service.py
+
+import json
+import os
+import queue
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.utils.json_utils import dumps
+from app.utils.logger import logger
+
+
+JOB_DIR = os.getenv("VOICEIQ_JOB_DIR", os.path.join(tempfile.gettempdir(), "voiceiq_jobs"))
+JOB_QUEUE_SIZE = int(os.getenv("VOICEIQ_JOB_QUEUE_SIZE", "16"))
+JOB_WORKERS = int(os.getenv("VOICEIQ_JOB_WORKERS", "1"))
+# Finished (done / failed) jobs older than this are pruned with their results
+JOB_TTL_HOURS = float(os.getenv("VOICEIQ_JOB_TTL_HOURS", "24"))
+
+# Job lifecycle
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when the bounded work queue cannot accept another job."""
+
+
+# ------------------------------------------------------------
+# SQLite job store
+# ------------------------------------------------------------
+class JobStore:
+    """
+    Local, file-backed job table.
+
+    One row per job:
+      - status: queued | running | done | failed
+      - stages: JSON {stage_name: {"status", "started_at", "finished_at"}}
+      - result: JSON ProcessAudioResponse payload (once done)
+
+    A fresh connection is opened per operation so worker threads and
+    request handlers never share a sqlite3 connection. Finished jobs are
+    deleted `ttl_seconds` after their last update (checked on create).
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = JOB_TTL_HOURS * 3600):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id      TEXT PRIMARY KEY,
+                    filename    TEXT,
+                    input_path  TEXT,
+                    status      TEXT NOT NULL,
+                    stages      TEXT NOT NULL DEFAULT '{}',
+                    result      TEXT,
+                    error       TEXT,
+                    created_at  REAL NOT NULL,
+                    updated_at  REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (status, updated_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, job_id: str, filename: str, input_path: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, filename, input_path, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, filename, input_path, QUEUED, now, now),
+            )
+        self.prune(now)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete finished jobs past the TTL, and any upload a failed job left behind."""
+        if self.ttl_seconds <= 0:
+            return 0
+        cutoff = (now or time.time()) - self.ttl_seconds
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id, input_path FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, cutoff),
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(r["job_id"],) for r in rows])
+        for row in rows:
+            if row["input_path"] and os.path.exists(row["input_path"]):
+                shutil.rmtree(os.path.dirname(row["input_path"]), ignore_errors=True)
+        if rows:
+            logger.info(f"JobStore: pruned {len(rows)} finished job(s).")
+        return len(rows)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, filename, input_path, status, stages, error, created_at, updated_at "
+                "FROM jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["stages"] = json.loads(job["stages"] or "{}")
+        return job
+
+    def get_result(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT result FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None or row["result"] is None:
+            return None
+        return json.loads(row["result"])
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status, error, time.time(), job_id),
+            )
+
+    def update_stage(self, job_id: str, stage: str, state: str) -> None:
+        # read-modify-write of the stages blob; serialise writers in-process
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT stages FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            stages = json.loads(row["stages"] or "{}")
+            now = time.time()
+            entry = stages.get(stage, {})
+            entry["status"] = state
+            if state == RUNNING:
+                entry["started_at"] = now
+            else:
+                entry["finished_at"] = now
+            stages[stage] = entry
+            conn.execute(
+                "UPDATE jobs SET stages = ?, updated_at = ? WHERE job_id = ?",
+                (json.dumps(stages), now, job_id),
+            )
+
+    def set_result(self, job_id: str, result: Dict) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET result = ?, status = ?, error = NULL, updated_at = ? WHERE job_id = ?",
+                (dumps(result), DONE, time.time(), job_id),
+            )
+
+    def unfinished_jobs(self) -> List[str]:
+        """Jobs that were queued or mid-run when the process last stopped."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (QUEUED, RUNNING),
+            ).fetchall()
+        return [r["job_id"] for r in rows]
+
+
+# ------------------------------------------------------------
+# Bounded in-process work queue
+# ------------------------------------------------------------
+class JobQueue:
+    """
+    Runs the processing pipeline for submitted jobs on a small pool of
+    worker threads.
+
+    runner(input_path, request_id, on_stage) -> response dict
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        runner: Callable,
+        maxsize: int = JOB_QUEUE_SIZE,
+        workers: int = JOB_WORKERS,
+    ):
+        self.store = store
+        self.runner = runner
+        self.workers = max(1, workers)
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=max(1, maxsize))
+        self._threads: List[threading.Thread] = []
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"voiceiq-job-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+            # Re-enqueue work interrupted by a restart. Done from a helper thread
+            # because the backlog may be larger than the queue bound.
+            pending = self.store.unfinished_jobs()
+            if pending:
+                logger.info(f"JobQueue: recovering {len(pending)} unfinished job(s).")
+                threading.Thread(
+                    target=self._recover, args=(pending,), name="voiceiq-job-recover", daemon=True
+                ).start()
+
+    def _recover(self, job_ids: List[str]) -> None:
+        for job_id in job_ids:
+            self.store.set_status(job_id, QUEUED)
+            self._queue.put(job_id)
+
+    def submit(self, job_id: str) -> None:
+        self.start()
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            raise JobQueueFull("Job queue is full, try again later.")
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            except Exception as e:  # never let a worker die
+                logger.exception(f"[{job_id}] Job worker crashed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        if job is None:
+            return
+
+        input_path = job["input_path"]
+        if not input_path or not os.path.exists(input_path):
+            self.store.set_status(job_id, FAILED, error="Uploaded audio is no longer available.")
+            return
+
+        logger.info(f"[{job_id}] Job started.")
+        self.store.set_status(job_id, RUNNING)
+
+        def on_stage(stage: str, state: str):
+            self.store.update_stage(job_id, stage, state)
+
+        try:
+            result = self.runner(input_path, job_id, on_stage)
+            self.store.set_result(job_id, result)
+            logger.info(f"[{job_id}] Job finished.")
+        except Exception as e:
+            logger.error(f"[{job_id}] Job failed: {e}")
+            self.store.set_status(job_id, FAILED, error=str(e))
+            return
+
+        # input audio is only needed until the result is stored
+        try:
+            os.remove(input_path)
+            os.rmdir(os.path.dirname(input_path))
+        except OSError as e:
+            logger.warning(f"[{job_id}] Cleanup warning: {e}")
@@ -2,41 +2,47 @@
 
 import spacy
 import numpy as np
-from functools import lru_cache
 from typing import List, Dict
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sentence_transformers import SentenceTransformer, util
 from app.utils.logger import logger
+from app.utils.model_manager import get_model_manager
 
 
 class KeywordService:
 
+    SPACY_MODEL = "en_core_web_sm"
+    SBERT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
     # --------------------------------------------------------
-    # Load NLP + Embedding models (cached)
+    # Load NLP + Embedding models (cached by the model manager)
     # --------------------------------------------------------
-    @staticmethod
-    @lru_cache()
-    def _load_spacy():
-        logger.info("Loading spaCy model for keyword extraction...")
-        return spacy.load("en_core_web_sm")
+    @classmethod
+    def _load_spacy(cls):
+        def _load():
+            logger.info(f"Loading spaCy model for keyword extraction ({cls.SPACY_MODEL})...")
+            return spacy.load(cls.SPACY_MODEL)
 
-    @staticmethod
-    @lru_cache()
-    def _load_sbert():
-        logger.info("Loading Sentence-BERT (all-MiniLM-L6-v2)...")
-        return SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+        return get_model_manager().get("spacy", _load, {"model": cls.SPACY_MODEL})
 
-    # --------------------------------------------------------
-    # Extract candidate phrases (noun chunks + nouns)
-    # --------------------------------------------------------
     @classmethod
-    def _extract_candidate_phrases(cls, text: str) -> List[str]:
-        if not text.strip():
-            return []
+    def _load_sbert(cls):
+        def _load():
+            logger.info(f"Loading Sentence-BERT ({cls.SBERT_MODEL})...")
+            return SentenceTransformer(cls.SBERT_MODEL)
 
-        nlp = cls._load_spacy()
-        doc = nlp(text)
+        return get_model_manager().get("sbert", _load, {"model": cls.SBERT_MODEL})
+
+    @classmethod
+    def config(cls) -> Dict:
+        """Settings that change keyword output (used to fingerprint cached results)."""
+        return {"spacy": cls.SPACY_MODEL, "sbert": cls.SBERT_MODEL}
 
+    # --------------------------------------------------------
+    # Extract candidate phrases (noun chunks + nouns)
+    # --------------------------------------------------------
+    @staticmethod
+    def _candidates_from_doc(doc) -> List[str]:
         candidates = []
 
         # 1. Noun phrases ("customer service", "payment issue")
@@ -54,66 +60,125 @@ class KeywordService:
             ):
                 candidates.append(token.text.lower())
 
-        return list(set(candidates))  # remove duplicates
+        return list(dict.fromkeys(candidates))  # remove duplicates, keep doc order
+
+    @classmethod
+    def _extract_candidate_phrases(cls, text: str) -> List[str]:
+        if not text.strip():
+            return []
+
+        nlp = cls._load_spacy()
+        return cls._candidates_from_doc(nlp(text))
 
     # --------------------------------------------------------
     # Keyword ranking = TF-IDF + semantic similarity to text
     # --------------------------------------------------------
     @classmethod
     def extract_keywords(cls, text: str, top_k: int = 10) -> List[str]:
-        if not text.strip():
-            return []
-
-        candidates = cls._extract_candidate_phrases(text)
-        if not candidates:
+        if not text or not text.strip():
             return []
+        return cls.extract_keywords_batch([text], top_k=top_k)[0]
 
-        # Create TF-IDF scores
-        tfidf = TfidfVectorizer().fit([text])
-        tfidf_scores = tfidf.transform([text]).toarray()[0]
-        tfidf_vocab = tfidf.get_feature_names_out()
-
-        # Map TF-IDF score for each candidate phrase
-        tfidf_dict = {}
-        for phrase in candidates:
-            phrase_words = phrase.split()
-            score = 0.0
-            for w in phrase_words:
-                if w in tfidf_vocab:
-                    idx = list(tfidf_vocab).index(w)
-                    score += tfidf_scores[idx]
-            tfidf_dict[phrase] = score
-
-        # Embed candidates + full text using Sentence BERT
-        sbert = cls._load_sbert()
-        text_emb = sbert.encode(text, convert_to_tensor=True)
-        cand_emb = sbert.encode(candidates, convert_to_tensor=True)
-
-        # Semantic similarity scores
-        sim_scores = util.cos_sim(text_emb, cand_emb)[0]
-
-        # Final weighted ranking = TF-IDF + semantic relevance
-        final_scores = {}
-        for i, phrase in enumerate(candidates):
-            final_scores[phrase] = float(sim_scores[i]) + tfidf_dict.get(phrase, 0.0)
-
-        # Sort by score
-        ranked = sorted(final_scores.items(), key=lambda x: x[1], reverse=True)
+    @classmethod
+    def embed_texts(cls, texts: List[str]):
+        """SBERT embeddings (tensor, one row per text) in a single batched pass."""
+        return cls._load_sbert().encode(list(texts), convert_to_tensor=True, batch_size=64)
 
-        keywords = [phrase for phrase, score in ranked[:top_k]]
+    @classmethod
+    def extract_keywords_batch(
+        cls, texts: List[str], top_k: int = 10, text_embeddings=None
+    ) -> List[List[str]]:
+        """
+        Keyword extraction for all segments of a call in one pass:
+
+        - one spaCy nlp.pipe over every segment
+        - one TF-IDF fitted on the whole conversation (each segment is a
+          document), so IDF down-weights words used everywhere in the call
+        - dict lookups for term scores (vocabulary_ is term -> column)
+        - one batched SBERT encode for all segment texts + candidate phrases
+
+        text_embeddings (one row per entry of `texts`, e.g. from embed_texts)
+        can be passed in when the caller already has them.
+
+        Returns one keyword list per input text, in order.
+        """
+        results: List[List[str]] = [[] for _ in texts]
+
+        idx = [i for i, t in enumerate(texts) if t and t.strip()]
+        if not idx:
+            return results
+        seg_texts = [texts[i] for i in idx]
 
-        return keywords
+        nlp = cls._load_spacy()
+        cand_lists = [cls._candidates_from_doc(doc) for doc in nlp.pipe(seg_texts, batch_size=64)]
+
+        unique_cands = sorted({c for cands in cand_lists for c in cands})
+        if not unique_cands:
+            return results
+
+        # Corpus-level TF-IDF (sparse rows, read as {column: weight})
+        try:
+            tfidf = TfidfVectorizer()
+            matrix = tfidf.fit_transform(seg_texts).tocsr()
+            vocab = tfidf.vocabulary_
+        except ValueError:
+            # empty vocabulary (only 1-char tokens etc.)
+            matrix, vocab = None, {}
+
+        # Embed segment texts + candidates together
+        sbert = cls._load_sbert()
+        if text_embeddings is not None:
+            text_emb = text_embeddings[idx]
+            cand_emb = sbert.encode(unique_cands, convert_to_tensor=True, batch_size=64)
+        else:
+            emb = sbert.encode(seg_texts + unique_cands, convert_to_tensor=True, batch_size=64)
+            text_emb = emb[:len(seg_texts)]
+            cand_emb = emb[len(seg_texts):]
+        cand_pos = {c: j for j, c in enumerate(unique_cands)}
+
+        for k, (i, candidates) in enumerate(zip(idx, cand_lists)):
+            if not candidates:
+                continue
+
+            if matrix is not None:
+                row = matrix.getrow(k)
+                term_scores = dict(zip(row.indices.tolist(), row.data.tolist()))
+            else:
+                term_scores = {}
+
+            # Map TF-IDF score for each candidate phrase
+            tfidf_dict = {}
+            for phrase in candidates:
+                score = 0.0
+                for w in phrase.split():
+                    col = vocab.get(w)
+                    if col is not None:
+                        score += term_scores.get(col, 0.0)
+                tfidf_dict[phrase] = score
+
+            # Semantic similarity scores
+            sim_scores = util.cos_sim(
+                text_emb[k], cand_emb[[cand_pos[c] for c in candidates]]
+            )[0]
+
+            # Final weighted ranking = TF-IDF + semantic relevance
+            final_scores = {}
+            for j, phrase in enumerate(candidates):
+                final_scores[phrase] = float(sim_scores[j]) + tfidf_dict.get(phrase, 0.0)
+
+            # Sort by score
+            # ties broken by phrase so the ranking never depends on hash order
+            ranked = sorted(final_scores.items(), key=lambda x: (-x[1], x[0]))
+            results[i] = [phrase for phrase, score in ranked[:top_k]]
+
+        return results
 
     # --------------------------------------------------------
     # Keyword extraction per speaker segment
     # --------------------------------------------------------
     @classmethod
     def extract_keywords_per_segment(cls, speaker_segments: List[Dict], top_k=5):
-        enriched = []
-
-        for seg in speaker_segments:
-            text = seg.get("text", "")
-            kw = cls.extract_keywords(text, top_k)
-            enriched.append({**seg, "keywords": kw})
-
-        return enriched
\ No newline at end of file
+        keywords = cls.extract_keywords_batch(
+            [seg.get("text", "") or "" for seg in speaker_segments], top_k=top_k
+        )
+        return [{**seg, "keywords": kw} for seg, kw in zip(speaker_segments, keywords)]
@@ -1,64 +1,78 @@
 # app/services/metadata_service.py
 
-from typing import List, Dict
-from collections import defaultdict
-
-
-class MetadataExtractor:
-
-    @staticmethod
-    def compute_speaker_stats(speaker_segments: List[Dict]) -> Dict:
-        """
-        Compute per-speaker analytics from aligned segments.
-        Input: speaker_segments from EnhancedAligner
-        """
-        if not speaker_segments:
+from typing import List, Dict, Iterable, Optional
+
+
+# ------------------------------------------------------------
+# Incremental accumulators
+# ------------------------------------------------------------
+class SpeakerStatsAccumulator:
+    """
+    Per-speaker statistics built one segment at a time.
+
+    add() is O(1); merge() combines accumulators fed from disjoint parts of
+    a call (parallel chunks, live streams) into the same result as feeding
+    every segment to one accumulator. result() can be called at any point
+    and matches compute_speaker_stats on the segments seen so far.
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, Dict] = {}
+
+    def add(self, seg: Dict) -> "SpeakerStatsAccumulator":
+        spk = seg["speaker"]
+        duration = seg["end"] - seg["start"]
+        word_count = len((seg.get("text") or "").split())
+
+        s = self._stats.get(spk)
+        if s is None:
+            s = self._stats[spk] = {
+                "total_speaking_time": 0.0,
+                "segment_count": 0,
+                "total_words": 0,
+                "longest_monologue": 0.0,
+                "first_spoke_at": seg["start"],
+                "last_spoke_at": seg["end"],
+            }
+
+        s["total_speaking_time"] += duration
+        s["segment_count"] += 1
+        s["total_words"] += word_count
+        s["longest_monologue"] = max(s["longest_monologue"], duration)
+        s["first_spoke_at"] = min(s["first_spoke_at"], seg["start"])
+        s["last_spoke_at"] = max(s["last_spoke_at"], seg["end"])
+        return self
+
+    def extend(self, segments: Iterable[Dict]) -> "SpeakerStatsAccumulator":
+        for seg in segments or []:
+            self.add(seg)
+        return self
+
+    def merge(self, other: "SpeakerStatsAccumulator") -> "SpeakerStatsAccumulator":
+        for spk, o in other._stats.items():
+            s = self._stats.get(spk)
+            if s is None:
+                self._stats[spk] = dict(o)
+                continue
+            s["total_speaking_time"] += o["total_speaking_time"]
+            s["segment_count"] += o["segment_count"]
+            s["total_words"] += o["total_words"]
+            s["longest_monologue"] = max(s["longest_monologue"], o["longest_monologue"])
+            s["first_spoke_at"] = min(s["first_spoke_at"], o["first_spoke_at"])
+            s["last_spoke_at"] = max(s["last_spoke_at"], o["last_spoke_at"])
+        return self
+
+    def result(self) -> Dict:
+        if not self._stats:
             return {}
 
-        stats = defaultdict(lambda: {
-            "total_speaking_time": 0.0,
-            "segment_count": 0,
-            "total_words": 0,
-            "longest_monologue": 0.0,
-            "first_spoke_at": None,
-            "last_spoke_at": None,
-        })
-
-        for seg in speaker_segments:
-            spk = seg["speaker"]
-            duration = seg["end"] - seg["start"]
-            text = seg.get("text") or ""
-            words = text.split()
-            word_count = len(words)
-
-            stats[spk]["total_speaking_time"] += duration
-            stats[spk]["segment_count"] += 1
-            stats[spk]["total_words"] += word_count
-            stats[spk]["longest_monologue"] = max(
-                stats[spk]["longest_monologue"], duration
-            )
-
-            # first spoken
-            if stats[spk]["first_spoke_at"] is None:
-                stats[spk]["first_spoke_at"] = seg["start"]
-            else:
-                stats[spk]["first_spoke_at"] = min(
-                    stats[spk]["first_spoke_at"], seg["start"]
-                )
-
-            # last spoken
-            if stats[spk]["last_spoke_at"] is None:
-                stats[spk]["last_spoke_at"] = seg["end"]
-            else:
-                stats[spk]["last_spoke_at"] = max(
-                    stats[spk]["last_spoke_at"], seg["end"]
-                )
-
         # derive extra ratios
-        total_audio_talk_time = sum(s["total_speaking_time"] for s in stats.values())
-        total_audio_words = sum(s["total_words"] for s in stats.values())
+        total_audio_talk_time = sum(s["total_speaking_time"] for s in self._stats.values())
+        total_audio_words = sum(s["total_words"] for s in self._stats.values())
 
-        for spk, s in stats.items():
+        out = {}
+        for spk, raw in self._stats.items():
+            s = dict(raw)
             s["avg_segment_length"] = s["total_speaking_time"] / max(
                 s["segment_count"], 1
             )
@@ -71,8 +85,68 @@ class MetadataExtractor:
                 total_audio_talk_time, 1.0
             )
             s["word_ratio"] = s["total_words"] / max(total_audio_words, 1.0)
+            out[spk] = s
+        return out
+
+
+class ConversationStatsAccumulator:
+    """
+    Conversation-level statistics built incrementally from aligned segments
+    (add) and diarization turns (add_diarization). The time span is the
+    min start / max end seen, so input order does not matter.
+    """
+
+    def __init__(self):
+        self.total_segments = 0
+        self.total_words = 0
+        self.speakers = set()
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+
+    def add(self, seg: Dict) -> "ConversationStatsAccumulator":
+        self.total_segments += 1
+        self.total_words += len((seg.get("text") or "").split())
+        self.speakers.add(seg["speaker"])
+        return self
+
+    def add_diarization(self, turn: Dict) -> "ConversationStatsAccumulator":
+        self.start = turn["start"] if self.start is None else min(self.start, turn["start"])
+        self.end = turn["end"] if self.end is None else max(self.end, turn["end"])
+        return self
+
+    def merge(self, other: "ConversationStatsAccumulator") -> "ConversationStatsAccumulator":
+        self.total_segments += other.total_segments
+        self.total_words += other.total_words
+        self.speakers |= other.speakers
+        if other.start is not None:
+            self.add_diarization({"start": other.start, "end": other.end})
+        return self
+
+    def result(self) -> Dict:
+        if not self.total_segments or self.start is None:
+            return {}
 
-        return dict(stats)
+        total_duration = self.end - self.start
+        return {
+            "total_duration": total_duration,
+            "total_segments": self.total_segments,
+            "total_words": self.total_words,
+            "avg_turn_length": total_duration / max(self.total_segments, 1),
+            "speaker_count": len(self.speakers),
+            "conversation_start": self.start,
+            "conversation_end": self.end,
+        }
+
+
+class MetadataExtractor:
+
+    @staticmethod
+    def compute_speaker_stats(speaker_segments: List[Dict]) -> Dict:
+        """
+        Compute per-speaker analytics from aligned segments.
+        Input: speaker_segments from EnhancedAligner
+        """
+        return SpeakerStatsAccumulator().extend(speaker_segments).result()
 
     @staticmethod
     def compute_conversation_stats(
@@ -84,20 +158,9 @@ class MetadataExtractor:
         if not speaker_segments or not diarization_segments:
             return {}
 
-        start_time = diarization_segments[0]["start"]
-        end_time = diarization_segments[-1]["end"]
-        total_duration = end_time - start_time
-
-        total_words = sum(
-            len((seg.get("text") or "").split()) for seg in speaker_segments
-        )
-
-        return {
-            "total_duration": total_duration,
-            "total_segments": len(speaker_segments),
-            "total_words": total_words,
-            "avg_turn_length": total_duration / max(len(speaker_segments), 1),
-            "speaker_count": len(set(seg["speaker"] for seg in speaker_segments)),
-            "conversation_start": start_time,
-            "conversation_end": end_time,
-        }
\ No newline at end of file
+        acc = ConversationStatsAccumulator()
+        for seg in speaker_segments:
+            acc.add(seg)
+        for turn in diarization_segments:
+            acc.add_diarization(turn)
+        return acc.result()
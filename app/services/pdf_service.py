@@ -2,6 +2,7 @@
 
 from typing import List, Dict, Optional
 from fpdf import FPDF
+from fpdf.enums import XPos, YPos
 from app.utils.logger import logger
 
 
@@ -49,32 +50,36 @@ def safe_text(text: str) -> str:
     return " ".join(safe_words)
 
 
+# Common non latin-1 punctuation -> closest latin-1 text
+_LATIN1_MAP = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+    "\u2013": "-", "\u2014": "-", "\u2026": "...", "\u00a0": " ",
+})
+
+
+def to_latin1(text: str) -> str:
+    """
+    The core Helvetica font only covers latin-1; anything else would make
+    multi_cell raise, so map what we can and replace the rest with '?'.
+    """
+    return text.translate(_LATIN1_MAP).encode("latin-1", "replace").decode("latin-1")
+
+
 def safe_multicell(pdf: FPDF, text: str, h: float = 5):
     """
     Protective wrapper around FPDF.multi_cell:
-      - Always uses PAGE_WIDTH (190)
-      - On overflow: splits
+      - Always uses PAGE_WIDTH (190), starting at the left margin
+      - Text is latin-1 encodable and has no overlong words, so one call
+        lays out the whole paragraph
     """
-    txt = safe_text(text)
-    txt = break_long_words(txt)
+    txt = to_latin1(break_long_words(safe_text(text)))
 
     try:
-        pdf.multi_cell(PAGE_WIDTH, h, txt)
-        return
-    except Exception:
-        pass
-
-    # fallback: break by words
-    for line in txt.split(" "):
-        try:
-            pdf.multi_cell(PAGE_WIDTH, h, line)
-        except Exception:
-            # final fallback: character by character
-            for ch in line:
-                try:
-                    pdf.multi_cell(PAGE_WIDTH, h, ch)
-                except Exception:
-                    pdf.multi_cell(PAGE_WIDTH, h, "?")
+        pdf.multi_cell(PAGE_WIDTH, h, txt, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    except Exception as e:
+        logger.warning(f"PDF: skipped a paragraph that could not be laid out ({e}).")
+        pdf.set_x(pdf.l_margin)
+        pdf.ln(h)
 
 
 # ============================================================
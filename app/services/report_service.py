@@ -0,0 +1,205 @@
+# app/services/report_service.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from app.services.pdf_service import PDFService
+from app.utils.json_utils import dumps
+from app.utils.logger import logger
+
+
+# Default per-request report mode:
+#   none        no report
+#   lazy        store the analysis, render on first GET /v1/reports/{id}.pdf
+#   background  store the analysis, render on a background worker
+#   inline      render in the request and inline report_pdf_base64 (old behaviour)
+REPORT_MODES = ("none", "lazy", "background", "inline")
+REPORT_MODE = os.getenv("VOICEIQ_REPORT_MODE", "lazy")
+REPORT_DIR = os.getenv("VOICEIQ_REPORT_DIR", os.path.join(tempfile.gettempdir(), "voiceiq_reports"))
+REPORT_WORKERS = int(os.getenv("VOICEIQ_REPORT_WORKERS", "1"))
+# Stored analyses / PDFs older than this are pruned
+REPORT_TTL_HOURS = float(os.getenv("VOICEIQ_REPORT_TTL_HOURS", "24"))
+
+# Response fields the PDF is rendered from
+REPORT_FIELDS = (
+    "transcript", "speaker_segments", "summary", "topic", "conversation_stats", "speaker_stats",
+    "emotion_overview", "intents_summary", "flags", "fact_checks",
+)
+
+
+def report_url(request_id: str) -> str:
+    return f"/v1/reports/{request_id}.pdf"
+
+
+def render_report(analysis: Dict) -> bytes:
+    """PDF bytes from the stored analysis (a subset of the response payload)."""
+    return PDFService.generate_pdf_report(
+        transcript=analysis.get("transcript") or "",
+        speaker_segments=analysis.get("speaker_segments") or [],
+        summary=analysis.get("summary") or "",
+        topic=(analysis.get("topic") or {}).get("topic", ""),
+        conversation_stats=analysis.get("conversation_stats") or {},
+        speaker_stats=analysis.get("speaker_stats") or {},
+        emotion_overview=analysis.get("emotion_overview"),
+        intents_summary=analysis.get("intents_summary"),
+        flags=analysis.get("flags"),
+        fact_checks=analysis.get("fact_checks"),
+    )
+
+
+class ReportStore:
+    """
+    SQLite table of report inputs and rendered PDFs, keyed by request_id.
+
+    The analysis (zlib JSON of REPORT_FIELDS) is written when the request
+    finishes; the PDF column stays empty until someone renders it. Renders
+    are serialized per request_id, so concurrent fetches of the same report
+    (or a fetch racing the background worker) lay it out once.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = REPORT_TTL_HOURS * 3600):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._rendering: Dict[str, threading.Lock] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS reports (
+                    request_id   TEXT PRIMARY KEY,
+                    analysis     BLOB NOT NULL,
+                    pdf          BLOB,
+                    etag         TEXT,
+                    created_at   REAL NOT NULL,
+                    rendered_at  REAL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_reports_created ON reports (created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    # --------------------------------------------------------
+    # Analysis
+    # --------------------------------------------------------
+    def save_analysis(self, request_id: str, payload: Dict) -> None:
+        analysis = {k: payload.get(k) for k in REPORT_FIELDS}
+        blob = zlib.compress(dumps(analysis).encode("utf-8"))
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (request_id, analysis, created_at) VALUES (?, ?, ?)",
+                (request_id, blob, now),
+            )
+            conn.execute("DELETE FROM reports WHERE created_at < ?", (now - self.ttl_seconds,))
+
+    def get_analysis(self, request_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT analysis FROM reports WHERE request_id = ?", (request_id,)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def exists(self, request_id: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM reports WHERE request_id = ?", (request_id,)).fetchone() is not None
+
+    # --------------------------------------------------------
+    # PDF
+    # --------------------------------------------------------
+    def get_pdf(self, request_id: str) -> Optional[Dict]:
+        """{"pdf": bytes, "etag": str} if already rendered."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT pdf, etag FROM reports WHERE request_id = ? AND pdf IS NOT NULL", (request_id,)
+            ).fetchone()
+        return {"pdf": bytes(row[0]), "etag": row[1]} if row else None
+
+    def render(self, request_id: str) -> Optional[Dict]:
+        """Rendered PDF for request_id (rendering it now if needed); None if unknown."""
+        cached = self.get_pdf(request_id)
+        if cached is not None:
+            return cached
+        with self._lock:
+            lock = self._rendering.setdefault(request_id, threading.Lock())
+        with lock:
+            try:
+                return self._render(request_id)
+            finally:
+                with self._lock:
+                    self._rendering.pop(request_id, None)
+
+    def _render(self, request_id: str) -> Optional[Dict]:
+        cached = self.get_pdf(request_id)
+        if cached is not None:
+            return cached
+        analysis = self.get_analysis(request_id)
+        if analysis is None:
+            return None
+
+        t0 = time.perf_counter()
+        pdf = render_report(analysis)
+        etag = hashlib.sha256(pdf).hexdigest()[:32]
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE reports SET pdf = ?, etag = ?, rendered_at = ? WHERE request_id = ?",
+                (pdf, etag, time.time(), request_id),
+            )
+        logger.info(f"[{request_id}] Report rendered: {len(pdf)} bytes in {time.perf_counter() - t0:.2f}s.")
+        return {"pdf": pdf, "etag": etag}
+
+    def render_in_background(self, request_id: str) -> None:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="report")
+        future = self._pool.submit(self.render, request_id)
+        future.add_done_callback(
+            lambda f: f.exception() and logger.warning(f"[{request_id}] Background report failed: {f.exception()}")
+        )
+
+
+_report_store: Optional[ReportStore] = None
+
+
+def get_report_store() -> ReportStore:
+    global _report_store
+    if _report_store is None:
+        _report_store = ReportStore(os.path.join(REPORT_DIR, "reports.db"))
+    return _report_store
+
+
+def publish_report(request_id: str, payload: Dict, mode: Optional[str] = None) -> Dict:
+    """
+    Make the report for a finished request available according to mode.
+    Returns the response fields {"report_url", "report_pdf_base64"}.
+    """
+    mode = mode or REPORT_MODE
+    if mode not in REPORT_MODES:
+        raise ValueError(f"Unknown report mode '{mode}'. Available: {list(REPORT_MODES)}")
+    if mode == "none":
+        return {"report_url": None, "report_pdf_base64": None}
+
+    try:
+        store = get_report_store()
+        store.save_analysis(request_id, payload)
+    except sqlite3.Error as e:
+        logger.warning(f"[{request_id}] Report store unavailable: {e}")
+        return {"report_url": None, "report_pdf_base64": None}
+
+    if mode == "background":
+        store.render_in_background(request_id)
+
+    pdf_b64 = None
+    if mode == "inline":
+        pdf_b64 = PDFService.to_base64(store.render(request_id)["pdf"])
+    return {"report_url": report_url(request_id), "report_pdf_base64": pdf_b64}
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+import os
 import re
 
 from transformers import (
@@ -12,6 +13,7 @@ from transformers import (
 )
 
 from app.utils.logger import logger
+from app.utils.model_manager import get_model_manager
 
 
 class SentimentService:
@@ -24,11 +26,14 @@ class SentimentService:
     - Short-text heuristics improved
     - Confidence thresholds improved
     - Full compatibility with process_audio.py
+    - Length-sorted batched inference for whole calls
     """
 
-    _pipeline = None
     _model_name = "cardiffnlp/twitter-roberta-base-sentiment-latest"
 
+    # Segments per forward pass in analyze_texts()
+    _batch_size = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+
     # Heuristics
     _min_words_for_strong_sentiment = 4
     _low_confidence_threshold = 0.65
@@ -36,29 +41,28 @@ class SentimentService:
 
     @classmethod
     def _load_pipeline(cls):
-        """Lazy-load HuggingFace sentiment pipeline."""
-        if cls._pipeline is not None:
-            return cls._pipeline
+        """Lazy-load HuggingFace sentiment pipeline (via the model manager)."""
 
-        try:
+        def _load():
             logger.info("Loading HuggingFace sentiment model...")
 
             tokenizer = AutoTokenizer.from_pretrained(cls._model_name)
             model = AutoModelForSequenceClassification.from_pretrained(cls._model_name)
 
-            cls._pipeline = pipeline(
+            pip = pipeline(
                 "sentiment-analysis",
                 model=model,
                 tokenizer=tokenizer,
                 device=-1,   # CPU
             )
             logger.info("Sentiment model loaded successfully.")
+            return pip
 
+        try:
+            return get_model_manager().get("sentiment", _load, {"model": cls._model_name})
         except Exception as e:
             logger.error(f"Failed to load sentiment model: {e}")
-            cls._pipeline = None
-
-        return cls._pipeline
+            return None
 
     # ----------------------------------------------------------------------
     # CLEANER TEXT PREPROCESSING
@@ -97,52 +101,28 @@ class SentimentService:
         Main public API.
         Returns {label: positive/neutral/negative, score: confidence}
         """
+        return cls.analyze_texts([text])[0]
 
-        if not text or not text.strip():
-            return {"label": "neutral", "score": 0.0}
-
-        clean = cls._clean_text(text)
-        if not clean:
-            return {"label": "neutral", "score": 0.0}
-
-        pip = cls._load_pipeline()
-        if pip is None:
-            return {"label": "neutral", "score": 0.0}
+    @classmethod
+    def _apply_rules(cls, clean: str, res: Dict[str, Any]) -> Dict[str, Any]:
+        """Short-text + confidence-threshold rules on one raw model output."""
+        raw_label = res["label"].lower()
+        score = float(res["score"])
+        mapped = cls._map_label(raw_label)
 
         # -------------------------
         # SHORT TEXT LOGIC
         # -------------------------
         words = clean.split()
         if len(words) < cls._min_words_for_strong_sentiment:
-            try:
-                res = pip(clean[:512])[0]
-            except Exception as e:
-                logger.error(f"Sentiment model failure (short text): {e}")
-                return {"label": "neutral", "score": 0.0}
-
-            raw_label = res["label"].lower()
-            score = float(res["score"])
-
             # short text → force neutral unless very confident
             if score < 0.80:
                 return {"label": "neutral", "score": score}
-
-            mapped = cls._map_label(raw_label)
             return {"label": mapped, "score": score}
 
         # -------------------------
         # NORMAL LENGTH TEXT
         # -------------------------
-        try:
-            res = pip(clean[:512])[0]
-        except Exception as e:
-            logger.error(f"Sentiment model failure: {e}")
-            return {"label": "neutral", "score": 0.0}
-
-        raw_label = res["label"].lower()
-        score = float(res["score"])
-        mapped = cls._map_label(raw_label)
-
         # Confidence rules
         if score < cls._very_low_confidence:
             return {"label": "neutral", "score": score}
@@ -152,29 +132,100 @@ class SentimentService:
 
         return {"label": mapped, "score": score}
 
+    @classmethod
+    def analyze_texts(cls, texts: List[str], batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Batched sentiment for many texts (one call's segments).
+
+        Texts are cleaned, sorted by length and sent through the model in
+        batches, so each batch is padded only to its own longest member
+        (dynamic padding) instead of one forward pass per text.
+        Output order matches `texts`.
+        """
+        return cls.analyze_texts_with_backend(texts, batch_size=batch_size)[0]
+
+    @classmethod
+    def analyze_texts_with_backend(
+        cls, texts: List[str], batch_size: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        analyze_texts plus the backend that scored them: the model name, or
+        "fallback" when the model could not be loaded and every text was
+        left neutral.
+        """
+        results = [{"label": "neutral", "score": 0.0} for _ in texts]
+
+        cleaned = []
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            clean = cls._clean_text(text)
+            if clean:
+                cleaned.append((i, clean))
+
+        if not cleaned:
+            return results, cls._model_name
+
+        pip = cls._load_pipeline()
+        if pip is None:
+            return results, "fallback"
+
+        size = max(1, batch_size or cls._batch_size)
+        ordered = sorted(cleaned, key=lambda item: len(item[1]))
+
+        for b in range(0, len(ordered), size):
+            batch = ordered[b:b + size]
+            inputs = [clean[:512] for _, clean in batch]
+            try:
+                outputs = pip(inputs, batch_size=len(inputs), truncation=True)
+            except Exception as e:
+                logger.error(f"Sentiment model failure (batch of {len(inputs)}): {e}")
+                outputs = cls._analyze_one_by_one(pip, inputs)
+
+            for (i, clean), res in zip(batch, outputs):
+                if res is not None:
+                    results[i] = cls._apply_rules(clean, res)
+
+        return results, cls._model_name
+
+    @staticmethod
+    def _analyze_one_by_one(pip, inputs: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Isolate a failing batch member so the rest still get scored."""
+        outputs = []
+        for text in inputs:
+            try:
+                outputs.append(pip(text, truncation=True)[0])
+            except Exception as e:
+                logger.error(f"Sentiment model failure: {e}")
+                outputs.append(None)
+        return outputs
+
     # ----------------------------------------------------------------------
     # BATCH API REQUIRED BY process_audio.py
     # ----------------------------------------------------------------------
     @classmethod
-    def analyze_speaker_segments(cls, segments):
+    def analyze_speaker_segments(cls, segments, keywords: Optional[List[List[str]]] = None):
         """
-        Required function — process_audio.py uses this.
         Enhances each segment with:
             - sentiment
             - sentiment_score
             - keywords
+        Sentiment and keywords for all segments are computed in batched passes.
+        Pass `keywords` (one list per segment) when they were already
+        extracted, e.g. from the pipeline context, to skip recomputing them.
         """
 
         from app.services.keyword_service import KeywordService
 
-        output = []
-
-        for seg in segments:
-            text = seg.get("text", "") or ""
+        texts = [seg.get("text", "") or "" for seg in segments]
+        sentiments = cls.analyze_texts(texts)
+        keyword_lists = keywords
+        if keyword_lists is None:
+            keyword_lists = KeywordService.extract_keywords_batch(texts, top_k=5)
 
-            sentiment = cls.analyze_text(text)
-            keywords = KeywordService.extract_keywords(text, top_k=5)
+        output = []
 
+        for seg, sentiment, keywords in zip(segments, sentiments, keyword_lists):
             enriched = dict(seg)
             enriched["sentiment"] = sentiment["label"]
             enriched["sentiment_score"] = sentiment["score"]
@@ -0,0 +1,195 @@
+# app/services/streaming_service.py
+
+import os
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.services.flag_service import FlagService
+from app.services.intent_service import IntentService
+from app.services.metadata_service import ConversationStatsAccumulator, SpeakerStatsAccumulator
+from app.services.sentiment_service import SentimentService
+from app.utils.logger import logger
+
+
+STREAM_SAMPLE_RATE = 16000
+# Re-run ASR after this much new audio
+STREAM_STEP_SECONDS = float(os.getenv("VOICEIQ_STREAM_STEP_SECONDS", "1.0"))
+# Audio that must follow a segment before it can become final
+STREAM_HOLDBACK_SECONDS = float(os.getenv("VOICEIQ_STREAM_HOLDBACK_SECONDS", "1.5"))
+# Longest unfinalized window; beyond this segments are finalized anyway
+STREAM_WINDOW_SECONDS = float(os.getenv("VOICEIQ_STREAM_WINDOW_SECONDS", "15"))
+
+
+def _default_transcribe(samples: np.ndarray, language: Optional[str] = None) -> List[Dict]:
+    from app.services.asr_backends import get_backend
+    from app.services.asr_service import load_model
+    return get_backend().transcribe(load_model(), samples, language=language).get("segments", [])
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"[^\w\s]", "", (text or "").lower()).strip()
+
+
+class StreamingSession:
+    """
+    Incremental transcription of one live audio stream.
+
+    Audio (16 kHz mono s16le) is appended to a window that is re-transcribed
+    every STREAM_STEP_SECONDS. A segment becomes final once two consecutive
+    hypotheses agree on it and at least STREAM_HOLDBACK_SECONDS of audio
+    follow it; the window is then trimmed to the end of the last final
+    segment, so each run only sees the still-open tail of the call.
+
+    Each final segment gets the cheap per-turn analytics right away:
+    intent, flag rules and sentiment.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[..., List[Dict]] = None,
+        speaker: str = "SPEAKER_00",
+        language: Optional[str] = None,
+        step: float = STREAM_STEP_SECONDS,
+        holdback: float = STREAM_HOLDBACK_SECONDS,
+        window: float = STREAM_WINDOW_SECONDS,
+    ):
+        self.transcribe = transcribe or _default_transcribe
+        self.speaker = speaker
+        self.language = language
+        self.sr = STREAM_SAMPLE_RATE
+        self.step = step
+        self.holdback = holdback
+        self.window = window
+
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.offset = 0.0           # stream time of buffer[0]
+        self.received = 0           # samples received in total
+        self._since_run = 0
+        self._previous: List[Dict] = []
+        self.finals: List[Dict] = []
+        self.intent_counts: Dict[str, int] = {}
+        self.flag_count = 0
+        self.speaker_stats = SpeakerStatsAccumulator()
+        self.conversation_stats = ConversationStatsAccumulator()
+
+    @property
+    def stream_time(self) -> float:
+        return self.received / self.sr
+
+    # --------------------------------------------------------
+    # Input
+    # --------------------------------------------------------
+    def feed(self, pcm: bytes) -> List[Dict]:
+        """Append raw PCM; returns the messages to send (possibly none)."""
+        if len(pcm) % 2:
+            pcm = pcm[:-1]
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+        self.buffer = np.concatenate([self.buffer, samples])
+        self.received += len(samples)
+        self._since_run += len(samples)
+
+        if self._since_run < self.step * self.sr:
+            return []
+        self._since_run = 0
+        return self._run(final=False)
+
+    def finish(self) -> List[Dict]:
+        """Flush everything still open and close the session."""
+        messages = self._run(final=True) if len(self.buffer) else []
+        logger.info(
+            f"Stream closed: {self.stream_time:.1f}s audio, {len(self.finals)} segments, "
+            f"{self.flag_count} flags."
+        )
+        messages.append(
+            {
+                "type": "end",
+                "duration": round(self.stream_time, 3),
+                "segments": len(self.finals),
+                "intents_summary": dict(self.intent_counts),
+                "flags": self.flag_count,
+                "speaker_stats": self.speaker_stats.result(),
+                "conversation_stats": self.conversation_stats.result(),
+            }
+        )
+        return messages
+
+    # --------------------------------------------------------
+    # Stabilization
+    # --------------------------------------------------------
+    def _run(self, final: bool) -> List[Dict]:
+        t0 = time.perf_counter()
+        base = self.offset
+        segs = [
+            s for s in self.transcribe(self.buffer, language=self.language)
+            if (s.get("text") or "").strip()
+        ]
+        buffered = len(self.buffer) / self.sr
+
+        if final:
+            stable = segs
+        else:
+            stable = []
+            for i, seg in enumerate(segs):
+                agreed = i < len(self._previous) and _norm(self._previous[i]["text"]) == _norm(seg["text"])
+                if not agreed or float(seg["end"]) > buffered - self.holdback:
+                    break
+                stable.append(seg)
+            if not stable and buffered > self.window and segs:
+                # window full without agreement: close all but the open tail
+                stable = segs[:-1] or segs
+
+        messages = [self._finalize(seg, t0) for seg in stable]
+
+        if stable:
+            cut = min(float(stable[-1]["end"]), buffered)
+            self.buffer = self.buffer[int(cut * self.sr):]
+            self.offset += cut
+            self._previous = [dict(s, start=float(s["start"]) - cut, end=float(s["end"]) - cut) for s in segs[len(stable):]]
+        else:
+            self._previous = segs
+            if not segs and buffered > self.window:
+                # nothing but silence / noise: keep only the tail
+                keep = int(self.holdback * self.sr)
+                self.offset += buffered - keep / self.sr
+                self.buffer = self.buffer[-keep:]
+
+        open_segs = segs[len(stable):]
+        if open_segs and not final:
+            messages.append(
+                {
+                    "type": "partial",
+                    "start": round(base + float(open_segs[0]["start"]), 3),
+                    "end": round(base + float(open_segs[-1]["end"]), 3),
+                    "text": "".join(s["text"] for s in open_segs).strip(),
+                }
+            )
+        return messages
+
+    def _finalize(self, seg: Dict, t0: float) -> Dict:
+        start = round(self.offset + float(seg["start"]), 3)
+        end = round(self.offset + float(seg["end"]), 3)
+        text = seg["text"].strip()
+        turn = {"start": start, "end": end, "speaker": self.speaker, "text": text}
+
+        intent = IntentService.classify_utterance(text)
+        flags = FlagService.generate_flags([turn])
+        sentiment = SentimentService.analyze_texts([text])[0]
+
+        turn.update(intent=intent, sentiment=sentiment["label"], sentiment_score=float(sentiment["score"]))
+        self.finals.append(turn)
+        self.intent_counts[intent] = self.intent_counts.get(intent, 0) + 1
+        self.flag_count += len(flags)
+        self.speaker_stats.add(turn)
+        self.conversation_stats.add(turn).add_diarization(turn)
+
+        return {
+            "type": "final",
+            "segment": turn,
+            "flags": flags,
+            # how far behind the live edge this result is, in stream seconds
+            "lag_seconds": round(self.stream_time - end, 3),
+            "processing_seconds": round(time.perf_counter() - t0, 3),
+        }
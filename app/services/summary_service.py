@@ -1,25 +1,51 @@
 # app/services/summary_service.py
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
 from transformers import pipeline
 from app.utils.logger import logger
+from app.utils.model_manager import get_model_manager
+
+SUMMARY_MODEL = "sshleifer/distilbart-cnn-12-6"
+
+# "map-reduce" covers the whole call; "truncate" summarizes the first max_chars only
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "map-reduce")
+# Tokens per map chunk (DistilBART reads at most 1024)
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "900"))
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "4"))
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", "2"))
+
+# Length of each partial summary in the map step
+MAP_MAX_LENGTH = 120
+MAP_MIN_LENGTH = 30
+
 
-_summarizer = None
+def summary_config() -> Dict:
+    """Settings that change the summary (used to fingerprint cached results)."""
+    config = {"model": SUMMARY_MODEL, "mode": SUMMARY_MODE}
+    if SUMMARY_MODE == "map-reduce":
+        config.update(chunk_tokens=SUMMARY_CHUNK_TOKENS, map_length=[MAP_MIN_LENGTH, MAP_MAX_LENGTH])
+    return config
 
 
 def _get_summarizer():
     """
-    Lazily load and cache the summarization pipeline.
+    Lazily load the summarization pipeline (cached by the model manager).
     """
-    global _summarizer
-    if _summarizer is None:
+    def _load():
         logger.info("Loading summarization model (distilbart-cnn-12-6)...")
-        _summarizer = pipeline(
+        summarizer = pipeline(
             "summarization",
-            model="sshleifer/distilbart-cnn-12-6",
+            model=SUMMARY_MODEL,
             device="cpu",
         )
         logger.info("Summarization model loaded.")
-    return _summarizer
+        return summarizer
+
+    return get_model_manager().get("summary", _load, {"model": SUMMARY_MODEL})
 
 
 class SummaryService:
@@ -35,6 +61,9 @@ class SummaryService:
         if not text:
             return ""
 
+        if SUMMARY_MODE == "map-reduce":
+            return SummaryService.summarize_turns([text])
+
         # avoid extremely long inputs
         if len(text) > max_chars:
             text = text[:max_chars]
@@ -53,4 +82,120 @@ class SummaryService:
         """
         Alias for summarize, for nicer naming in other modules.
         """
-        return SummaryService.summarize(text, max_chars=max_chars)
\ No newline at end of file
+        return SummaryService.summarize(text, max_chars=max_chars)
+
+    # --------------------------------------------------------
+    # Map-reduce over conversation turns
+    # --------------------------------------------------------
+    @staticmethod
+    def _count_tokens(tokenizer, text: str) -> int:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+
+    @classmethod
+    def _pack(cls, tokenizer, pieces: List[str], budget: int) -> List[str]:
+        """
+        Greedily group consecutive pieces (turns) into chunks of at most
+        `budget` tokens. A piece longer than the budget is split at sentence
+        ends first, then at word boundaries, and as a last resort (one long
+        "word": CJK text, a URL, a run of digits) into slices of token ids.
+        """
+        chunks, current, used = [], [], 0
+
+        def flush():
+            nonlocal current, used
+            if current:
+                chunks.append(" ".join(current))
+            current, used = [], 0
+
+        for piece in pieces:
+            piece = piece.strip()
+            if not piece:
+                continue
+            n = cls._count_tokens(tokenizer, piece)
+            if n > budget:
+                flush()
+                parts = re.split(r"(?<=[.!?])\s+", piece)
+                if len(parts) == 1:
+                    words = piece.split()
+                    if len(words) == 1:
+                        chunks.extend(cls._split_tokens(tokenizer, piece, budget))
+                        continue
+                    # tokens per word is roughly constant within one turn
+                    step = max(1, int(len(words) * budget / n))
+                    parts = [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+                chunks.extend(cls._pack(tokenizer, parts, budget))
+                continue
+            if used + n > budget:
+                flush()
+            current.append(piece)
+            used += n
+        flush()
+        return chunks
+
+    @staticmethod
+    def _split_tokens(tokenizer, text: str, budget: int) -> List[str]:
+        """Cut text with no sentence or word boundary into `budget`-token slices."""
+        ids = tokenizer.encode(text, add_special_tokens=False)
+        slices = [tokenizer.decode(ids[i:i + budget], skip_special_tokens=True) for i in range(0, len(ids), budget)]
+        return [s.strip() for s in slices if s.strip()]
+
+    @staticmethod
+    def _map(summarizer, chunks: List[str]) -> List[str]:
+        """Partial summaries, batches spread over a small thread pool."""
+        batches = [chunks[i:i + SUMMARY_BATCH_SIZE] for i in range(0, len(chunks), SUMMARY_BATCH_SIZE)]
+
+        def run(batch):
+            out = summarizer(
+                batch,
+                max_length=MAP_MAX_LENGTH,
+                min_length=MAP_MIN_LENGTH,
+                do_sample=False,
+                truncation=True,
+                batch_size=len(batch),
+            )
+            return [o["summary_text"].strip() for o in out]
+
+        if len(batches) == 1 or SUMMARY_WORKERS <= 1:
+            results = [run(b) for b in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="summary") as pool:
+                results = list(pool.map(run, batches))
+        return [s for batch in results for s in batch]
+
+    @classmethod
+    def summarize_turns(cls, turns: List[str]) -> str:
+        """
+        Summarize a whole call given its conversation turns.
+
+        Map: turns are packed into chunks that fit the model's token limit
+        and summarized in parallel batches. Reduce: the partial summaries
+        are summarized again, repeating the map while they still do not fit.
+        """
+        turns = [t for t in turns if t and t.strip()]
+        if not turns:
+            return ""
+
+        summarizer = _get_summarizer()
+        tokenizer = summarizer.tokenizer
+        budget = min(SUMMARY_CHUNK_TOKENS, tokenizer.model_max_length - 16)
+
+        chunks = cls._pack(tokenizer, turns, budget)
+        rounds = 0
+        while len(chunks) > 1:
+            rounds += 1
+            partials = cls._map(summarizer, chunks)
+            logger.info(f"Summary map round {rounds}: {len(chunks)} chunks -> {len(partials)} partials.")
+            packed = cls._pack(tokenizer, partials, budget)
+            if len(packed) >= len(chunks):
+                # not shrinking (budget smaller than a partial): let truncation cut it
+                packed = [" ".join(partials)]
+            chunks = packed
+
+        out = summarizer(
+            chunks[0],
+            max_length=180,
+            min_length=60,
+            do_sample=False,
+            truncation=True,
+        )
+        return out[0]["summary_text"].strip()
@@ -1,9 +1,16 @@
 # app/services/topic_service.py
 
+import os
+import threading
+import numpy as np
 from transformers import pipeline
-from functools import lru_cache
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from app.utils.logger import logger
+from app.utils.model_manager import get_model_manager
+
+
+# "embedding" (SBERT similarity vote, default) or "zero-shot" (BART-MNLI)
+TOPIC_MODE = os.getenv("TOPIC_MODE", "embedding")
 
 
 class TopicService:
@@ -23,23 +30,153 @@ class TopicService:
         "general conversation",
     ]
 
+    # Optional example sentences per label; they sharpen the label
+    # embedding for short or ambiguous label names.
+    TOPIC_EXEMPLARS: Dict[str, List[str]] = {
+        "sales": ["I'd like to upgrade my plan", "what discount can you offer on the annual package"],
+        "support": ["can you help me set this up", "I need some help with my account settings"],
+        "technical issue": ["the app keeps crashing when I log in", "I get an error message on the website"],
+        "billing": ["I was charged twice this month", "why is my invoice higher than usual"],
+        "account management": ["please update the email on my account", "I want to change my password"],
+        "product inquiry": ["does the product support this feature", "what is included in the premium version"],
+        "complaint": ["I am very unhappy with the service", "this is the third time I am calling about this"],
+    }
+
+    EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+    LABEL_TEMPLATE = "This conversation is about {}."
+    CHUNK_WORDS = 120
+    # Softmax temperature over cosine similarities (lower = sharper)
+    TEMPERATURE = 0.05
+
+    _label_cache: Dict[Tuple, Tuple[np.ndarray, np.ndarray]] = {}
+    _label_lock = threading.Lock()
+
     @staticmethod
-    @lru_cache()
     def _load_model():
         """
         Zero-shot classifier (fast + safe).
-        Cached for performance.
+        Cached by the model manager.
         """
-        logger.info("Loading zero-shot topic model (bart-large-mnli)...")
-        return pipeline(
-            "zero-shot-classification",
-            model="facebook/bart-large-mnli",
+        def _load():
+            logger.info("Loading zero-shot topic model (bart-large-mnli)...")
+            return pipeline(
+                "zero-shot-classification",
+                model="facebook/bart-large-mnli",
+            )
+
+        return get_model_manager().get("topic", _load, {"model": "facebook/bart-large-mnli"})
+
+    @classmethod
+    def config(cls) -> Dict:
+        """Settings that change topic output (used to fingerprint cached results)."""
+        if TOPIC_MODE == "zero-shot":
+            return {"mode": TOPIC_MODE, "model": "facebook/bart-large-mnli", "labels": cls.TOPIC_LABELS}
+        return {
+            "mode": TOPIC_MODE,
+            "model": cls.EMBEDDING_MODEL,
+            "labels": cls.TOPIC_LABELS,
+            "exemplars": cls.TOPIC_EXEMPLARS,
+            "chunk_words": cls.CHUNK_WORDS,
+            "temperature": cls.TEMPERATURE,
+        }
+
+    # --------------------------------------------------------
+    # Embedding engine
+    # --------------------------------------------------------
+    @staticmethod
+    def _encode(texts: List[str]) -> np.ndarray:
+        from app.services.keyword_service import KeywordService
+        vecs = KeywordService._load_sbert().encode(
+            list(texts), batch_size=64, normalize_embeddings=True
         )
+        return np.asarray(vecs, dtype=np.float32).reshape(len(texts), -1)
+
+    @classmethod
+    def _label_vectors(cls, labels: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Embeddings of every label phrase + its exemplars, computed once per
+        taxonomy. Returns (vectors, owner) where owner[i] is the label index
+        of vectors[i]; rows are grouped by label.
+        """
+        key = (tuple(labels), tuple((l, tuple(cls.TOPIC_EXEMPLARS.get(l, ()))) for l in labels))
+        with cls._label_lock:
+            cached = cls._label_cache.get(key)
+            if cached is not None:
+                return cached
+
+            texts, owner = [], []
+            for i, label in enumerate(labels):
+                for text in [cls.LABEL_TEMPLATE.format(label)] + list(cls.TOPIC_EXEMPLARS.get(label, ())):
+                    texts.append(text)
+                    owner.append(i)
+
+            cached = (cls._encode(texts), np.asarray(owner))
+            cls._label_cache[key] = cached
+            logger.info(f"TopicService: embedded {len(labels)} labels ({len(texts)} phrases).")
+            return cached
 
+    @classmethod
+    def _chunks(cls, text: str) -> List[str]:
+        words = text.split()
+        return [" ".join(words[i:i + cls.CHUNK_WORDS]) for i in range(0, len(words), cls.CHUNK_WORDS)]
+
+    @classmethod
+    def _vote(cls, chunk_vecs: np.ndarray, chunk_weights: np.ndarray, labels: List[str]) -> Dict:
+        """
+        Similarity-weighted vote: every chunk scores each label by its best
+        matching phrase, turns the scores into a distribution and votes with
+        weight = chunk length x its best similarity.
+        """
+        vectors, owner = cls._label_vectors(labels)
+        sims = chunk_vecs @ vectors.T                                   # chunks x phrases
+        starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+        per_label = np.maximum.reduceat(sims, starts, axis=1)           # chunks x labels
+
+        logits = per_label / cls.TEMPERATURE
+        probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs /= probs.sum(axis=1, keepdims=True)
+
+        weights = chunk_weights * np.clip(per_label.max(axis=1), 1e-6, None)
+        votes = (probs * weights[:, None]).sum(axis=0) / weights.sum()
+
+        best = int(np.argmax(votes))
+        return {"topic": labels[best], "confidence": float(votes[best])}
+
+    @classmethod
+    def classify_texts(cls, texts: List[str], labels: List[str] = None) -> List[Dict]:
+        """
+        Topic for each text, all chunks of all texts embedded in one batch.
+        Texts are chunked by CHUNK_WORDS so the whole text is covered.
+        """
+        labels = labels or cls.TOPIC_LABELS
+        results = [{"topic": "unknown", "confidence": 0.0} for _ in texts]
+
+        chunks, owner, weights = [], [], []
+        for i, text in enumerate(texts):
+            for chunk in cls._chunks(text or ""):
+                chunks.append(chunk)
+                owner.append(i)
+                weights.append(len(chunk.split()))
+        if not chunks:
+            return results
+
+        vecs = cls._encode(chunks)
+        owner, weights = np.asarray(owner), np.asarray(weights, dtype=np.float32)
+        for i in np.unique(owner):
+            rows = owner == i
+            results[int(i)] = cls._vote(vecs[rows], weights[rows], labels)
+        return results
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
     @classmethod
     def classify(cls, text: str) -> Dict:
         """
-        Perform zero-shot topic detection on the entire transcript.
+        Detect the topic of the entire transcript.
+
+        TOPIC_MODE=embedding scores the whole call; TOPIC_MODE=zero-shot
+        runs BART-MNLI on the first 512 characters (slower, high accuracy).
 
         Returns:
             {
@@ -53,6 +190,9 @@ class TopicService:
                 "confidence": 0.0,
             }
 
+        if TOPIC_MODE != "zero-shot":
+            return cls.classify_texts([text])[0]
+
         model = cls._load_model()
 
         result = model(
@@ -75,12 +215,16 @@ class TopicService:
         Optional speaker-level topic tagging.
         Not used in main API yet, but ready for future.
         """
+        if TOPIC_MODE != "zero-shot":
+            topics = cls.classify_texts([seg.get("text", "") for seg in segments])
+        else:
+            topics = [cls.classify(seg.get("text", "")) for seg in segments]
+
         updated = []
-        for seg in segments:
-            t = cls.classify(seg.get("text", ""))
+        for seg, t in zip(segments, topics):
             updated.append({
                 **seg,
                 "topic": t["topic"],
                 "topic_confidence": t["confidence"],
             })
-        return updated
\ No newline at end of file
+        return updated
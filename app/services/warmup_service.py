@@ -0,0 +1,163 @@
+# app/services/warmup_service.py
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.utils.logger import logger
+
+
+# "" / "none" = lazy loading (default), "all", or a comma list, e.g. "asr,sentiment"
+PRELOAD_MODELS = os.getenv("VOICEIQ_PRELOAD_MODELS", "")
+PRELOAD_WORKERS = int(os.getenv("VOICEIQ_PRELOAD_WORKERS", "4"))
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+LAZY = "lazy"
+
+
+# ------------------------------------------------------------
+# Warm-up steps: load the model, then run one tiny inference
+# ------------------------------------------------------------
+def _warm_asr():
+    from app.services.asr_backends import get_backend
+    from app.services.asr_service import load_model
+    model = load_model()
+    get_backend().transcribe(model, np.zeros(16000, dtype=np.float32))
+
+
+def _warm_diarization():
+    from app.services.diarization_service import load_diarization_pipeline
+    if load_diarization_pipeline() is None:
+        logger.info("Warm-up: pyannote unavailable, diarization runs in mock mode.")
+
+
+def _warm_sentiment():
+    from app.services.sentiment_service import SentimentService
+    SentimentService.analyze_texts(["warm up"])
+
+
+def _warm_topic():
+    from app.services.topic_service import TopicService
+    TopicService.classify("warm up")
+
+
+def _warm_summary():
+    from app.services.summary_service import _get_summarizer
+    _get_summarizer()("warm up", max_length=8, min_length=1, do_sample=False)
+
+
+def _warm_keywords():
+    from app.services.keyword_service import KeywordService
+    KeywordService._load_spacy()("warm up")
+    KeywordService.embed_texts(["warm up"])
+
+
+WARMUPS: Dict[str, Callable[[], None]] = {
+    "asr": _warm_asr,
+    "diarization": _warm_diarization,
+    "sentiment": _warm_sentiment,
+    "topic": _warm_topic,
+    "summary": _warm_summary,
+    "keywords": _warm_keywords,
+}
+
+
+def requested_models(spec: str = None) -> List[str]:
+    spec = (PRELOAD_MODELS if spec is None else spec).strip().lower()
+    if spec in ("", "0", "none", "off", "false"):
+        return []
+    if spec == "all":
+        return list(WARMUPS)
+    names = [n.strip() for n in spec.split(",") if n.strip()]
+    unknown = [n for n in names if n not in WARMUPS]
+    if unknown:
+        logger.warning(f"Warm-up: ignoring unknown models {unknown}.")
+    return [n for n in names if n in WARMUPS]
+
+
+# ------------------------------------------------------------
+# Readiness tracking
+# ------------------------------------------------------------
+class WarmupTracker:
+    """
+    Per-model load state for /readyz.
+
+    With nothing requested the service is ready immediately (models load
+    lazily on first use, as before).
+    """
+
+    def __init__(self, names: List[str]):
+        self._lock = threading.Lock()
+        self.models: Dict[str, Dict] = {
+            name: {"state": PENDING, "load_seconds": None, "error": None} for name in names
+        }
+
+    def _set(self, name: str, **fields) -> None:
+        with self._lock:
+            self.models[name].update(fields)
+
+    def run_one(self, name: str, warm: Callable[[], None]) -> None:
+        self._set(name, state=LOADING)
+        t0 = time.perf_counter()
+        try:
+            warm()
+        except Exception as e:
+            logger.error(f"Warm-up of '{name}' failed: {e}")
+            self._set(name, state=FAILED, error=str(e), load_seconds=round(time.perf_counter() - t0, 3))
+            return
+        elapsed = round(time.perf_counter() - t0, 3)
+        self._set(name, state=READY, load_seconds=elapsed)
+        logger.info(f"Warm-up: '{name}' ready in {elapsed:.1f}s.")
+
+    def run(self, max_workers: int = PRELOAD_WORKERS) -> None:
+        if not self.models:
+            return
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="warmup") as pool:
+            for name in list(self.models):
+                pool.submit(self.run_one, name, WARMUPS[name])
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return all(m["state"] == READY for m in self.models.values())
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            models = {name: dict(m) for name, m in self.models.items()}
+        for name in WARMUPS:
+            models.setdefault(name, {"state": LAZY, "load_seconds": None, "error": None})
+        return {"ready": self.ready, "models": models}
+
+
+_tracker: Optional[WarmupTracker] = None
+
+
+def get_warmup_tracker() -> WarmupTracker:
+    global _tracker
+    if _tracker is None:
+        _tracker = WarmupTracker([])
+    return _tracker
+
+
+def start_warmup(spec: str = None, background: bool = True) -> WarmupTracker:
+    """
+    Load the requested models in parallel. In the background by default so
+    /healthz answers while /readyz still reports the pod as warming up.
+    """
+    global _tracker
+    names = requested_models(spec)
+    _tracker = WarmupTracker(names)
+    if names:
+        logger.info(f"Warm-up: preloading {names}.")
+        if background:
+            threading.Thread(target=_tracker.run, name="warmup", daemon=True).start()
+        else:
+            _tracker.run()
+    return _tracker
@@ -1,7 +1,21 @@
 # app/utils/audio_utils.py
+import os
 import subprocess
+import tempfile
+import wave
+from typing import Optional, Union
+
+import numpy as np
+import soundfile as sf
+
 from app.utils.logger import logger
 
+# "memory": pipe ffmpeg PCM straight into numpy; "file": transcode to a temp WAV
+DECODE_MODE = os.getenv("VOICEIQ_DECODE_MODE", "memory").lower()
+
+class AudioTooLongError(ValueError):
+    """Decoded audio is longer than the allowed maximum."""
+
 def normalize_to_wav(in_path: str, out_path: str, sr: int = 16000):
     # requires ffmpeg installed
     cmd = ["ffmpeg", "-y", "-i", in_path, "-ac", "1", "-ar", str(sr), out_path]
@@ -10,4 +24,155 @@ def normalize_to_wav(in_path: str, out_path: str, sr: int = 16000):
     except subprocess.CalledProcessError as e:
         logger.exception("ffmpeg failed")
         raise RuntimeError("Audio normalization failed") from e
-    return out_path
\ No newline at end of file
+    return out_path
+
+
+class AudioBuffer:
+    """
+    Decoded mono PCM audio, shared by every audio-consuming service of a
+    request so the file is decoded once.
+
+    samples: float32 numpy array in [-1, 1]
+    sr:      sample rate
+    path:    normalized WAV on disk, if there is one
+    """
+
+    def __init__(self, samples: np.ndarray, sr: int, path: Optional[str] = None):
+        self.samples = samples
+        self.sr = sr
+        self.path = path
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / float(self.sr) if self.sr else 0.0
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def slice(self, start: float, end: float) -> np.ndarray:
+        """Zero-copy view of the samples between two timestamps (seconds)."""
+        s = max(int(start * self.sr), 0)
+        e = max(int(end * self.sr), s)
+        return self.samples[s:e]
+
+    def __repr__(self):
+        return f"AudioBuffer({self.duration:.2f}s @ {self.sr}Hz, path={self.path!r})"
+
+
+def load_audio(wav_path: str, sr: int = 16000) -> AudioBuffer:
+    """
+    Decode a WAV file once into an AudioBuffer (mono float32 at `sr`).
+    """
+    data, file_sr = sf.read(wav_path, dtype="float32", always_2d=False)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    if file_sr != sr:
+        import librosa
+        data = librosa.resample(data, orig_sr=file_sr, target_sr=sr)
+    return AudioBuffer(np.ascontiguousarray(data, dtype=np.float32), sr, path=wav_path)
+
+
+def as_audio_buffer(audio: Union[str, AudioBuffer], sr: int = 16000) -> AudioBuffer:
+    """Accept either a decoded buffer or a WAV path (decoded here)."""
+    if isinstance(audio, AudioBuffer):
+        return audio
+    return load_audio(audio, sr=sr)
+
+
+def audio_path(audio: Union[str, AudioBuffer]) -> Optional[str]:
+    return audio.path if isinstance(audio, AudioBuffer) else audio
+
+
+# ------------------------------------------------------------
+# In-memory decoding
+# ------------------------------------------------------------
+def _is_pcm16_mono_wav(path: str, sr: int) -> bool:
+    """True if the file is already 16-bit PCM mono WAV at the target rate."""
+    try:
+        with wave.open(path, "rb") as wf:
+            return (
+                wf.getnchannels() == 1
+                and wf.getsampwidth() == 2
+                and wf.getframerate() == sr
+                and wf.getcomptype() == "NONE"
+            )
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+def _pcm16_to_float(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def _read_pcm16_wav(path: str, sr: int) -> AudioBuffer:
+    with wave.open(path, "rb") as wf:
+        raw = wf.readframes(wf.getnframes())
+    return AudioBuffer(_pcm16_to_float(raw), sr, path=path)
+
+
+def decode_to_buffer(in_path: str, sr: int = 16000, max_seconds: Optional[float] = None) -> AudioBuffer:
+    """
+    Decode any ffmpeg-readable file to mono PCM at `sr`, piping raw s16le
+    samples from ffmpeg's stdout into numpy. No intermediate file is written.
+    With max_seconds, ffmpeg stops shortly after the limit instead of
+    decoding an oversized file to the end.
+    """
+    cmd = ["ffmpeg", "-nostdin", "-v", "error", "-i", in_path]
+    if max_seconds:
+        cmd += ["-t", str(max_seconds + 1.0)]
+    cmd += [
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", "1", "-ar", str(sr),
+        "pipe:1",
+    ]
+    try:
+        proc = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.warning(f"In-memory ffmpeg decode failed: {e}")
+        raise RuntimeError("Audio decoding failed") from e
+    return AudioBuffer(_pcm16_to_float(proc.stdout), sr, path=None)
+
+
+def _check_duration(duration: float, max_seconds: Optional[float]) -> None:
+    if max_seconds and duration > max_seconds:
+        raise AudioTooLongError(
+            f"Audio is longer than the {max_seconds:.0f}s limit"
+        )
+
+
+def decode_audio(
+    in_path: str,
+    sr: int = 16000,
+    wav_path: Optional[str] = None,
+    max_seconds: Optional[float] = None,
+) -> AudioBuffer:
+    """
+    Turn an upload into the request's shared AudioBuffer.
+
+    1. Already 16-bit mono PCM WAV at `sr`: read directly, no ffmpeg at all.
+    2. DECODE_MODE == "memory": ffmpeg -> pipe -> numpy.
+    3. Fallback: ffmpeg transcode to `wav_path` (or a temp dir), then load.
+
+    Raises AudioTooLongError when the audio exceeds max_seconds.
+    """
+    if _is_pcm16_mono_wav(in_path, sr):
+        logger.info("Input is already 16-bit mono PCM WAV; skipping ffmpeg.")
+        with wave.open(in_path, "rb") as wf:
+            _check_duration(wf.getnframes() / float(sr), max_seconds)
+        return _read_pcm16_wav(in_path, sr)
+
+    audio = None
+    if DECODE_MODE == "memory":
+        try:
+            audio = decode_to_buffer(in_path, sr=sr, max_seconds=max_seconds)
+        except RuntimeError:
+            logger.warning("Falling back to temp-file normalization.")
+
+    if audio is None:
+        if wav_path is None:
+            wav_path = os.path.join(tempfile.mkdtemp(), "normalized.wav")
+        normalize_to_wav(in_path, wav_path, sr=sr)
+        audio = load_audio(wav_path, sr=sr)
+
+    _check_duration(audio.duration, max_seconds)
+    return audio
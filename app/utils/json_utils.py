@@ -0,0 +1,16 @@
+# app/utils/json_utils.py
+import json
+from typing import Any
+
+
+def json_default(obj):
+    # numpy scalars / arrays sneak into service outputs (gender, stats, ...)
+    if hasattr(obj, "item") and getattr(obj, "ndim", 0) == 0:
+        return obj.item()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+def dumps(obj: Any) -> str:
+    return json.dumps(obj, default=json_default)
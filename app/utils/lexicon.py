@@ -0,0 +1,157 @@
+# app/utils/lexicon.py
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.utils.logger import logger
+
+
+# JSON file {category: [phrase, ...]}; its categories replace the defaults
+LEXICON_PATH = os.getenv("VOICEIQ_LEXICON_PATH", "")
+
+
+DEFAULT_LEXICONS: Dict[str, List[str]] = {
+    # IntentService
+    "intent.greeting": ["hi", "hello", "hey"],
+    "intent.question": ["?", "could you", "would you", "can you"],
+    "intent.apology": ["sorry", "apologize", "my fault"],
+    "intent.complaint": ["angry", "mad", "upset", "frustrated", "terrible", "horrible"],
+    "intent.storytelling": ["story", "when i was", "i remember", "i tell you", "basically what this is about"],
+    "intent.gratitude": ["thanks", "thank you", "appreciate it"],
+    "intent.agreement": ["okay", "ok", "that works", "sounds good"],
+    "intent.closing": ["bye", "goodbye", "talk to you later"],
+    # FlagService
+    "flag.hesitation": ["um", "uh", "you know", "er", "ah", "kind of", "sort of", "..."],
+    "flag.aggression": ["crap", "stupid", "idiot", "hate", "dumb", "aggressive", "angry"],
+    "flag.absolute": ["always", "never", "impossible", "absolutely", "definitely"],
+    "flag.hedge": ["i think", "maybe", "probably", "i guess"],
+    # EmotionService text fallback
+    "emotion.angry": ["angry", "mad", "furious", "crap", "stupid", "idiot"],
+    "emotion.sad": ["sorry", "sad", "upset", "bad news"],
+    "emotion.happy": ["great", "awesome", "amazing", "nice holiday", "happy"],
+}
+
+
+class LexiconHit(NamedTuple):
+    phrase: str
+    start: int
+    end: int
+    categories: Tuple[str, ...]
+
+
+def _normalize(phrase: str) -> str:
+    return " ".join(phrase.lower().split())
+
+
+class LexiconMatcher:
+    """
+    Every phrase of every category compiled into one regular expression.
+
+    The phrases are folded into a character trie and the trie is emitted as
+    nested alternations, so the regex engine follows at most one branch per
+    character: cost grows with the text and the phrase length, not with
+    the number of phrases. Phrases only match as whole words: a phrase that
+    starts / ends with a word character must not touch another word
+    character there ("er" does not match in "never", "ok" not in "book").
+    Spaces inside a phrase match any run of whitespace.
+
+    Matching is case-insensitive, leftmost and longest-first; overlapping
+    phrases (e.g. "you know" / "know") report only the longer one.
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        self.lexicons = {cat: [_normalize(p) for p in phrases if p.strip()] for cat, phrases in lexicons.items()}
+        self._owners: Dict[str, Tuple[str, ...]] = {}
+        for cat, phrases in self.lexicons.items():
+            for phrase in phrases:
+                owners = self._owners.get(phrase, ())
+                if cat not in owners:
+                    self._owners[phrase] = owners + (cat,)
+
+        self._regex = re.compile(self._trie_pattern(sorted(self._owners))) if self._owners else None
+        self._scan = lru_cache(maxsize=4096)(self._scan_uncached)
+
+    # --------------------------------------------------------
+    # Compilation
+    # --------------------------------------------------------
+    @staticmethod
+    def _trie_pattern(phrases: List[str]) -> str:
+        END = ""
+        trie: Dict = {}
+        for phrase in phrases:
+            node = trie
+            for ch in phrase:
+                node = node.setdefault(ch, {})
+            node[END] = True
+
+        def atom(ch: str) -> str:
+            return r"\s+" if ch == " " else re.escape(ch)
+
+        def emit(node: Dict, last: Optional[str]) -> str:
+            branches = []
+            for ch in sorted(k for k in node if k != END):
+                branches.append(atom(ch) + emit(node[ch], ch))
+            if END in node:
+                # the terminal alternative goes last so longer phrases win
+                branches.append(r"(?!\w)" if re.match(r"\w", last) else "")
+            if len(branches) == 1:
+                return branches[0]
+            return "(?:" + "|".join(branches) + ")"
+
+        top = []
+        for ch in sorted(trie):
+            lead = r"(?<!\w)" if re.match(r"\w", ch) else ""
+            top.append(lead + atom(ch) + emit(trie[ch], ch))
+        return "(?:" + "|".join(top) + ")"
+
+    def config(self) -> Dict:
+        """Lexicon contents (used to fingerprint cached results)."""
+        return {"match": "word", "lexicons": self.lexicons}
+
+    # --------------------------------------------------------
+    # Matching
+    # --------------------------------------------------------
+    def _scan_uncached(self, text: str) -> Tuple[LexiconHit, ...]:
+        if self._regex is None or not text:
+            return ()
+        hits = []
+        for m in self._regex.finditer(text.lower()):
+            phrase = _normalize(m.group())
+            hits.append(LexiconHit(phrase, m.start(), m.end(), self._owners.get(phrase, ())))
+        return tuple(hits)
+
+    def find(self, text: str) -> Tuple[LexiconHit, ...]:
+        """All hits in one pass over the text (cached per text)."""
+        return self._scan(text or "")
+
+    def categories(self, text: str) -> Dict[str, List[LexiconHit]]:
+        """{category: [hits]} for the categories present in text."""
+        out: Dict[str, List[LexiconHit]] = {}
+        for hit in self.find(text):
+            for cat in hit.categories:
+                out.setdefault(cat, []).append(hit)
+        return out
+
+
+def load_lexicons(path: str = None) -> Dict[str, List[str]]:
+    lexicons = {cat: list(phrases) for cat, phrases in DEFAULT_LEXICONS.items()}
+    path = LEXICON_PATH if path is None else path
+    if path:
+        with open(path, encoding="utf-8") as f:
+            custom = json.load(f)
+        lexicons.update({cat: list(phrases) for cat, phrases in custom.items()})
+        logger.info(f"Lexicon: loaded {sum(len(p) for p in custom.values())} phrases from {path}.")
+    return lexicons
+
+
+_matcher: Optional[LexiconMatcher] = None
+
+
+def get_lexicon() -> LexiconMatcher:
+    global _matcher
+    if _matcher is None:
+        _matcher = LexiconMatcher(load_lexicons())
+    return _matcher
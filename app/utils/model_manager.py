@@ -0,0 +1,275 @@
+# app/utils/model_manager.py
+
+import gc
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.utils.logger import logger
+from app.utils.single_flight import SingleFlight
+
+
+# Total (estimated) bytes of loaded models before LRU eviction; 0 = no cap
+MODEL_MEMORY_MB = float(os.getenv("VOICEIQ_MODEL_MEMORY_MB", "0"))
+# Unload a model nobody has asked for in this many seconds; 0 = never
+MODEL_IDLE_TTL = float(os.getenv("VOICEIQ_MODEL_IDLE_TTL", "0"))
+
+
+# ------------------------------------------------------------
+# Memory accounting
+# ------------------------------------------------------------
+def _rss_bytes() -> int:
+    """Resident set size of this process (Linux), 0 where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _torch_bytes(module: Any) -> int:
+    total = 0
+    for tensors in (module.parameters(), module.buffers()):
+        for t in tensors:
+            total += t.numel() * t.element_size()
+    return total
+
+
+def estimate_model_bytes(obj: Any) -> int:
+    """
+    Approximate memory held by a model object: parameter + buffer bytes of
+    the torch module(s) inside it (HF pipelines, Whisper, SBERT, pyannote).
+    0 when nothing measurable is found.
+    """
+    if obj is None:
+        return 0
+    if hasattr(obj, "parameters") and hasattr(obj, "buffers"):
+        try:
+            return _torch_bytes(obj)
+        except Exception:
+            return 0
+    # transformers pipelines / wrappers keep the network in .model
+    inner = getattr(obj, "model", None)
+    if inner is not None and inner is not obj:
+        return estimate_model_bytes(inner)
+    return 0
+
+
+class _Entry:
+    __slots__ = ("name", "config", "model", "bytes", "loaded_at", "last_used", "hits", "load_seconds")
+
+    def __init__(self, name: str, config: Dict, model: Any, size: int, load_seconds: float):
+        now = time.time()
+        self.name = name
+        self.config = config
+        self.model = model
+        self.bytes = size
+        self.loaded_at = now
+        self.last_used = now
+        self.hits = 0
+        self.load_seconds = load_seconds
+
+
+# ------------------------------------------------------------
+# Manager
+# ------------------------------------------------------------
+class ModelManager:
+    """
+    Process-wide cache of loaded models.
+
+    Models are keyed by name + config (so Whisper "base" and "small" are
+    two entries), their memory is estimated at load time (torch parameter
+    bytes; the RSS growth across the load only when no other load ran at
+    the same time, since parallel warm-up would count the others too), and:
+      - when the estimated total exceeds `budget_bytes`, least-recently-used
+        models are unloaded until it fits (the one just loaded is kept)
+      - models unused for `idle_ttl` seconds are unloaded by a janitor thread
+
+    A request that already holds a model keeps using it after eviction;
+    memory is released once the last reference goes away.
+
+    Loads are single-flight: concurrent first requests for the same key
+    share one load, see SingleFlight.
+    """
+
+    def __init__(self, budget_bytes: int = 0, idle_ttl: float = 0.0, flight: Optional[SingleFlight] = None):
+        self.budget_bytes = int(budget_bytes)
+        self.idle_ttl = float(idle_ttl)
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = flight or SingleFlight()
+        self._janitor: Optional[threading.Thread] = None
+        # loads in progress, and a counter bumped whenever one starts
+        self._loading = 0
+        self._load_starts = 0
+
+    @staticmethod
+    def make_key(name: str, config: Optional[Dict] = None) -> Tuple[str, str]:
+        return name, json.dumps(config or {}, sort_keys=True, default=str)
+
+    # --------------------------------------------------------
+    # Lookup / load
+    # --------------------------------------------------------
+    def get(self, name: str, loader: Callable[[], Any], config: Optional[Dict] = None) -> Any:
+        key = self.make_key(name, config)
+
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry.model
+
+        return self._flight.do(key, lambda: self._load(key, name, config, loader))
+
+    def _load(self, key, name: str, config: Optional[Dict], loader: Callable[[], Any]) -> Any:
+        # a load may have completed between our miss and joining the flight
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry.model
+
+            self._loading += 1
+            self._load_starts += 1
+            solo, started = self._loading == 1, self._load_starts
+
+        rss_before = _rss_bytes()
+        t0 = time.perf_counter()
+        try:
+            model = loader()
+            rss_grown = max(0, _rss_bytes() - rss_before)
+        finally:
+            with self._lock:
+                self._loading -= 1
+                # no other load overlapped this one: the RSS growth is ours alone
+                solo = solo and self._load_starts == started
+        elapsed = time.perf_counter() - t0
+        size = estimate_model_bytes(model)
+        if not size and solo:
+            size = rss_grown
+        elif not size:
+            logger.info(f"ModelManager: size of {name} unknown (loaded alongside other models).")
+
+        with self._lock:
+            self._entries[key] = _Entry(name, config or {}, model, size, elapsed)
+            self._entries.move_to_end(key)
+            self._evict_over_budget(keep=key)
+
+        logger.info(
+            f"ModelManager: loaded {name} {config or ''} in {elapsed:.1f}s "
+            f"(~{size / 2**20:.0f} MB, {self.total_bytes() / 2**20:.0f} MB total)."
+        )
+        self._ensure_janitor()
+        return model
+
+    def _touch(self, key) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.last_used = time.time()
+            entry.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    # --------------------------------------------------------
+    # Unloading
+    # --------------------------------------------------------
+    def _drop(self, key, reason: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            logger.info(f"ModelManager: unloaded {entry.name} {entry.config or ''} ({reason}).")
+
+    def _evict_over_budget(self, keep) -> None:
+        if self.budget_bytes <= 0:
+            return
+        for key in list(self._entries):
+            if sum(e.bytes for e in self._entries.values()) <= self.budget_bytes:
+                break
+            if key != keep:
+                self._drop(key, "memory budget")
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        if self.idle_ttl <= 0:
+            return 0
+        now = now or time.time()
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if now - e.last_used > self.idle_ttl]
+            for key in stale:
+                self._drop(key, "idle")
+        if stale:
+            _release_memory()
+        return len(stale)
+
+    def unload(self, name: str, config: Optional[Dict] = None) -> bool:
+        key = self.make_key(name, config)
+        with self._lock:
+            found = key in self._entries
+            self._drop(key, "requested")
+        if found:
+            _release_memory()
+        return found
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        _release_memory()
+
+    def _ensure_janitor(self) -> None:
+        if self.idle_ttl <= 0 or self._janitor is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(max(1.0, self.idle_ttl / 4))
+                self.evict_idle()
+
+        self._janitor = threading.Thread(target=loop, name="model-janitor", daemon=True)
+        self._janitor.start()
+
+    # --------------------------------------------------------
+    # Introspection
+    # --------------------------------------------------------
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(e.bytes for e in self._entries.values())
+
+    def stats(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {
+                    "name": e.name,
+                    "config": e.config,
+                    "approx_mb": round(e.bytes / 2**20, 1),
+                    "load_seconds": round(e.load_seconds, 3),
+                    "hits": e.hits,
+                    "idle_seconds": round(time.time() - e.last_used, 1),
+                }
+                for e in self._entries.values()
+            ]
+
+    def load_metrics(self) -> List[Dict]:
+        """Per-model load counters from the single-flight loader."""
+        return [
+            {"name": name, "config": json.loads(config), **m}
+            for (name, config), m in self._flight.metrics().items()
+        ]
+
+
+def _release_memory() -> None:
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+_model_manager: Optional[ModelManager] = None
+
+
+def get_model_manager() -> ModelManager:
+    global _model_manager
+    if _model_manager is None:
+        _model_manager = ModelManager(int(MODEL_MEMORY_MB * 1024 * 1024), MODEL_IDLE_TTL)
+    return _model_manager
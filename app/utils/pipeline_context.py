@@ -0,0 +1,120 @@
+# app/utils/pipeline_context.py
+
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.utils.logger import logger
+
+
+PROVIDED = "provided"
+COMPUTED = "computed"
+
+
+class PipelineContext:
+    """
+    Request-scoped artifact store.
+
+    Holds every named artifact of one pipeline run (asr, diarization,
+    aligned segments, conversation, keywords, embeddings, ...). Stages call
+    get_or_compute(name, fn): the first caller computes, concurrent callers
+    wait on a per-artifact lock, later callers get the stored value. The
+    context records how each artifact was obtained and how often it was
+    reused, see report(), and which stages fell back to a degraded result
+    (see mark_degraded()), so that run is not cached.
+
+    It is also dict-like so StageGraph can use it as its artifact store.
+    """
+
+    def __init__(self, request_id: Optional[str] = None):
+        self.request_id = request_id
+        self._values: Dict[str, Any] = {}
+        self._origin: Dict[str, str] = {}
+        self._reused: Dict[str, int] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._degraded: Dict[str, str] = {}
+        self._guard = threading.Lock()
+
+    # --------------------------------------------------------
+    # Memoization
+    # --------------------------------------------------------
+    def _lock_for(self, name: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def get_or_compute(self, name: str, compute: Callable[[], Any]) -> Any:
+        with self._lock_for(name):
+            if name in self._values:
+                with self._guard:
+                    self._reused[name] = self._reused.get(name, 0) + 1
+                return self._values[name]
+
+            value = compute()
+            with self._guard:
+                self._values[name] = value
+                self._origin[name] = COMPUTED
+            return value
+
+    def provide(self, name: str, value: Any) -> None:
+        with self._guard:
+            self._values[name] = value
+            self._origin[name] = PROVIDED
+
+    # --------------------------------------------------------
+    # Degraded results
+    # --------------------------------------------------------
+    def mark_degraded(self, name: str, reason: str) -> None:
+        """Record that `name` came from a fallback instead of the configured model."""
+        logger.warning(f"[{self.request_id}] {name} degraded: {reason}")
+        with self._guard:
+            self._degraded[name] = reason
+
+    def is_degraded(self, name: str) -> bool:
+        return name in self._degraded
+
+    @property
+    def degraded(self) -> Dict[str, str]:
+        with self._guard:
+            return dict(self._degraded)
+
+    # --------------------------------------------------------
+    # Mapping interface (StageGraph artifact store)
+    # --------------------------------------------------------
+    def __contains__(self, name: str) -> bool:
+        return name in self._values
+
+    def __getitem__(self, name: str) -> Any:
+        return self._values[name]
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        with self._guard:
+            self._values[name] = value
+            self._origin.setdefault(name, COMPUTED)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._values.get(name, default)
+
+    def update(self, items: Iterable[Tuple[str, Any]] = (), **kwargs) -> None:
+        for name, value in dict(items, **kwargs).items():
+            self[name] = value
+
+    # --------------------------------------------------------
+    # Introspection
+    # --------------------------------------------------------
+    def report(self) -> Dict[str, Dict]:
+        """
+        {artifact: {"status": "provided" | "computed", "reused": int}}
+        """
+        with self._guard:
+            return {
+                name: {"status": origin, "reused": self._reused.get(name, 0)}
+                for name, origin in self._origin.items()
+            }
+
+    def log_report(self) -> None:
+        report = self.report()
+        reused = {k: v["reused"] for k, v in report.items() if v["reused"]}
+        computed = [k for k, v in report.items() if v["status"] == COMPUTED]
+        logger.info(
+            f"[{self.request_id}] PipelineContext: computed {len(computed)} artifacts, "
+            f"reused {reused or 'none'}."
+        )
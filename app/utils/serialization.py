@@ -0,0 +1,219 @@
+# app/utils/serialization.py
+
+import json
+import typing
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from app.utils.json_utils import json_default
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional; needed only for Accept: application/msgpack
+    msgpack = None
+
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+# Views that repeat what speaker_segments / timeline already carry:
+#   asr_meta.segments  raw Whisper segments (token arrays)
+#   segments           diarization turns, same spans as speaker_segments
+#   conversation       the merged turns of timeline, without their intent
+COMPACT_EXCLUDE = ["asr_meta.segments", "segments", "conversation"]
+
+
+# ------------------------------------------------------------
+# Field selection
+# ------------------------------------------------------------
+def parse_fields(value: Optional[str]) -> List[str]:
+    """'a, b.c' -> ['a', 'b.c']"""
+    return [f.strip() for f in (value or "").split(",") if f.strip()]
+
+
+def _include(data: Dict, paths: List[List[str]]) -> Dict:
+    out = {}
+    for key in dict.fromkeys(p[0] for p in paths):
+        if key not in data:
+            continue
+        rest = [p[1:] for p in paths if p[0] == key]
+        if any(not r for r in rest) or not isinstance(data[key], dict):
+            out[key] = data[key]
+        else:
+            out[key] = _include(data[key], rest)
+    return out
+
+
+def _exclude(data: Dict, paths: List[List[str]]) -> Dict:
+    out = dict(data)
+    for path in paths:
+        if len(path) == 1:
+            out.pop(path[0], None)
+        elif isinstance(out.get(path[0]), dict):
+            out[path[0]] = _exclude(out[path[0]], [path[1:]])
+    return out
+
+
+def select(
+    data: Dict,
+    fields: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    compact: bool = False,
+    keep: Tuple[str, ...] = ("request_id",),
+) -> Dict:
+    """
+    Top-level / dotted field selection on a response dict. `fields` keeps
+    only the listed paths (plus `keep`), `exclude` and compact drop paths.
+    Only the dicts along the selected paths are copied.
+    """
+    if fields:
+        data = _include(data, [f.split(".") for f in list(keep) + list(fields)])
+    drop = list(exclude or []) + (COMPACT_EXCLUDE if compact else [])
+    if drop:
+        data = _exclude(data, [f.split(".") for f in drop])
+    return data
+
+
+def unknown_fields(model: Type[BaseModel], paths: List[str]) -> List[str]:
+    return [p for p in paths if p.split(".")[0] not in model.model_fields]
+
+
+# ------------------------------------------------------------
+# Model projection (no validation)
+# ------------------------------------------------------------
+_plans: Dict[type, Dict] = {}
+
+
+def _strip_optional(tp):
+    if typing.get_origin(tp) is typing.Union:
+        args = [a for a in typing.get_args(tp) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return tp
+
+
+def _plan_for_type(tp):
+    tp = _strip_optional(tp)
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        return ("model", _plan(tp))
+    origin, args = typing.get_origin(tp), typing.get_args(tp)
+    if origin in (list, List) and args:
+        sub = _plan_for_type(args[0])
+        return ("list", sub) if sub else None
+    if origin in (dict, Dict) and len(args) == 2:
+        sub = _plan_for_type(args[1])
+        return ("dict", sub) if sub else None
+    return None
+
+
+def _plan(model: Type[BaseModel]) -> Dict:
+    """{field: (sub-plan | None, required, default)}, built once per model."""
+    plan = _plans.get(model)
+    if plan is None:
+        plan = {}
+        for name, field in model.model_fields.items():
+            default = None if field.is_required() else field.get_default(call_default_factory=True)
+            plan[name] = (_plan_for_type(field.annotation), field.is_required(), default)
+        _plans[model] = plan
+    return plan
+
+
+def _flat(plan: Dict):
+    """(name, required, default) rows if no field needs recursion, else None."""
+    key = id(plan)
+    if key not in _flat_rows:
+        rows = tuple((n, req, d) for n, (sub, req, d) in plan.items())
+        _flat_rows[key] = rows if all(sub is None for sub, _, _ in plan.values()) else None
+    return _flat_rows[key]
+
+
+_flat_rows: Dict[int, Optional[tuple]] = {}
+
+
+def _apply(sub, value):
+    if value is None or sub is None:
+        return value
+    kind, inner = sub
+    if kind == "model":
+        return _project(inner, value) if isinstance(value, dict) else value
+    if kind == "list":
+        if inner and inner[0] == "model" and _flat(inner[1]) is not None:
+            # list of flat models (segments): one comprehension per item
+            rows = _flat(inner[1])
+            return [
+                {n: v.get(n, d) for n, req, d in rows if not req or n in v} if isinstance(v, dict) else v
+                for v in value
+            ]
+        return [_apply(inner, v) for v in value]
+    return {k: _apply(inner, v) for k, v in value.items()}
+
+
+def _project(plan: Dict, data: Dict) -> Dict:
+    out = {}
+    for name, (sub, required, default) in plan.items():
+        if name in data:
+            out[name] = _apply(sub, data[name])
+        elif not required:
+            out[name] = default
+    return out
+
+
+def project(model: Type[BaseModel], data: Dict, partial: bool = False) -> Dict:
+    """
+    Shape data like model.model_validate(data).model_dump() would (same
+    keys at every nested model, defaults filled in) without validating:
+    for payloads the pipeline built itself. With partial=True, top-level
+    fields absent from data stay absent (after field selection).
+    """
+    plan = _plan(model)
+    if partial:
+        plan = {k: v for k, v in plan.items() if k in data}
+    return _project(plan, data)
+
+
+# ------------------------------------------------------------
+# Encoding
+# ------------------------------------------------------------
+def wants_msgpack(accept: Optional[str]) -> bool:
+    return any(t in (accept or "") for t in MSGPACK_TYPES)
+
+
+def encode(data: Any, accept: Optional[str] = None) -> Tuple[bytes, str]:
+    """(body, media type): msgpack when the client asks for it, else JSON."""
+    if wants_msgpack(accept):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        return msgpack.packb(data, default=json_default, use_bin_type=True), MSGPACK
+    if orjson is not None:
+        return orjson.dumps(data, default=json_default, option=orjson.OPT_SERIALIZE_NUMPY), JSON
+    return json.dumps(data, default=json_default, separators=(",", ":")).encode("utf-8"), JSON
+
+
+def fast_response(
+    model: Type[BaseModel],
+    payload: Dict,
+    accept: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    compact: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Response for an internally built payload: select fields, project onto
+    the response model and encode directly, skipping pydantic validation
+    and FastAPI's jsonable_encoder pass.
+    """
+    # project only the top-level fields that survive, then trim dotted paths
+    dropped = [p for p in (exclude or []) + (COMPACT_EXCLUDE if compact else []) if "." not in p]
+    payload = select(payload, [f.split(".")[0] for f in fields or []], dropped)
+    data = select(project(model, payload, partial=bool(fields)), fields, exclude, compact)
+    body, media_type = encode(data, accept)
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,131 @@
+# app/utils/single_flight.py
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.utils.logger import logger
+
+
+# Attempts per load (first try + retries) and the exponential backoff between them
+LOAD_ATTEMPTS = int(os.getenv("VOICEIQ_MODEL_LOAD_ATTEMPTS", "3"))
+LOAD_BACKOFF_SECONDS = float(os.getenv("VOICEIQ_MODEL_LOAD_BACKOFF", "1.0"))
+LOAD_BACKOFF_MAX_SECONDS = 30.0
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key runs fn (retrying with exponential backoff);
+    callers arriving meanwhile block on that call and receive its value or
+    its exception. After a final failure the key cools down for the last
+    backoff interval: callers in that window get the same error at once
+    instead of starting another multi-GB load.
+    """
+
+    def __init__(
+        self,
+        attempts: int = LOAD_ATTEMPTS,
+        backoff: float = LOAD_BACKOFF_SECONDS,
+        backoff_max: float = LOAD_BACKOFF_MAX_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._failed: Dict[Hashable, tuple] = {}   # key -> (error, retry_at)
+        self._metrics: Dict[Hashable, Dict] = {}
+
+    def _delay(self, attempt: int) -> float:
+        return min(self.backoff * (2 ** attempt), self.backoff_max)
+
+    def _metric(self, key) -> Dict:
+        return self._metrics.setdefault(
+            key,
+            {"loads": 0, "failures": 0, "retries": 0, "coalesced": 0,
+             "last_load_seconds": None, "total_load_seconds": 0.0, "last_error": None},
+        )
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            failed = self._failed.get(key)
+            if failed is not None:
+                error, retry_at = failed
+                if time.monotonic() < retry_at:
+                    raise error
+                del self._failed[key]
+
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._metric(key)["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        t0 = time.perf_counter()
+        try:
+            call.value = self._run(key, fn)
+        except BaseException as e:
+            call.error = e
+        elapsed = time.perf_counter() - t0
+
+        with self._lock:
+            m = self._metric(key)
+            m["last_load_seconds"] = round(elapsed, 3)
+            m["total_load_seconds"] = round(m["total_load_seconds"] + elapsed, 3)
+            if call.error is None:
+                m["loads"] += 1
+            else:
+                m["failures"] += 1
+                m["last_error"] = str(call.error)
+                self._failed[key] = (call.error, time.monotonic() + self._delay(self.attempts - 1))
+            del self._calls[key]
+        call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    def _run(self, key, fn):
+        for attempt in range(self.attempts):
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.attempts - 1:
+                    raise
+                delay = self._delay(attempt)
+                logger.warning(f"Load of {key} failed ({e}); retrying in {delay:.1f}s.")
+                with self._lock:
+                    self._metric(key)["retries"] += 1
+                self._sleep(delay)
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def metrics(self) -> Dict[Hashable, Dict]:
+        with self._lock:
+            return {key: dict(m) for key, m in self._metrics.items()}
@@ -0,0 +1,138 @@
+# app/utils/upload_utils.py
+
+import hashlib
+import os
+from typing import Optional
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from app.utils.logger import logger
+
+
+MAX_UPLOAD_BYTES = int(float(os.getenv("VOICEIQ_MAX_UPLOAD_MB", "500")) * 1024 * 1024)
+MAX_AUDIO_SECONDS = float(os.getenv("VOICEIQ_MAX_AUDIO_SECONDS", str(4 * 3600)))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+SUPPORTED_FORMATS = ("wav", "mp3", "m4a", "flac")
+
+
+class UploadRejected(ValueError):
+    """Upload refused before processing (bad format, too large, too long)."""
+
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class SavedUpload:
+    """An upload streamed to disk, with its content hash and sniffed format."""
+
+    def __init__(self, path: str, sha256: str, size: int, fmt: str):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.format = fmt
+
+    def __repr__(self):
+        return f"SavedUpload({self.format}, {self.size} bytes, sha256={self.sha256[:12]}...)"
+
+
+# ------------------------------------------------------------
+# Format sniffing
+# ------------------------------------------------------------
+def sniff_audio_format(head: bytes) -> Optional[str]:
+    """
+    Identify the container from its magic bytes (first 12 bytes are enough).
+    Returns one of SUPPORTED_FORMATS-style names, or None.
+    """
+    if len(head) >= 12 and head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:3] == b"ID3":
+        return "mp3"
+    if len(head) >= 8 and head[4:8] == b"ftyp":
+        return "m4a"
+    if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0:
+        # MPEG audio frame sync; layer bits 00 are reserved (ADTS AAC uses them)
+        if (head[1] & 0x06) != 0:
+            return "mp3"
+    return None
+
+
+# ------------------------------------------------------------
+# Streaming ingestion
+# ------------------------------------------------------------
+async def save_upload(
+    file: UploadFile,
+    dest_dir: str,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> SavedUpload:
+    """
+    Stream an UploadFile to `dest_dir` chunk by chunk.
+
+    - hashes (SHA-256) the content while it arrives
+    - checks the format from magic bytes, not the filename
+    - enforces max_bytes (default VOICEIQ_MAX_UPLOAD_MB)
+    - file writes run in the threadpool so the event loop never blocks
+
+    Peak memory is one chunk regardless of the upload size.
+    """
+    limit = max_bytes or MAX_UPLOAD_BYTES
+    digest = hashlib.sha256()
+    size = 0
+    pending = b""   # bytes received before the format is known
+    path = None
+    out = None
+
+    async def open_for(head: bytes):
+        fmt = sniff_audio_format(head)
+        if fmt not in SUPPORTED_FORMATS:
+            raise UploadRejected("Unsupported file format")
+        target = os.path.join(dest_dir, f"upload.{fmt}")
+        return fmt, target, await run_in_threadpool(open, target, "wb")
+
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if size > limit:
+                raise UploadRejected(
+                    f"Upload exceeds the {limit} byte limit", status_code=413
+                )
+            digest.update(chunk)
+
+            if out is None:
+                pending += chunk
+                if len(pending) < 12:
+                    continue
+                fmt, path, out = await open_for(pending)
+                chunk, pending = pending, b""
+
+            await run_in_threadpool(out.write, chunk)
+
+        if out is None:
+            # whole upload shorter than one sniff window
+            fmt, path, out = await open_for(pending)
+            await run_in_threadpool(out.write, pending)
+
+    except BaseException:
+        if out is not None:
+            out.close()
+            out = None
+        if path and os.path.exists(path):
+            os.remove(path)
+        raise
+    finally:
+        if out is not None:
+            await run_in_threadpool(out.close)
+
+    saved = SavedUpload(path, digest.hexdigest(), size, fmt)
+    logger.info(f"Upload stored: {saved}")
+    return saved
@@ -0,0 +1,104 @@
+"""
+Alignment benchmark on synthetic input.
+
+    python -m benchmarks.bench_alignment [--words 100000] [--turns 10000]
+
+Times EnhancedAligner.align() on a long synthetic recording and, on a
+reduced slice, compares against the previous O(W x D) scan to check that
+the output is identical.
+"""
+
+import argparse
+import random
+import time
+
+from app.services.alignment_service import (
+    EnhancedAligner,
+    _best_diar_for_asr,
+    _confidence_from_whisper,
+)
+
+
+def synthetic_inputs(n_words: int, n_turns: int, seed: int = 0):
+    rng = random.Random(seed)
+    words_per_seg = 10
+    t = 0.0
+    asr = []
+    for i in range(n_words // words_per_seg):
+        dur = rng.uniform(2.0, 6.0)
+        asr.append(
+            {
+                "start": t,
+                "end": t + dur,
+                "text": " ".join(f"w{i}_{k}" for k in range(words_per_seg)),
+                "avg_logprob": -rng.random(),
+                "no_speech_prob": rng.random() * 0.1,
+            }
+        )
+        t += dur + rng.uniform(0.0, 0.3)
+
+    bounds = sorted(rng.uniform(0, t) for _ in range(n_turns - 1))
+    edges = [0.0] + bounds + [t]
+    diar = [
+        {"start": edges[i], "end": edges[i + 1], "speaker": f"SPEAKER_{i % 2}"}
+        for i in range(n_turns)
+    ]
+    return {"segments": asr}, diar
+
+
+def naive_align(asr_result, diar):
+    """The previous quadratic implementation, kept for comparison."""
+    asr = EnhancedAligner._extract_asr_segments(asr_result)
+    words = sorted(EnhancedAligner._to_word_segments(asr), key=lambda x: x["start"])
+    raw = []
+    for d in sorted(diar, key=lambda x: x["start"]):
+        hit = [w for w in words if not (w["end"] <= d["start"] or w["start"] >= d["end"])]
+        if hit:
+            raw.append(
+                {
+                    "start": round(d["start"], 3),
+                    "end": round(d["end"], 3),
+                    "speaker": d["speaker"],
+                    "text": " ".join(w["word"] for w in hit).strip(),
+                }
+            )
+    merged = EnhancedAligner._merge_blocks(raw)
+    for seg in merged:
+        best = _best_diar_for_asr({"start": seg["start"], "end": seg["end"]}, asr)
+        seg["confidence"] = _confidence_from_whisper(best) if best else 0.5
+        seg["gender"] = None
+        seg["gender_confidence"] = None
+    return {"speaker_segments": merged}
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=10_000)
+    parser.add_argument("--naive-scale", type=float, default=0.1,
+                        help="fraction of the input used for the quadratic comparison")
+    args = parser.parse_args()
+
+    asr, diar = synthetic_inputs(args.words, args.turns)
+    out, elapsed = _timed(EnhancedAligner.align, asr, diar)
+    print(f"indexed  {args.words} words / {args.turns} turns: {elapsed:.2f}s "
+          f"({len(out['speaker_segments'])} segments)")
+
+    small_words = int(args.words * args.naive_scale)
+    small_turns = max(2, int(args.turns * args.naive_scale))
+    asr, diar = synthetic_inputs(small_words, small_turns, seed=1)
+    fast, t_fast = _timed(EnhancedAligner.align, asr, diar)
+    slow, t_slow = _timed(naive_align, asr, diar)
+    print(f"indexed  {small_words} words / {small_turns} turns: {t_fast:.2f}s")
+    print(f"naive    {small_words} words / {small_turns} turns: {t_slow:.2f}s")
+    print(f"identical output: {fast == slow}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Response serialization benchmark on a synthetic long call.
+
+    python -m benchmarks.bench_serialization [--turns 5000]
+
+Compares the default path (pydantic validation of the payload through
+ProcessAudioResponse + JSON encoding) with the fast path (projection +
+orjson / msgpack), in full and compact form.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from app.routes.process_audio import ProcessAudioResponse
+from app.utils.serialization import fast_response
+
+
+def synthetic_payload(n_turns: int, seed: int = 0):
+    rng = random.Random(seed)
+    t, segs = 0.0, []
+    for i in range(n_turns):
+        dur = rng.uniform(1.0, 8.0)
+        text = " ".join(f"word{rng.randint(0, 5000)}" for _ in range(int(dur * 2.5)))
+        segs.append(
+            {
+                "start": round(t, 3), "end": round(t + dur, 3), "speaker": f"SPEAKER_0{i % 2}",
+                "text": text, "sentiment": "neutral", "sentiment_score": rng.random(),
+                "keywords": text.split()[:3], "confidence": rng.random(),
+                "gender": "male", "gender_confidence": 0.9, "emotion": "neutral",
+            }
+        )
+        t += dur
+    whisper = [
+        dict(s, tokens=[rng.randint(0, 50000) for _ in range(len(s["text"].split()) * 2)],
+             avg_logprob=-rng.random(), no_speech_prob=rng.random())
+        for s in segs
+    ]
+    return {
+        "request_id": "bench",
+        "transcript": " ".join(s["text"] for s in segs),
+        "asr_meta": {"model": "base", "language": "en", "duration": t, "segments": whisper},
+        "segments": [{"start": s["start"], "end": s["end"], "speaker": s["speaker"]} for s in segs],
+        "speaker_segments": segs,
+        "conversation": [dict(s, intent="other") for s in segs],
+        "speaker_stats": {},
+        "conversation_stats": {
+            "total_duration": t, "total_segments": n_turns, "total_words": 0, "avg_turn_length": 0.0,
+            "speaker_count": 2, "conversation_start": 0.0, "conversation_end": t,
+        },
+        "topic": {"topic": "support", "confidence": 0.9},
+        "timeline": [{"start": s["start"], "end": s["end"], "speaker": s["speaker"], "text": s["text"],
+                      "intent": "other"} for s in segs],
+    }
+
+
+def timed(fn, repeat=3):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=5000)
+    args = parser.parse_args()
+    payload = synthetic_payload(args.turns)
+
+    def validated():
+        # what FastAPI does for response_model: validate, dump, encode
+        model = ProcessAudioResponse.model_validate(payload)
+        return json.dumps(model.model_dump(mode="json")).encode("utf-8")
+
+    cases = [
+        ("validated json", validated),
+        ("fast json", lambda: fast_response(ProcessAudioResponse, payload).body),
+        ("fast json compact", lambda: fast_response(ProcessAudioResponse, payload, compact=True).body),
+        ("fast msgpack compact",
+         lambda: fast_response(ProcessAudioResponse, payload, accept="application/msgpack", compact=True).body),
+    ]
+    base = None
+    for name, fn in cases:
+        seconds, body = timed(fn)
+        base = base or (seconds, len(body))
+        print(
+            f"{name:22s} {seconds * 1000:9.1f} ms  {len(body) / 1e6:7.2f} MB  "
+            f"x{base[0] / seconds:5.1f} faster, x{base[1] / len(body):4.1f} smaller"
+        )
+
+
+if __name__ == "__main__":
+    main()
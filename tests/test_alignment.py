@@ -0,0 +1,64 @@
+import random
+
+from app.services.alignment_service import EnhancedAligner, _best_diar_for_asr, _IntervalIndex
+
+
+def _naive_words_to_diarization(word_segments, diarization):
+    aligned = []
+    word_segments = sorted(word_segments, key=lambda x: x["start"])
+    for d in sorted(diarization, key=lambda x: x["start"]):
+        words = [
+            w for w in word_segments
+            if not (w["end"] <= d["start"] or w["start"] >= d["end"])
+        ]
+        if words:
+            aligned.append(
+                {
+                    "start": round(d["start"], 3),
+                    "end": round(d["end"], 3),
+                    "speaker": d["speaker"],
+                    "text": " ".join(w["word"] for w in words).strip(),
+                }
+            )
+    return aligned
+
+
+def _random_turns(rng, n, total):
+    turns = []
+    for _ in range(n):
+        start = round(rng.uniform(0, total), 2)
+        turns.append(
+            {"start": start, "end": round(start + rng.uniform(0, 20), 2), "speaker": f"SPEAKER_{rng.randint(0, 2)}"}
+        )
+    return turns
+
+
+def test_word_mapping_matches_naive_scan():
+    rng = random.Random(7)
+    for _ in range(20):
+        asr = [
+            {"start": s["start"], "end": s["end"], "text": " ".join(f"w{i}" for i in range(rng.randint(0, 12)))}
+            for s in _random_turns(rng, 40, 300)
+        ]
+        words = EnhancedAligner._to_word_segments(asr)
+        diar = _random_turns(rng, 30, 300)
+
+        assert EnhancedAligner._align_words_to_diarization(words, diar) == \
+            _naive_words_to_diarization(words, diar)
+
+
+def test_best_overlap_matches_linear_scan_including_ties():
+    rng = random.Random(11)
+    for _ in range(50):
+        # integer bounds make equal overlaps common
+        segs = []
+        for _ in range(25):
+            start = rng.randint(0, 50)
+            segs.append({"start": start, "end": start + rng.randint(0, 10)})
+        index = _IntervalIndex(segs)
+
+        for _ in range(25):
+            q_start = rng.randint(0, 55)
+            q_end = q_start + rng.randint(0, 10)
+            expected = _best_diar_for_asr({"start": q_start, "end": q_end}, segs)
+            assert index.best_overlap(q_start, q_end) is expected
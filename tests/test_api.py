@@ -4,6 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 from app.main import app
 from app.services.asr_service import transcribe_local
+from app.services.diarization_service import diarization_config
 
 
 # Create a test client
@@ -62,12 +63,28 @@ def patch_services(monkeypatch):
 
     # IMPORTANT — patch the imported names inside **process_audio**
     monkeypatch.setattr("app.routes.process_audio.transcribe_local", mock_transcribe_local)
-    monkeypatch.setattr("app.routes.process_audio.diarize_audio", mock_diarize_audio)
+    monkeypatch.setattr(
+        "app.routes.process_audio.diarize_audio_with_backend",
+        lambda audio: (mock_diarize_audio(audio), diarization_config()["backend"]),
+    )
     monkeypatch.setattr("app.routes.process_audio.align_transcript_with_speakers", mock_align)
 
     yield
 
 
+# Keep the result cache per-test so runs never see each other's payloads
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    from app.services.cache_service import ResultCache
+    monkeypatch.setattr(
+        "app.services.cache_service._result_cache",
+        ResultCache(str(tmp_path / "cache.db"), 16 * 1024 * 1024),
+    )
+    from app.services.report_service import ReportStore
+    monkeypatch.setattr("app.services.report_service._report_store", ReportStore(str(tmp_path / "reports.db")))
+    yield
+
+
 # --------------------------
 # Test 1: Process Audio Route
 # --------------------------
@@ -122,4 +139,265 @@ def test_response_schema_integrity():
     for seg in payload["speaker_segments"]:
         assert all(k in seg for k in ("start", "end", "speaker", "text"))
 
-    print("\n Response schema verified successfully.")
\ No newline at end of file
+    print("\n Response schema verified successfully.")
+
+# --------------------------
+# Test 3: Async Job API
+# --------------------------
+def test_process_audio_job_lifecycle(tmp_path, monkeypatch):
+    """
+    Submit a job, poll it to completion and fetch the same payload the
+    synchronous route returns.
+    """
+    import time
+    import app.routes.jobs as jobs_route
+    from app.services.job_service import JobStore, JobQueue
+    from app.routes.process_audio import run_pipeline
+
+    store = JobStore(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(jobs_route, "JOB_DIR", str(tmp_path))
+    monkeypatch.setattr(jobs_route, "_job_queue", JobQueue(store, run_pipeline, maxsize=2, workers=1))
+
+    files = {"file": ("job.wav", generate_silent_wav(), "audio/wav")}
+    response = client.post("/v1/process-audio/jobs", files=files)
+    assert response.status_code == 202, response.text
+    job_id = response.json()["job_id"]
+
+    status = {}
+    for _ in range(200):
+        status = client.get(f"/v1/process-audio/jobs/{job_id}").json()
+        if status["status"] in ("done", "failed"):
+            break
+        time.sleep(0.1)
+
+    assert status["status"] == "done", status
+    assert status["progress"] == 1.0
+    assert status["stages"]["transcription"]["status"] == "done"
+
+    result = client.get(f"/v1/process-audio/jobs/{job_id}/result")
+    assert result.status_code == 200, result.text
+    data = result.json()
+    assert data["request_id"] == job_id
+    assert len(data["speaker_segments"]) == 2
+
+    assert client.get("/v1/process-audio/jobs/missing").status_code == 404
+
+
+def test_rejected_job_leaves_no_upload_behind(tmp_path, monkeypatch):
+    import app.routes.jobs as jobs_route
+    from app.services.job_service import JobStore, JobQueue, JobQueueFull
+    from app.routes.process_audio import run_pipeline
+
+    def full(job_id):
+        raise JobQueueFull("Job queue is full, try again later.")
+
+    queue = JobQueue(JobStore(str(tmp_path / "jobs.db")), run_pipeline, maxsize=1, workers=1)
+    monkeypatch.setattr(queue, "submit", full)
+    monkeypatch.setattr(jobs_route, "JOB_DIR", str(tmp_path))
+    monkeypatch.setattr(jobs_route, "_job_queue", queue)
+
+    response = client.post("/v1/process-audio/jobs", files={"file": ("job.wav", generate_silent_wav(), "audio/wav")})
+    assert response.status_code == 503
+    assert [p.name for p in tmp_path.iterdir() if p.is_dir()] == []
+
+
+# --------------------------
+# Test 4: Upload validation
+# --------------------------
+def test_upload_rejects_bad_magic_and_oversize(monkeypatch):
+    """
+    The format comes from the file's magic bytes, not its extension, and
+    uploads above the configured size are refused with 413.
+    """
+    files = {"file": ("fake.wav", io.BytesIO(b"this is not audio at all"), "audio/wav")}
+    response = client.post("/v1/process-audio", files=files)
+    assert response.status_code == 400
+
+    monkeypatch.setattr("app.utils.upload_utils.MAX_UPLOAD_BYTES", 1024)
+    files = {"file": ("big.wav", generate_silent_wav(duration=1.0), "audio/wav")}
+    response = client.post("/v1/process-audio", files=files)
+    assert response.status_code == 413
+
+
+# --------------------------
+# Test 5: Result cache
+# --------------------------
+def test_repeat_submission_served_from_cache():
+    """
+    The same audio twice -> second response comes from the content-addressed
+    cache with a fresh request_id; the opt-out header skips the cache.
+    """
+    first = client.post("/v1/process-audio", files={"file": ("a.wav", generate_silent_wav(), "audio/wav")})
+    assert first.status_code == 200, first.text
+    assert first.headers["X-VoiceIQ-Cache"] == "miss"
+
+    second = client.post("/v1/process-audio", files={"file": ("b.wav", generate_silent_wav(), "audio/wav")})
+    assert second.status_code == 200, second.text
+    assert second.headers["X-VoiceIQ-Cache"] == "hit"
+    assert second.json()["request_id"] != first.json()["request_id"]
+    assert second.json()["speaker_segments"] == first.json()["speaker_segments"]
+    # nothing ran for the second request
+    assert first.json()["stage_timings"] and second.json()["stage_timings"] is None
+    assert second.json()["artifacts"] is None
+
+    bypass = client.post(
+        "/v1/process-audio",
+        files={"file": ("c.wav", generate_silent_wav(), "audio/wav")},
+        headers={"X-VoiceIQ-Cache": "bypass"},
+    )
+    assert bypass.status_code == 200, bypass.text
+    assert bypass.headers["X-VoiceIQ-Cache"] == "bypass"
+
+
+@pytest.mark.parametrize("degrade", ["diarization", "sentiment"])
+def test_fallback_results_are_not_cached(monkeypatch, degrade):
+    """
+    A run where pyannote or the sentiment model fell back must not be
+    stored under the healthy fingerprint and replayed for that audio.
+    """
+    from app.services.sentiment_service import SentimentService
+
+    diarized = []
+
+    def mock_diarize(audio):
+        diarized.append(audio)
+        backend = "mock" if degrade == "diarization" else "pyannote"
+        return [{"start": 0.0, "end": 3.5, "speaker": "SPEAKER_00", "confidence": 1.0}], backend
+
+    monkeypatch.setattr("app.routes.process_audio.diarization_config", lambda: {"backend": "pyannote"})
+    monkeypatch.setattr("app.routes.process_audio.diarize_audio_with_backend", mock_diarize)
+    if degrade == "sentiment":
+        monkeypatch.setattr(SentimentService, "_load_pipeline", classmethod(lambda cls: None))
+
+    for name in ("a.wav", "b.wav"):
+        response = client.post("/v1/process-audio", files={"file": (name, generate_silent_wav(), "audio/wav")})
+        assert response.status_code == 200, response.text
+        assert response.headers["X-VoiceIQ-Cache"] == "miss"
+    # mock turns are recomputed; healthy turns come from the artifact cache
+    assert len(diarized) == (2 if degrade == "diarization" else 1)
+
+
+# --------------------------
+# Test 6: Shared artifacts
+# --------------------------
+def test_alignment_computed_once_and_reused():
+    """
+    Alignment feeds both speaker_segments and the conversation view; the
+    request context must compute it once and report the reuse.
+    """
+    response = client.post("/v1/process-audio", files={"file": ("ctx.wav", generate_silent_wav(), "audio/wav")})
+    assert response.status_code == 200, response.text
+    artifacts = response.json()["artifacts"]
+
+    assert artifacts["speaker_segments"] == {"status": "computed", "reused": 1}
+    assert artifacts["conversation"]["status"] == "computed"
+    assert artifacts["keywords"]["status"] == "computed"
+
+
+def test_readyz_tracks_model_warmup(monkeypatch):
+    """
+    /readyz is 503 until every preloaded model has loaded; lazy mode is
+    ready straight away.
+    """
+    from app.services import warmup_service
+
+    assert client.get("/readyz").json()["ready"] is True
+
+    gate = warmup_service.threading.Event()
+    monkeypatch.setitem(warmup_service.WARMUPS, "sentiment", gate.wait)
+    monkeypatch.setitem(warmup_service.WARMUPS, "topic", lambda: 1 / 0)
+    tracker = warmup_service.start_warmup("sentiment")
+
+    r = client.get("/readyz")
+    assert r.status_code == 503
+    assert r.json()["models"]["topic"]["state"] == "lazy"
+
+    gate.set()
+    for _ in range(100):
+        if tracker.ready:
+            break
+        warmup_service.time.sleep(0.01)
+    body = client.get("/readyz").json()
+    assert body["ready"] is True
+    assert body["models"]["sentiment"]["state"] == "ready"
+    assert body["models"]["sentiment"]["load_seconds"] is not None
+
+    warmup_service.start_warmup("topic", background=False)
+    r = client.get("/readyz")
+    assert r.status_code == 503
+    assert r.json()["models"]["topic"]["state"] == "failed"
+
+    warmup_service.start_warmup("")
+
+
+def test_models_endpoint_lists_manager_state():
+    body = client.get("/v1/models").json()
+    assert {"budget_mb", "idle_ttl_seconds", "total_mb", "rss_mb", "models"} <= set(body)
+    assert isinstance(body["models"], list)
+
+
+# --------------------------
+# Test: Deferred PDF reports
+# --------------------------
+def test_report_rendered_on_first_fetch_and_cached(monkeypatch):
+    """
+    The default lazy mode returns a report_url without any PDF work; the
+    first GET renders it, later GETs reuse it and honour If-None-Match.
+    """
+    import app.services.report_service as report_service
+
+    renders = []
+    original = report_service.render_report
+    monkeypatch.setattr(report_service, "render_report", lambda a: renders.append(1) or original(a))
+
+    data = client.post("/v1/process-audio", files={"file": ("r.wav", generate_silent_wav(), "audio/wav")}).json()
+    assert data["report_pdf_base64"] is None
+    assert data["report_url"] == f"/v1/reports/{data['request_id']}.pdf"
+    assert renders == []
+
+    first = client.get(data["report_url"])
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/pdf"
+    assert first.content.startswith(b"%PDF")
+    second = client.get(data["report_url"], headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    assert renders == [1]
+
+    assert client.get("/v1/reports/missing.pdf").status_code == 404
+
+
+def test_report_mode_per_request():
+    files = lambda: {"file": ("m.wav", generate_silent_wav(), "audio/wav")}
+
+    inline = client.post("/v1/process-audio?report=inline", files=files()).json()
+    assert inline["report_pdf_base64"]
+    assert client.get(inline["report_url"]).status_code == 200
+
+    # cache hit with a fresh request_id still gets its own report
+    none = client.post("/v1/process-audio?report=none", files=files()).json()
+    assert none["report_url"] is None and none["report_pdf_base64"] is None
+    assert client.get(f"/v1/reports/{none['request_id']}.pdf").status_code == 404
+
+    assert client.post("/v1/process-audio?report=eager", files=files()).status_code == 422
+
+
+# --------------------------
+# Test: Response shaping
+# --------------------------
+def test_fields_compact_and_msgpack_responses():
+    import msgpack
+
+    files = lambda: {"file": ("s.wav", generate_silent_wav(), "audio/wav")}
+
+    r = client.post("/v1/process-audio?fields=summary,topic", files=files())
+    assert r.status_code == 200, r.text
+    assert set(r.json()) == {"request_id", "summary", "topic"}
+    assert r.headers["X-VoiceIQ-Cache"] == "miss"
+
+    r = client.post("/v1/process-audio?compact=true", files=files(), headers={"Accept": "application/msgpack"})
+    assert r.headers["content-type"] == "application/msgpack"
+    data = msgpack.unpackb(r.content)
+    assert "conversation" not in data and "segments" not in data["asr_meta"]
+    assert len(data["speaker_segments"]) == 2
+
+    assert client.post("/v1/process-audio?fields=nope", files=files()).status_code == 422
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from app.services import asr_backends, asr_service
+from app.services.alignment_service import EnhancedAligner
+from app.utils import model_manager
+from app.utils.audio_utils import AudioBuffer
+
+
+@pytest.fixture
+def dummy_backend(monkeypatch):
+    monkeypatch.setattr(asr_backends, "ASR_BACKEND", "dummy")
+    monkeypatch.setattr(model_manager, "_model_manager", model_manager.ModelManager())
+
+
+def test_dummy_backend_meta_feeds_the_aligner(dummy_backend):
+    audio = AudioBuffer(np.zeros(12 * 16000, dtype=np.float32), 16000)
+
+    text, meta = asr_service.transcribe_local(audio)
+
+    assert text.startswith("This is a placeholder")
+    assert meta["duration"] == 12.0
+    segs = EnhancedAligner._extract_asr_segments(meta)
+    assert [(s["start"], s["end"]) for s in segs] == [(0.0, 5.0), (5.0, 10.0), (10.0, 12.0)]
+    assert asr_service.asr_config()["engine"] == "dummy"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown ASR backend"):
+        asr_backends.get_backend("no-such-engine")
+
+
+def test_quantized_backend_is_part_of_the_fingerprint(monkeypatch):
+    monkeypatch.setattr(asr_backends, "ASR_BACKEND", "faster-whisper")
+    config = asr_service.asr_config()
+    assert config["engine"] == "faster-whisper"
+    assert config["compute_type"] == asr_backends.ASR_COMPUTE_TYPE
@@ -0,0 +1,133 @@
+from concurrent.futures import Future
+
+import numpy as np
+
+from app.services import asr_service
+from app.services.asr_service import find_split_points, stitch_segments
+from app.utils.audio_utils import AudioBuffer
+
+
+def test_split_points_land_in_silence():
+    sr = 1000
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(-0.5, 0.5, 95 * sr).astype(np.float32)
+    # quiet gaps near (not exactly at) the 30 s marks
+    for gap in (27.0, 58.5):
+        samples[int(gap * sr): int((gap + 0.5) * sr)] = 0.0
+
+    cuts = find_split_points(samples, sr, chunk_seconds=30, search_seconds=5)
+
+    assert cuts[0] == 0 and cuts[-1] == len(samples)
+    assert 27.0 * sr <= cuts[1] < 27.5 * sr
+    assert 58.5 * sr <= cuts[2] < 59.0 * sr
+    assert all(b > a for a, b in zip(cuts, cuts[1:]))
+
+
+def test_max_seconds_caps_every_piece():
+    sr = 1000
+    samples = np.random.default_rng(1).uniform(-0.5, 0.5, 200 * sr).astype(np.float32)
+    # the quietest spot after the first mark is past the cap
+    samples[int(31.0 * sr): int(31.5 * sr)] = 0.0
+
+    cuts = find_split_points(samples, sr, chunk_seconds=28, search_seconds=5, max_seconds=28)
+
+    assert cuts[0] == 0 and cuts[-1] == len(samples)
+    assert all(0 < b - a <= 28 * sr for a, b in zip(cuts, cuts[1:]))
+
+
+def test_long_audio_windows_fit_whisper_input(monkeypatch):
+    sr = 16000
+    audio = AudioBuffer(np.random.default_rng(2).uniform(-0.5, 0.5, 130 * sr).astype(np.float32), sr)
+    windows = []
+
+    class InlinePool:
+        def submit(self, fn, piece, model_name, language):
+            windows.append(len(piece) / sr)
+            future = Future()
+            future.set_result({"language": "en", "segments": []})
+            return future
+
+    monkeypatch.setattr(asr_service, "_get_pool", lambda model_name: InlinePool())
+    asr_service.transcribe_long(audio)
+
+    assert len(windows) > 4
+    assert max(windows) <= asr_service.CHUNK_SECONDS
+
+
+def test_broken_pool_is_replaced_and_retried(monkeypatch):
+    from concurrent.futures.process import BrokenProcessPool
+
+    sr = 16000
+    audio = AudioBuffer(np.zeros(60 * sr, dtype=np.float32), sr)
+    created = []
+
+    class Executor:
+        def __init__(self, **kwargs):
+            self.broken = not created          # the first pool has lost a worker
+            self.shut = False
+            created.append(self)
+
+        def submit(self, fn, *args):
+            if self.broken:
+                raise BrokenProcessPool("worker died")
+            future = Future()
+            future.set_result({"language": "en", "segments": []})
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut = True
+
+    monkeypatch.setattr(asr_service, "ProcessPoolExecutor", Executor)
+    monkeypatch.setattr(asr_service, "_pools", {})
+
+    _, meta = asr_service.transcribe_long(audio)
+
+    assert meta["language"] == "en"
+    assert len(created) == 2 and created[0].shut
+    assert list(asr_service._pools.values()) == [created[1]]
+
+
+def test_pools_are_kept_per_model(monkeypatch):
+    started = []
+
+    class FakeExecutor:
+        def __init__(self, **kwargs):
+            self.initargs = kwargs["initargs"]
+            started.append(self)
+
+        def shutdown(self, wait=True):
+            raise AssertionError("a pool in use was shut down")
+
+    monkeypatch.setattr(asr_service, "ProcessPoolExecutor", FakeExecutor)
+    monkeypatch.setattr(asr_service, "_pools", {})
+
+    base = asr_service._get_pool("base")
+    small = asr_service._get_pool("small")
+    assert base is not small
+    assert asr_service._get_pool("base") is base
+    assert [p.initargs[0] for p in started] == ["base", "small"]
+
+
+def test_short_audio_is_not_split():
+    assert find_split_points(np.zeros(10 * 16000, dtype=np.float32), 16000) == [0, 160000]
+
+
+def test_stitch_shifts_times_and_drops_overlap():
+    # chunk 0: core 0-30, transcribed 0-31; chunk 1: core 30-60, transcribed 29-60
+    windows = [(0.0, 0.0, 30.0, 31.0), (29.0, 30.0, float("inf"), 60.0)]
+    results = [
+        {"segments": [
+            {"start": 0.0, "end": 10.0, "text": " hello"},
+            {"start": 29.2, "end": 30.9, "text": " at the cut"},   # midpoint 30.05 -> chunk 1
+        ]},
+        {"segments": [
+            {"start": 0.2, "end": 1.9, "text": " at the cut"},     # 29.2-30.9 after shift
+            {"start": 5.0, "end": 8.0, "text": " world"},
+        ]},
+    ]
+
+    segs = stitch_segments(results, windows)
+
+    assert [s["text"] for s in segs] == [" hello", " at the cut", " world"]
+    assert segs[1]["start"] == 29.2 and segs[2]["start"] == 34.0
+    assert [s["id"] for s in segs] == [0, 1, 2]
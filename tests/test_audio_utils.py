@@ -0,0 +1,119 @@
+import shutil
+import subprocess
+import wave
+
+import numpy as np
+import pytest
+
+from app.utils import audio_utils
+from app.utils.audio_utils import AudioTooLongError, _is_pcm16_mono_wav, decode_audio
+
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+def _write_wav(path, seconds, sr=16000, channels=1):
+    n = int(seconds * sr)
+    tone = 0.3 * np.sin(2 * np.pi * 220 * np.arange(n) / sr)
+    pcm = (np.repeat(tone[:, None], channels, axis=1) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(pcm.tobytes())
+    return str(path)
+
+
+@pytest.fixture
+def ffmpeg_calls(monkeypatch):
+    calls = []
+    run = subprocess.run
+
+    def counting(cmd, *args, **kwargs):
+        calls.append(cmd)
+        return run(cmd, *args, **kwargs)
+
+    monkeypatch.setattr(audio_utils.subprocess, "run", counting)
+    return calls
+
+
+def test_pcm16_mono_wav_skips_ffmpeg(tmp_path, ffmpeg_calls):
+    path = _write_wav(tmp_path / "call.wav", 1.5)
+    assert _is_pcm16_mono_wav(path, 16000)
+
+    audio = decode_audio(path)
+    assert ffmpeg_calls == []
+    assert audio.sr == 16000 and audio.path == path
+    assert audio.samples.dtype == np.float32
+    assert audio.duration == pytest.approx(1.5)
+
+
+@needs_ffmpeg
+@pytest.mark.parametrize("sr, channels", [(16000, 2), (44100, 1)])
+def test_other_wavs_are_piped_through_ffmpeg(tmp_path, ffmpeg_calls, monkeypatch, sr, channels):
+    monkeypatch.setattr(audio_utils, "DECODE_MODE", "memory")
+    path = _write_wav(tmp_path / "call.wav", 1.0, sr=sr, channels=channels)
+    assert not _is_pcm16_mono_wav(path, 16000)
+
+    audio = decode_audio(path)
+    assert len(ffmpeg_calls) == 1 and ffmpeg_calls[0][-1] == "pipe:1"
+    assert audio.sr == 16000 and audio.path is None
+    assert audio.duration == pytest.approx(1.0, abs=0.01)
+
+
+def test_not_a_wav_is_not_mistaken_for_pcm16(tmp_path):
+    path = tmp_path / "call.mp3"
+    path.write_bytes(b"ID3\x03\x00\x00\x00" + b"\x00" * 64)
+    assert not _is_pcm16_mono_wav(str(path), 16000)
+
+
+@needs_ffmpeg
+@pytest.mark.parametrize("sr", [16000, 44100])
+def test_audio_over_max_seconds_is_rejected(tmp_path, sr):
+    path = _write_wav(tmp_path / "long.wav", 3.0, sr=sr)
+    with pytest.raises(AudioTooLongError):
+        decode_audio(path, max_seconds=2.0)
+    assert decode_audio(path, max_seconds=5.0).duration == pytest.approx(3.0, abs=0.01)
+
+
+def test_one_decode_shared_by_gender_emotion_and_diarization(tmp_path, monkeypatch):
+    from app.services import diarization_service
+    from app.services.emotion_service import EmotionService
+    from app.services.gender_service import GenderService
+
+    decodes = []
+    for name in ("load_audio", "_read_pcm16_wav", "decode_to_buffer"):
+        original = getattr(audio_utils, name)
+        monkeypatch.setattr(
+            audio_utils, name, lambda *a, _f=original, _n=name, **kw: decodes.append(_n) or _f(*a, **kw)
+        )
+
+    class Turn:
+        def __init__(self, start, end):
+            self.start, self.end = start, end
+
+    class FakePyannote:
+        def __call__(self, inputs, **kwargs):
+            self.inputs = inputs
+            return self
+
+        def itertracks(self, yield_label=False):
+            yield Turn(0.0, 1.0), None, "SPEAKER_00"
+            yield Turn(1.0, 2.0), None, "SPEAKER_01"
+
+    pyannote = FakePyannote()
+    monkeypatch.setattr(diarization_service, "load_diarization_pipeline", lambda: pyannote)
+
+    audio = decode_audio(_write_wav(tmp_path / "call.wav", 2.0))
+    assert np.shares_memory(audio.slice(0.5, 1.5), audio.samples)
+
+    segments = diarization_service.diarize_audio(audio)
+    assert np.shares_memory(pyannote.inputs["waveform"].numpy(), audio.samples)
+
+    segments = [dict(s, text="thanks for calling") for s in segments]
+    GenderService.add_gender_to_segments(segments, audio, mode="segment")
+    GenderService.add_gender_to_segments(segments, audio, mode="speaker")
+    EmotionService.analyze_speaker_segments(audio, segments)
+
+    assert decodes == ["_read_pcm16_wav"]
+    assert all("gender" in s for s in segments)
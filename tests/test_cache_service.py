@@ -0,0 +1,60 @@
+import numpy as np
+
+from app.services.cache_service import CacheScope, ResultCache, pipeline_fingerprint
+from app.services.job_service import JobStore
+from app.services.keyword_service import KeywordService
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.db"), max_bytes=600)
+    payload = {"text": "x" * 2000}  # compresses to a few dozen bytes
+
+    for i in range(30):
+        cache.put(f"k{i}", "asr", {**payload, "i": i})
+        cache.get("k0")  # keep k0 hot
+
+    assert cache.total_bytes() <= 600
+    assert cache.get("k0") is not None
+    assert cache.get("k1") is None
+    assert cache.get("k29")["i"] == 29
+
+
+def test_scope_memoizes_per_audio_hash(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.db"), max_bytes=1 << 20)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["text", {"segments": []}]
+
+    scope = CacheScope(cache, "abc")
+    assert scope.memoize("asr", "fp", compute) == ["text", {"segments": []}]
+    assert scope.memoize("asr", "fp", compute) == ["text", {"segments": []}]
+    assert len(calls) == 1
+
+    # a different config fingerprint or audio hash is a different entry
+    scope.memoize("asr", "fp2", compute)
+    CacheScope(cache, "def").memoize("asr", "fp", compute)
+    assert len(calls) == 3
+
+    # no hash -> no caching
+    CacheScope(cache, None).memoize("asr", "fp", compute)
+    assert len(calls) == 4
+
+    # a value the caller marks as not cacheable is returned but not stored
+    scope.memoize("diarization", "fp", compute, cacheable=lambda value: False)
+    scope.memoize("diarization", "fp", compute, cacheable=lambda value: False)
+    assert len(calls) == 6
+
+
+def test_fingerprint_follows_keyword_models(monkeypatch):
+    before = pipeline_fingerprint()
+    monkeypatch.setattr(KeywordService, "SBERT_MODEL", "sentence-transformers/all-mpnet-base-v2")
+    assert pipeline_fingerprint() != before
+
+
+def test_job_results_store_numpy_values(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.create("j1", "a.wav", "/tmp/a.wav")
+    store.set_result("j1", {"score": np.float32(0.5), "pitch": np.array([110.0, 220.0]), "n": np.int64(3)})
+    assert store.get_result("j1") == {"score": 0.5, "pitch": [110.0, 220.0], "n": 3}
@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.fact_store import FactStore, FactStoreError, HTTPFactStore, SQLiteFactStore
+from app.services.factcheck_service import FactCheckService
+
+
+FACTS = [
+    {"kind": "claim", "subject": "refund days", "statement": "Refunds are accepted within 30 days of purchase.",
+     "value": "30", "source": "policy.md"},
+    {"kind": "claim", "subject": "premium plan", "statement": "The premium plan costs 49 dollars a month.",
+     "value": "49", "source": "pricing.md"},
+    {"kind": "domain", "subject": "example.com", "statement": "Official company website.", "value": "trusted"},
+    {"kind": "domain", "subject": "phish.example.net", "statement": "Known phishing host.", "value": "untrusted"},
+]
+
+
+def _store(tmp_path):
+    store = SQLiteFactStore(str(tmp_path / "facts.db"))
+    store.add_facts(FACTS)
+    return store
+
+
+def test_batched_lookup_matches_claims_and_domains(tmp_path):
+    store = _store(tmp_path)
+    results = store.lookup(
+        [
+            {"kind": "claim", "key": "You can get a refund within 60 days"},
+            {"kind": "domain", "key": "www.example.com"},
+            {"kind": "claim", "key": "The premium plan is 49 a month"},
+            {"kind": "claim", "key": "We shipped 3 days ago"},       # shares "days" only
+            {"kind": "domain", "key": "unknown.org"},
+        ]
+    )
+    assert [r and r["subject"] for r in results] == [
+        "refund days", "example.com", "premium plan", None, None,
+    ]
+    assert store.config()["version"] == "4"
+
+
+def test_fact_check_verdicts(tmp_path):
+    transcript = (
+        "Refunds are possible within 60 days. The premium plan costs 49 dollars. "
+        "See https://phish.example.net/login for details. I have 2 kids at home."
+    )
+    checks = FactCheckService.verify(FactCheckService.extract_candidates(transcript), store=_store(tmp_path))
+    by_value = {c["value"]: c for c in checks}
+
+    assert by_value["Refunds are possible within 60 days."]["status"] == "CONTRADICTED"
+    assert by_value["Refunds are possible within 60 days."]["evidence"].startswith("Refunds are accepted")
+    assert by_value["The premium plan costs 49 dollars."]["status"] == "SUPPORTED"
+    assert by_value["https://phish.example.net/login"]["status"] == "CONTRADICTED"
+    assert by_value["I have 2 kids at home."]["status"] == "TO_VERIFY"
+    assert all(c["status"] == "TO_VERIFY" for c in checks if c["type"] == "number")
+
+
+def test_one_store_call_per_transcript_and_async_entry_point():
+    class CountingStore(FactStore):
+        name = "counting"
+        calls = []
+
+        def lookup(self, queries):
+            self.calls.append(len(queries))
+            return [None] * len(queries)
+
+    store = CountingStore()
+    text = "It costs 10 dollars. Delivery takes 5 days. Visit https://a.example.org today."
+    checks = FactCheckService.verify(FactCheckService.extract_candidates(text), store=store)
+    assert store.calls == [3]
+    assert all(c["status"] == "TO_VERIFY" for c in checks)
+    assert asyncio.run(store.alookup([{"kind": "claim", "key": "x y"}])) == [None]
+
+
+@pytest.mark.parametrize("reply", [
+    lambda request: httpx.Response(503),
+    lambda request: (_ for _ in ()).throw(httpx.ConnectError("refused", request=request)),
+])
+def test_remote_store_failure_leaves_candidates_unverified(reply):
+    store = HTTPFactStore(url="http://facts.invalid", timeout=1.0)
+    store._client = httpx.AsyncClient(base_url=store.url, transport=httpx.MockTransport(reply))
+
+    with pytest.raises(FactStoreError):
+        store.lookup([{"kind": "claim", "key": "refund within 60 days"}])
+
+    text = "Refunds are possible within 60 days. See https://example.com/help."
+    checks = FactCheckService.verify(FactCheckService.extract_candidates(text), store=store)
+    assert checks and all(c["status"] == "TO_VERIFY" for c in checks)
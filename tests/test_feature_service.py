@@ -0,0 +1,64 @@
+import numpy as np
+
+from app.services.emotion_service import EmotionService
+from app.services.feature_service import extract_features
+from app.services.gender_service import GenderService
+from app.utils.audio_utils import AudioBuffer
+
+
+SR = 16000
+
+
+def _tone(f0, seconds, amp=0.3):
+    return (amp * np.sin(2 * np.pi * f0 * np.arange(int(seconds * SR)) / SR)).astype(np.float32)
+
+
+def test_blocks_do_not_change_values():
+    rng = np.random.default_rng(3)
+    audio = AudioBuffer(np.concatenate([_tone(140, 3), 0.05 * rng.standard_normal(SR * 2).astype(np.float32)]), SR)
+
+    whole = extract_features(audio, block_seconds=3600)
+    blocked = extract_features(audio, block_seconds=0.7)
+
+    assert len(whole) == len(blocked) == 1 + len(audio.samples) // 256
+    for name in ("f0", "rms", "mfcc", "centroid", "voiced"):
+        np.testing.assert_allclose(getattr(whole, name), getattr(blocked, name), rtol=1e-4, atol=1e-4)
+
+
+def test_slices_are_views_indexed_by_time():
+    audio = AudioBuffer(np.concatenate([_tone(120, 2), _tone(220, 2)]), SR)
+    feats = extract_features(audio)
+
+    window = feats.slice(2.5, 3.5)
+
+    assert np.shares_memory(window.rms, feats.rms)
+    assert abs(len(window) - SR / 256) <= 1
+    assert abs(np.median(window.voiced_f0) - 220) < 5
+
+
+def test_gender_and_emotion_reuse_features(monkeypatch):
+    audio = AudioBuffer(
+        np.concatenate([_tone(120, 2), _tone(220, 2), _tone(120, 2, amp=0.9), _tone(220, 2), _tone(120, 2)]), SR
+    )
+    segments = [
+        {"start": 0, "end": 2, "speaker": "A", "text": "ok", "sentiment": "negative"},
+        {"start": 2, "end": 4, "speaker": "B", "text": "ok"},
+        {"start": 4, "end": 6, "speaker": "A", "text": "ok", "sentiment": "negative"},
+        {"start": 6, "end": 8, "speaker": "B", "text": "ok"},
+        {"start": 8, "end": 10, "speaker": "A", "text": "ok", "sentiment": "negative"},
+    ]
+    feats = extract_features(audio)
+    monkeypatch.setattr(GenderService, "_estimate_pitch_fast", staticmethod(lambda *a: 1 / 0))
+
+    gendered = GenderService.add_gender_to_segments([dict(s) for s in segments], audio, features=feats)
+    analyzed = EmotionService.analyze_speaker_segments(audio, segments, features=feats, relabel=True)
+
+    assert [s["gender"] for s in gendered] == ["male", "female", "male", "female", "male"]
+    assert analyzed[2]["emotion"] == "angry"          # ~9.5 dB louder than A's usual
+    assert analyzed[0]["emotion"] == "sad"
+    assert analyzed[1]["emotion"] == "neutral"
+
+    # by default arousal is reported but does not change the label
+    default = EmotionService.analyze_speaker_segments(audio, segments, features=feats)
+    assert default[2]["emotion"] == "sad"
+    assert default[2]["arousal"] == analyzed[2]["arousal"] > EmotionService.AROUSAL_THRESHOLD
@@ -0,0 +1,53 @@
+import numpy as np
+
+from app.services.gender_service import GenderService
+from app.utils.audio_utils import AudioBuffer
+
+
+SR = 16000
+
+
+def _call(layout):
+    """layout: [(speaker, f0 Hz, seconds)] -> (AudioBuffer, segments)"""
+    pieces, segments, t = [], [], 0.0
+    for speaker, f0, seconds in layout:
+        n = int(seconds * SR)
+        pieces.append(0.3 * np.sin(2 * np.pi * f0 * np.arange(n) / SR).astype(np.float32))
+        segments.append({"start": t, "end": t + seconds, "speaker": speaker})
+        t += seconds
+    return AudioBuffer(np.concatenate(pieces), SR), segments
+
+
+def test_one_estimate_per_speaker_broadcast_to_segments(monkeypatch):
+    audio, segments = _call(
+        [("A", 120, 2.0), ("B", 220, 1.5), ("A", 120, 1.0), ("B", 220, 2.0), ("A", 120, 0.2)]
+    )
+    calls = []
+    original = GenderService._estimate_pitch_fast
+
+    def counting(samples, sr):
+        calls.append(len(samples))
+        return original(samples, sr)
+
+    monkeypatch.setattr(GenderService, "_estimate_pitch_fast", staticmethod(counting))
+
+    out = GenderService.add_gender_to_segments([dict(s) for s in segments], audio, mode="speaker")
+
+    assert len(calls) == 2
+    assert [s["gender"] for s in out] == ["male", "female", "male", "female", "male"]
+
+
+def test_sample_is_bounded_per_speaker():
+    audio, segments = _call([("A", 120, 4.0), ("A", 120, 3.0), ("A", 120, 2.0)])
+
+    sample = GenderService._sample_speaker_audio(audio, segments, max_seconds=5.0)
+
+    assert len(sample) == 5 * SR
+
+
+def test_segment_mode_still_available():
+    audio, segments = _call([("A", 120, 1.0), ("B", 220, 1.0)])
+
+    out = GenderService.add_gender_to_segments([dict(s) for s in segments], audio, mode="segment")
+
+    assert [s["gender"] for s in out] == ["male", "female"]
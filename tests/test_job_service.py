@@ -0,0 +1,25 @@
+import os
+import time
+
+from app.services.job_service import FAILED, JobStore
+
+
+def test_finished_jobs_pruned_after_ttl(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"), ttl_seconds=3600)
+    upload_dir = tmp_path / "failed"
+    upload_dir.mkdir()
+    (upload_dir / "input.wav").write_bytes(b"RIFF")
+
+    store.create("done", "a.wav", str(tmp_path / "done" / "input.wav"))
+    store.set_result("done", {"transcript": "hello"})
+    store.create("failed", "b.wav", str(upload_dir / "input.wav"))
+    store.set_status("failed", FAILED, error="boom")
+    store.create("queued", "c.wav", str(tmp_path / "queued" / "input.wav"))
+
+    # nothing is old enough yet
+    assert store.prune() == 0
+    assert store.prune(now=time.time() + 7200) == 2
+
+    assert store.get("done") is None and store.get("failed") is None
+    assert store.get("queued") is not None               # unfinished jobs are kept
+    assert not os.path.exists(upload_dir)                 # failed job's upload removed
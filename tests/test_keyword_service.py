@@ -0,0 +1,109 @@
+import zlib
+
+import numpy as np
+import pytest
+import torch
+
+from app.services.keyword_service import KeywordService
+
+
+STOP = {"the", "a", "my", "is", "was", "and", "to", "for", "about", "i", "we"}
+
+
+class Token:
+    def __init__(self, text):
+        self.text = text
+        self.is_alpha = text.isalpha()
+        self.is_stop = text.lower() in STOP
+        self.pos_ = "VERB" if text.endswith("ed") or self.is_stop else "NOUN"
+
+
+class Span:
+    def __init__(self, text):
+        self.text = text
+
+
+class Doc(list):
+    def __init__(self, text):
+        super().__init__(Token(w) for w in text.replace(",", " ").replace(".", " ").split())
+        nouns = [t.text for t in self if t.pos_ == "NOUN"]
+        self.noun_chunks = [Span(" ".join(nouns[i:i + 2])) for i in range(0, len(nouns) - 1, 2)]
+
+
+class FakeSpacy:
+    def __init__(self):
+        self.pipe_calls = 0
+
+    def pipe(self, texts, batch_size=None):
+        self.pipe_calls += 1
+        return [Doc(t) for t in texts]
+
+
+class FakeSBERT:
+    """Bag-of-words embedding: hashed word counts, L2-normalized."""
+
+    def __init__(self):
+        self.encode_calls = []
+
+    def _vec(self, text):
+        v = np.zeros(64, dtype=np.float32)
+        for w in text.lower().split():
+            v[zlib.crc32(w.encode()) % 64] += 1.0
+        return v / (np.linalg.norm(v) or 1.0)
+
+    def encode(self, texts, convert_to_tensor=False, batch_size=None):
+        self.encode_calls.append(len(texts))
+        arr = np.stack([self._vec(t) for t in texts]) if texts else np.zeros((0, 64), np.float32)
+        return torch.from_numpy(arr) if convert_to_tensor else arr
+
+
+@pytest.fixture
+def models(monkeypatch):
+    nlp, sbert = FakeSpacy(), FakeSBERT()
+    monkeypatch.setattr(KeywordService, "_load_spacy", classmethod(lambda cls: nlp))
+    monkeypatch.setattr(KeywordService, "_load_sbert", classmethod(lambda cls: sbert))
+    return nlp, sbert
+
+
+TEXTS = [
+    "My invoice shows a duplicate payment charge",
+    "",
+    "The router restarted and the wifi signal dropped",
+    "   ",
+    "We talked about refund policy and refund timing",
+]
+
+
+def test_one_pass_keywords_in_input_order(models):
+    nlp, sbert = models
+    keywords = KeywordService.extract_keywords_batch(TEXTS, top_k=3)
+
+    assert nlp.pipe_calls == 1 and len(sbert.encode_calls) == 1
+    assert keywords[1] == [] and keywords[3] == []
+    assert all(0 < len(kw) <= 3 for kw in (keywords[0], keywords[2], keywords[4]))
+    assert any("invoice" in phrase or "payment" in phrase for phrase in keywords[0])
+    assert any(w in phrase for phrase in keywords[2] for w in ("router", "wifi", "signal"))
+    assert any("refund" in phrase for phrase in keywords[4])
+    # each text's keywords come from its own candidates
+    for text, kw in zip(TEXTS, keywords):
+        assert all(w in text.lower() for phrase in kw for w in phrase.split())
+
+
+def test_empty_inputs(models):
+    nlp, sbert = models
+    assert KeywordService.extract_keywords_batch([]) == []
+    assert KeywordService.extract_keywords_batch(["", "  "]) == [[], []]
+    assert nlp.pipe_calls == 0 and sbert.encode_calls == []
+
+
+def test_precomputed_text_embeddings_match_default_path(models):
+    _, sbert = models
+    default = KeywordService.extract_keywords_batch(TEXTS, top_k=4)
+
+    embeddings = KeywordService.embed_texts(TEXTS)
+    sbert.encode_calls.clear()
+    precomputed = KeywordService.extract_keywords_batch(TEXTS, top_k=4, text_embeddings=embeddings)
+
+    assert precomputed == default
+    # only the candidate phrases were encoded this time
+    assert len(sbert.encode_calls) == 1
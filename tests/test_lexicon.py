@@ -0,0 +1,61 @@
+import json
+
+from app.services.emotion_service import EmotionService
+from app.services.flag_service import FlagService
+from app.services.intent_service import IntentService
+from app.utils.lexicon import LexiconMatcher, load_lexicons
+
+
+def test_whole_word_matches_with_positions():
+    m = LexiconMatcher({"hes": ["er", "you know", "..."], "ok": ["ok", "okay"]})
+
+    assert m.find("I never read that book") == ()
+    assert m.find("Okay, er... you   know") == (
+        ("okay", 0, 4, ("ok",)),
+        ("er", 6, 8, ("hes",)),
+        ("...", 8, 11, ("hes",)),
+        ("you know", 12, 22, ("hes",)),
+    )
+    assert set(m.categories("ok then")) == {"ok"}
+
+
+def test_longest_phrase_wins_and_shared_phrases_keep_all_categories():
+    m = LexiconMatcher({"a": ["thank", "thank you"], "b": ["thank you"]})
+    hits = m.find("thank you so much")
+    assert [(h.phrase, h.categories) for h in hits] == [("thank you", ("a", "b"))]
+
+
+def test_many_phrases_compile_into_one_pattern():
+    phrases = [f"phrase{i} word" for i in range(5000)]
+    m = LexiconMatcher({"big": phrases})
+    hits = m.find("nothing here, then phrase4321 word and phrase43 words")
+    assert [h.phrase for h in hits] == ["phrase4321 word"]
+
+
+def test_custom_lexicon_file_replaces_categories(tmp_path):
+    path = tmp_path / "lexicon.json"
+    path.write_text(json.dumps({"flag.hesitation": ["hmm"], "custom": ["escalate"]}))
+    lexicons = load_lexicons(str(path))
+    assert lexicons["flag.hesitation"] == ["hmm"]
+    assert lexicons["custom"] == ["escalate"]
+    assert "sorry" in lexicons["intent.apology"]
+
+
+def test_services_no_longer_match_inside_words():
+    # "er" in "never", "ah" in "yeah", "ok" in "book", "mad" in "made", "hi" in "history"
+    assert FlagService.generate_flags([{"text": "I never said yeah"}]) == []
+    assert IntentService.classify_utterance("I made the book order") == "other"
+    assert IntentService.classify_utterance("history of the account is long and boring") == "information_sharing"
+    assert EmotionService._fallback_from_text_segment({"text": "I made it", "sentiment": "neutral"})["emotion"] == "neutral"
+
+
+def test_services_keep_their_rules():
+    assert IntentService.classify_utterance("Hey, how are you") == "greeting"
+    assert IntentService.classify_utterance("Is that right?") == "question"
+    assert IntentService.classify_utterance("ok, that works") == "agreement"
+    assert IntentService.classify_utterance("well thank you, bye") == "gratitude"
+
+    types = [f["type"] for f in FlagService.generate_flags([{"text": "Um, I think I always pay, you idiot"}])]
+    assert types == ["hesitation", "aggression", "lie_risk"]
+
+    assert EmotionService._fallback_from_text_segment({"text": "So sorry", "sentiment": "neutral"})["emotion"] == "sad"
@@ -0,0 +1,66 @@
+import random
+
+from app.services.metadata_service import (
+    ConversationStatsAccumulator,
+    MetadataExtractor,
+    SpeakerStatsAccumulator,
+)
+
+
+def _segments(n, seed=5):
+    rng = random.Random(seed)
+    segs, t = [], 0.0
+    for _ in range(n):
+        dur = round(rng.uniform(0.5, 8.0), 2)
+        segs.append({
+            "start": t, "end": round(t + dur, 2),
+            "speaker": rng.choice(["SPEAKER_00", "SPEAKER_01", "SPEAKER_02"]),
+            "text": " ".join("w" for _ in range(rng.randint(0, 20))),
+        })
+        t = round(t + dur + rng.uniform(0, 1), 2)
+    return segs
+
+
+def _close(a, b):
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_close(a[k], b[k]) for k in a)
+    if isinstance(a, float):
+        return abs(a - b) < 1e-9
+    return a == b
+
+
+def test_merged_chunks_equal_single_pass():
+    segs = _segments(200)
+    whole_spk = MetadataExtractor.compute_speaker_stats(segs)
+    whole_conv = MetadataExtractor.compute_conversation_stats(segs, segs)
+
+    spk, conv = SpeakerStatsAccumulator(), ConversationStatsAccumulator()
+    for lo in range(0, 200, 37):
+        part_spk, part_conv = SpeakerStatsAccumulator(), ConversationStatsAccumulator()
+        for seg in segs[lo:lo + 37]:
+            part_spk.add(seg)
+            part_conv.add(seg).add_diarization(seg)
+        spk.merge(part_spk)
+        conv.merge(part_conv)
+
+    assert _close(spk.result(), whole_spk)
+    assert _close(conv.result(), whole_conv)
+
+
+def test_result_available_midway():
+    segs = _segments(10)
+    acc = SpeakerStatsAccumulator()
+    for i, seg in enumerate(segs, 1):
+        acc.add(seg)
+        assert _close(acc.result(), MetadataExtractor.compute_speaker_stats(segs[:i]))
+
+
+def test_conversation_span_does_not_assume_sorted_diarization():
+    segs = _segments(20)
+    shuffled = list(segs)
+    random.Random(1).shuffle(shuffled)
+
+    stats = MetadataExtractor.compute_conversation_stats(segs, shuffled)
+
+    assert stats["conversation_start"] == segs[0]["start"]
+    assert stats["conversation_end"] == segs[-1]["end"]
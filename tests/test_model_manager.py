@@ -0,0 +1,85 @@
+import torch
+
+from app.utils.model_manager import ModelManager
+
+
+def _net(n):
+    # n float32 params -> 4n bytes
+    return torch.nn.Linear(n, 1, bias=False)
+
+
+def test_models_keyed_by_name_and_config():
+    manager = ModelManager()
+    loads = []
+
+    def loader(size):
+        def load():
+            loads.append(size)
+            return object()
+        return load
+
+    base = manager.get("asr", loader("base"), {"model": "base"})
+    assert manager.get("asr", loader("base"), {"model": "base"}) is base
+    small = manager.get("asr", loader("small"), {"model": "small"})
+
+    assert small is not base
+    assert loads == ["base", "small"]
+
+
+def test_lru_eviction_over_budget():
+    manager = ModelManager(budget_bytes=4 * 2500)
+    manager.get("a", lambda: _net(1000))
+    manager.get("b", lambda: _net(1000))
+    manager.get("a", lambda: _net(1000))          # a is now most recent
+    manager.get("c", lambda: _net(1000))          # 12 kB > 10 kB -> drop b
+
+    assert [m["name"] for m in manager.stats()] == ["a", "c"]
+    assert manager.total_bytes() == 8000
+
+
+def test_idle_models_unloaded():
+    manager = ModelManager(idle_ttl=60)
+    manager.get("old", object)
+    manager.get("new", object)
+    manager._entries[manager.make_key("old")].last_used -= 120
+
+    assert manager.evict_idle() == 1
+    assert [m["name"] for m in manager.stats()] == ["new"]
+
+
+def test_rss_fallback_only_for_loads_that_ran_alone(monkeypatch):
+    import threading
+
+    from app.utils import model_manager
+
+    rss = [1000]
+    monkeypatch.setattr(model_manager, "_rss_bytes", lambda: rss[0])
+    manager = ModelManager()
+
+    def grow(n):
+        rss[0] += n
+        return object()                          # no .parameters: size comes from RSS
+
+    manager.get("alone", lambda: grow(500))
+    assert manager.total_bytes() == 500
+
+    # two overlapping loads: each would see both allocations in its RSS delta
+    both_started = threading.Barrier(2)
+
+    def overlapping(n):
+        def load():
+            both_started.wait()
+            return grow(n)
+        return load
+
+    threads = [
+        threading.Thread(target=manager.get, args=(name, overlapping(n)))
+        for name, n in (("x", 300), ("y", 700))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert {m["name"] for m in manager.stats()} == {"alone", "x", "y"}
+    assert manager.total_bytes() == 500           # x and y are not double-counted
@@ -0,0 +1,69 @@
+import pytest
+
+from app.services.sentiment_service import SentimentService
+
+
+class FakePipeline:
+    """Scores are spelled out in the text: 'great 0.95' -> positive 0.95."""
+
+    def __init__(self):
+        self.batches = []
+
+    def _one(self, text):
+        if "boom" in text:
+            raise RuntimeError("bad input")
+        label = "negative" if "awful" in text else "positive" if "great" in text else "neutral"
+        score = next((float(w) for w in text.split() if w.replace(".", "").isdigit()), 0.9)
+        return {"label": label.upper()[:3], "score": score}
+
+    def __call__(self, inputs, batch_size=None, truncation=False):
+        if isinstance(inputs, str):
+            return [self._one(inputs)]
+        self.batches.append(list(inputs))
+        return [self._one(text) for text in inputs]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pip = FakePipeline()
+    monkeypatch.setattr(SentimentService, "_load_pipeline", classmethod(lambda cls: pip))
+    return pip
+
+
+def test_batches_are_length_sorted_and_results_keep_input_order(pipeline):
+    texts = [
+        "this was a really great call with the support team 0.95",
+        "",
+        "the wait was awful today 0.9",
+        "   ",
+        "great service from the agent 0.99",
+    ]
+    results = SentimentService.analyze_texts(texts, batch_size=2)
+
+    sent = [t for batch in pipeline.batches for t in batch]
+    assert sent == sorted(sent, key=len)
+    assert [len(b) for b in pipeline.batches] == [2, 1]
+    assert [r["label"] for r in results] == ["positive", "neutral", "negative", "neutral", "positive"]
+    assert [r["score"] for r in results] == [0.95, 0.0, 0.9, 0.0, 0.99]
+
+
+def test_short_text_and_low_confidence_rules(pipeline):
+    results = SentimentService.analyze_texts([
+        "great 0.7",                               # short, not confident -> neutral
+        "great 0.85",                              # short, confident -> kept
+        "that was a great answer 0.6",             # below the positive/negative threshold
+        "that was an awful answer overall 0.45",   # very low confidence
+        "that was an awful answer overall 0.7",
+    ])
+    assert [r["label"] for r in results] == ["neutral", "positive", "neutral", "neutral", "negative"]
+    assert results[0]["score"] == 0.7
+
+
+def test_failed_batch_falls_back_to_one_by_one(pipeline):
+    texts = ["a great call overall 0.9", "boom goes the model", "an awful call overall 0.9"]
+    results = SentimentService.analyze_texts(texts)
+
+    assert len(pipeline.batches) == 1
+    assert results[0]["label"] == "positive"
+    assert results[1] == {"label": "neutral", "score": 0.0}
+    assert results[2]["label"] == "negative"
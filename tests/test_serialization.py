@@ -0,0 +1,70 @@
+import json
+
+import msgpack
+import numpy as np
+
+from app.routes.process_audio import ProcessAudioResponse
+from app.utils.serialization import encode, fast_response, project, select
+
+
+def _payload(turns=3):
+    segs = [
+        {"start": float(i), "end": i + 0.9, "speaker": f"SPEAKER_0{i % 2}", "text": f"turn {i}",
+         "sentiment": "neutral", "sentiment_score": np.float32(0.5), "keywords": ["turn"],
+         "emotion": "neutral", "intent": "other"}
+        for i in range(turns)
+    ]
+    stats = {"total_speaking_time": 1.8, "segment_count": 2, "total_words": 4, "longest_monologue": 0.9,
+             "first_spoke_at": 0.0, "last_spoke_at": 2.9, "avg_segment_length": 0.9, "wpm": 120.0,
+             "speaking_ratio": 0.5, "word_ratio": 0.5}
+    return {
+        "request_id": "r1",
+        "transcript": " ".join(s["text"] for s in segs),
+        "asr_meta": {"model": "base", "language": "en", "duration": 3.0,
+                     "segments": [{"start": s["start"], "end": s["end"], "tokens": [1, 2, 3]} for s in segs]},
+        "segments": [{"start": s["start"], "end": s["end"], "speaker": s["speaker"]} for s in segs],
+        "speaker_segments": segs,
+        "conversation": segs,
+        "speaker_stats": {"SPEAKER_00": stats, "SPEAKER_01": stats},
+        "conversation_stats": {"total_duration": 3.0, "total_segments": 3, "total_words": 6,
+                               "avg_turn_length": 0.9, "speaker_count": 2,
+                               "conversation_start": 0.0, "conversation_end": 2.9},
+        "topic": {"topic": "support", "confidence": 0.8},
+        "summary": "short",
+        "flags": [],
+        "timeline": [{"start": s["start"], "end": s["end"], "intent": "other"} for s in segs],
+    }
+
+
+def test_projection_matches_validated_dump():
+    payload = _payload()
+    expected = json.loads(ProcessAudioResponse.model_validate(payload).model_dump_json())
+    got = json.loads(encode(project(ProcessAudioResponse, payload))[0])
+    assert got == expected
+    # fields the response model does not declare are dropped, as before
+    assert "emotion" not in got["speaker_segments"][0]
+
+
+def test_select_fields_exclude_and_compact():
+    payload = _payload()
+    assert select(payload, fields=["summary", "asr_meta.language"]) == {
+        "request_id": "r1", "summary": "short", "asr_meta": {"language": "en"},
+    }
+    compact = select(payload, compact=True, exclude=["transcript"])
+    assert not {"segments", "conversation", "transcript"} & set(compact)
+    assert compact["timeline"] == payload["timeline"]
+    assert "segments" not in compact["asr_meta"]
+    assert "segments" in payload["asr_meta"]          # input untouched
+
+
+def test_fast_response_encodings():
+    payload = _payload()
+    body = fast_response(ProcessAudioResponse, payload, fields=["topic", "speaker_segments"]).body
+    data = json.loads(body)
+    assert set(data) == {"request_id", "topic", "speaker_segments"}
+
+    packed = fast_response(ProcessAudioResponse, payload, accept="application/msgpack", compact=True)
+    assert packed.media_type == "application/msgpack"
+    data = msgpack.unpackb(packed.body)
+    assert data["speaker_segments"][0]["sentiment_score"] == 0.5
+    assert "conversation" not in data
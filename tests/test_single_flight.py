@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from app.utils.model_manager import ModelManager
+from app.utils.single_flight import SingleFlight
+
+
+def _hammer(fn, n=8):
+    results, errors = [], []
+    start = threading.Barrier(n)
+
+    def worker():
+        start.wait()
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_concurrent_first_requests_share_one_load():
+    manager = ModelManager()
+    calls = []
+
+    def slow_load():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results, errors = _hammer(lambda: manager.get("asr", slow_load, {"model": "base"}))
+
+    assert not errors
+    assert len(calls) == 1
+    assert len({id(r) for r in results}) == 1
+    metrics = manager.load_metrics()[0]
+    assert metrics["loads"] == 1 and metrics["coalesced"] >= 1
+
+
+def test_failure_reaches_every_waiter_then_backs_off():
+    flight = SingleFlight(attempts=2, backoff=60, sleep=lambda s: None)
+    calls = []
+
+    def broken():
+        calls.append(1)
+        time.sleep(0.05)
+        raise RuntimeError("out of memory")
+
+    results, errors = _hammer(lambda: flight.do("topic", broken))
+
+    assert not results
+    assert len(errors) == 8 and all("out of memory" in str(e) for e in errors)
+    assert len(calls) == 2                      # one attempt + one retry, shared
+
+    # still cooling down: fail fast without another load
+    with pytest.raises(RuntimeError):
+        flight.do("topic", broken)
+    assert len(calls) == 2
+    m = flight.metrics()["topic"]
+    assert (m["failures"], m["retries"]) == (1, 1)
+
+
+def test_retry_recovers_from_transient_failure():
+    flight = SingleFlight(attempts=3, backoff=0.01, sleep=lambda s: None)
+    outcomes = iter([RuntimeError("flaky"), "model"])
+
+    def load():
+        out = next(outcomes)
+        if isinstance(out, Exception):
+            raise out
+        return out
+
+    assert flight.do("sbert", load) == "model"
+    assert flight.metrics()["sbert"]["retries"] == 1
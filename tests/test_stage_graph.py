@@ -0,0 +1,62 @@
+import time
+import pytest
+from app.utils.stage_graph import Stage, StageGraph
+
+
+def _sleepy(value, delay=0.2):
+    def fn(**kwargs):
+        time.sleep(delay)
+        return value
+    return fn
+
+
+def test_independent_stages_run_concurrently():
+    graph = StageGraph(
+        [
+            Stage("a", _sleepy(1), ["src"], ["a"]),
+            Stage("b", _sleepy(2), ["src"], ["b"]),
+            Stage("sum", lambda a, b: a + b, ["a", "b"], ["total"]),
+        ],
+        max_workers=2,
+    )
+
+    t0 = time.perf_counter()
+    out, timings = graph.run({"src": None})
+    elapsed = time.perf_counter() - t0
+
+    assert out["total"] == 3
+    # a and b overlap -> roughly one delay, not two
+    assert elapsed < 0.35
+    assert {t["stage"] for t in timings} == {"a", "b", "sum"}
+    by_name = {t["stage"]: t for t in timings}
+    assert by_name["sum"]["started_at"] >= max(by_name["a"]["finished_at"], by_name["b"]["finished_at"])
+
+
+def test_multiple_outputs_and_progress_callback():
+    events = []
+    graph = StageGraph([Stage("split", lambda x: (x, x * 2), ["x"], ["one", "two"])])
+    out, _ = graph.run({"x": 3}, on_stage=lambda name, state: events.append((name, state)))
+
+    assert out["one"] == 3 and out["two"] == 6
+    assert events == [("split", "running"), ("split", "done")]
+
+
+def test_graph_validation():
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", lambda b: b, ["b"], ["a"]), Stage("b", lambda a: a, ["a"], ["b"])])
+
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", lambda: 1, [], ["x"]), Stage("b", lambda: 2, [], ["x"])])
+
+    graph = StageGraph([Stage("a", lambda y: y, ["y"], ["a"])])
+    with pytest.raises(ValueError):
+        graph.run({})
+
+
+def test_stage_failure_propagates():
+    def boom(x):
+        raise RuntimeError("nope")
+
+    graph = StageGraph([Stage("boom", boom, ["x"], ["y"])])
+    with pytest.raises(RuntimeError):
+        graph.run({"x": 1})
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import streaming_service
+from app.services.sentiment_service import SentimentService
+from app.services.streaming_service import StreamingSession
+
+
+SR = 16000
+SCRIPT = [
+    (0.5, 2.0, " Hello, I need help with my bill."),
+    (3.0, 5.0, " This is stupid, I was charged twice."),
+    (6.0, 7.5, " Thank you."),
+]
+
+
+def fake_asr(offset_ref):
+    """Transcribes whatever part of SCRIPT the window currently covers."""
+    def transcribe(samples, language=None):
+        start = offset_ref["offset"]
+        end = start + len(samples) / SR
+        segs = []
+        for s, e, text in SCRIPT:
+            if s >= start - 1e-6 and s < end:
+                # words not fully heard yet come out truncated
+                shown = text if e <= end else text[: max(1, int(len(text) * (end - s) / (e - s)))]
+                segs.append({"start": s - start, "end": min(e, end) - start, "text": shown})
+        return segs
+    return transcribe
+
+
+@pytest.fixture(autouse=True)
+def fake_sentiment(monkeypatch):
+    """Keep the RoBERTa model out of these tests, like the ASR above."""
+    def analyze_texts(texts, batch_size=None):
+        return [
+            {"label": "negative" if "stupid" in t.lower() else "neutral", "score": 0.9}
+            for t in texts
+        ]
+    monkeypatch.setattr(SentimentService, "analyze_texts", staticmethod(analyze_texts))
+
+
+def _pcm(seconds):
+    return (np.zeros(int(seconds * SR), dtype="<i2")).tobytes()
+
+
+def _session():
+    ref = {"offset": 0.0}
+    session = StreamingSession(transcribe=fake_asr(ref), step=0.5, holdback=1.0, window=15)
+
+    def sync(messages):
+        ref["offset"] = session.offset
+        return messages
+
+    return session, sync
+
+
+def test_segments_finalize_once_with_analytics():
+    session, sync = _session()
+    messages = []
+    for _ in range(18):                       # 9 s in 0.5 s frames
+        messages += sync(session.feed(_pcm(0.5)))
+    messages += session.finish()
+
+    finals = [m for m in messages if m["type"] == "final"]
+    assert [m["segment"]["text"] for m in finals] == [t.strip() for _, _, t in SCRIPT]
+    assert [m["segment"]["start"] for m in finals] == [0.5, 3.0, 6.0]
+    # first two became final while streaming, within a few seconds of speech end
+    assert all(m["lag_seconds"] < 3.0 for m in finals[:2])
+
+    assert [f["type"] for f in finals[1]["flags"]] == ["aggression"]
+    assert finals[2]["segment"]["intent"] == "gratitude"
+    assert [m["segment"]["sentiment"] for m in finals] == ["neutral", "negative", "neutral"]
+    assert any(m["type"] == "partial" for m in messages)
+    assert messages[-1]["type"] == "end" and messages[-1]["segments"] == 3
+
+
+def test_websocket_roundtrip(monkeypatch):
+    ref = {"offset": 0.0}
+    monkeypatch.setattr(streaming_service, "_default_transcribe", fake_asr(ref))
+    client = TestClient(app)
+
+    with client.websocket_connect("/v1/stream?speaker=CUSTOMER") as ws:
+        for _ in range(4):
+            ws.send_bytes(_pcm(0.5))
+        ws.send_text('{"type": "stop"}')
+        received = []
+        while True:
+            msg = ws.receive_json()
+            received.append(msg)
+            if msg["type"] == "end":
+                break
+
+    finals = [m for m in received if m["type"] == "final"]
+    assert finals[0]["segment"]["speaker"] == "CUSTOMER"
+    assert finals[0]["segment"]["text"] == "Hello, I need help with my bill."
+
+
+def test_websocket_rejects_other_sample_rates():
+    client = TestClient(app)
+    with client.websocket_connect("/v1/stream?sample_rate=8000") as ws:
+        assert ws.receive_json()["type"] == "error"
@@ -0,0 +1,82 @@
+import threading
+
+from app.services import summary_service
+from app.services.summary_service import SummaryService
+
+
+class _Tokenizer:
+    model_max_length = 1024
+
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+
+class _CharTokenizer:
+    """One token per character, so text without spaces still counts."""
+
+    def encode(self, text, add_special_tokens=False):
+        return [ord(c) for c in text if not c.isspace()]
+
+    def decode(self, ids, skip_special_tokens=False):
+        return "".join(chr(i) for i in ids)
+
+
+class _RecordingSummarizer:
+    """Keeps the first 10 words of each input and records every call."""
+    tokenizer = _Tokenizer()
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, texts, **kwargs):
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        with self.lock:
+            self.calls.append(batch)
+        return [{"summary_text": " ".join(t.split()[:10])} for t in batch]
+
+
+def test_pack_respects_budget_and_turn_boundaries():
+    tok = _Tokenizer()
+    turns = ["a " * 40, "b " * 40, "c " * 40, "d " * 250]
+
+    chunks = SummaryService._pack(tok, turns, budget=100)
+
+    assert all(len(tok.encode(c)) <= 100 for c in chunks)
+    assert chunks[0].split() == ["a"] * 40 + ["b"] * 40          # whole turns, in order
+    assert sum(len(tok.encode(c)) for c in chunks) == 370           # nothing dropped
+
+
+def test_pack_cuts_over_budget_turn_without_boundaries():
+    tok = _CharTokenizer()
+    turn = "我们的订单还没有到。" * 30 + "https://example.com/" + "1234567890" * 20
+
+    chunks = SummaryService._pack(tok, ["ok then", turn], budget=64)
+
+    assert chunks[0] == "ok then"
+    assert all(len(tok.encode(c)) <= 64 for c in chunks)
+    assert "".join(chunks[1:]) == turn
+
+
+def test_map_reduce_covers_whole_call(monkeypatch):
+    fake = _RecordingSummarizer()
+    monkeypatch.setattr(summary_service, "_get_summarizer", lambda: fake)
+    monkeypatch.setattr(summary_service, "SUMMARY_CHUNK_TOKENS", 50)
+
+    turns = [f"turn{i} " + "word " * 30 for i in range(40)]
+    summary = SummaryService.summarize_turns(turns)
+
+    mapped = [t for batch in fake.calls[:-1] for t in batch]
+    # every turn reached the map step, the last call is the single reduce
+    assert all(any(f"turn{i} " in m for m in mapped) for i in range(40))
+    assert len(fake.calls[-1]) == 1
+    assert summary
+
+
+def test_short_call_is_one_pass(monkeypatch):
+    fake = _RecordingSummarizer()
+    monkeypatch.setattr(summary_service, "_get_summarizer", lambda: fake)
+
+    SummaryService.summarize_turns(["hello there", "hi, how can I help"])
+
+    assert fake.calls == [["hello there hi, how can I help"]]
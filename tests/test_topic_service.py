@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from app.services import topic_service
+from app.services.topic_service import TopicService
+
+
+VOCAB = ["invoice", "charged", "refund", "crash", "error", "upgrade", "price", "weather", "label"]
+
+
+def _bow(texts):
+    """Bag-of-words encoder over VOCAB (other words ignored), deterministic."""
+    out = np.zeros((len(texts), len(VOCAB)), dtype=np.float32)
+    for i, t in enumerate(texts):
+        for w in t.lower().replace(".", " ").replace(",", " ").split():
+            if w in VOCAB:
+                out[i, VOCAB.index(w)] += 1
+    return out / (np.linalg.norm(out, axis=1, keepdims=True) + 1e-9)
+
+
+@pytest.fixture
+def bow_encoder(monkeypatch):
+    calls = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        return _bow(texts)
+
+    monkeypatch.setattr(TopicService, "_encode", staticmethod(encode))
+    monkeypatch.setattr(TopicService, "_label_cache", {})
+    monkeypatch.setattr(TopicService, "TOPIC_EXEMPLARS", {
+        "billing": ["invoice charged refund"],
+        "technical issue": ["crash error"],
+        "sales": ["upgrade price"],
+    })
+    monkeypatch.setattr(topic_service, "TOPIC_MODE", "embedding")
+    return calls
+
+
+def test_whole_transcript_is_scored_not_just_the_prefix(bow_encoder):
+    text = "hello there " * 200 + "I was charged twice, the invoice is wrong, I want a refund. " * 20
+
+    result = TopicService.classify(text)
+
+    assert result["topic"] == "billing"
+    assert 0.0 < result["confidence"] <= 1.0
+
+
+def test_large_taxonomy_and_label_vectors_cached(bow_encoder):
+    labels = [f"label {i}" for i in range(300)] + ["billing"]
+
+    first = TopicService.classify_texts(["refund for the invoice"], labels=labels)
+    TopicService.classify_texts(["another invoice refund"], labels=labels)
+
+    assert first[0]["topic"] == "billing"
+    label_batches = [c for c in bow_encoder if len(c) > 300]
+    assert len(label_batches) == 1
+
+
+def test_per_speaker_is_one_batched_pass(bow_encoder):
+    segments = [
+        {"speaker": "A", "text": "the app shows an error and then a crash"},
+        {"speaker": "B", "text": "what is the price to upgrade"},
+        {"speaker": "A", "text": ""},
+    ]
+    TopicService.classify_texts(["warm"])          # build label vectors first
+    bow_encoder.clear()
+
+    tagged = TopicService.classify_per_speaker(segments)
+
+    assert [t["topic"] for t in tagged] == ["technical issue", "sales", "unknown"]
+    assert len(bow_encoder) == 1 and len(bow_encoder[0]) == 2